@@ -0,0 +1,23 @@
+from fastapi import Request, Response, status
+
+# Polled resources: the browser may keep a copy but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers.update(cache_headers(etag))
@@ -1,52 +1,184 @@
+import hashlib
+import uuid
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from dishka.integrations.fastapi import FromDishka, inject
 
-from app.adapters.api.schemas.chat import ChatStreamInput, ChatRegenerateInput, MessageResponse
+from app.adapters.api.schemas.chat import (
+    ChatStreamInput,
+    ChatRegenerateInput,
+    MessageResponse,
+    MessageSearchResponse,
+    MessageTextSearchHit,
+    MessageTextSearchResponse
+)
 from app.application.usecases.chat.process_message import ProcessMessageUseCase
 from app.application.usecases.chat.regenerate import RegenerateMessageUseCase
 from app.application.usecases.chat.get_history import GetChatHistoryUseCase
+from app.application.usecases.chat.search import SearchChatUseCase
+from app.application.usecases.chat.search_text import SearchMessagesTextUseCase
+from app.application.services.generation_jobs import GenerationJob, GenerationJobRegistry
+from app.domain.entities.chat import MessageRole
+from app.domain.exceptions import ChatSearchDisabled, GenerationExpired
+from app.adapters.api.conditional import cache_headers, is_not_modified, not_modified_response
+from app.adapters.api.serialization import MESSAGE, FastJSONResponse
+from app.core.versions import ResourceVersions, history_key
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Id of the reply being generated: resume with GET /chat/stream/{id}?offset=<bytes received>
+MESSAGE_ID_HEADER = "X-Message-Id"
+# "failed" when attaching to a generation that already ended in an error
+STATUS_HEADER = "X-Generation-Status"
+
+def _job_response(job: GenerationJob, offset: int = 0) -> StreamingResponse:
+    headers = {MESSAGE_ID_HEADER: job.message_id}
+    if job.failed:
+        headers[STATUS_HEADER] = "failed"
+    return StreamingResponse(
+        job.subscribe(offset),
+        media_type="text/event-stream",
+        headers=headers
+    )
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+
 @router.post("/stream")
 @inject
 async def stream_chat(
     data: ChatStreamInput,
-    use_case: FromDishka[ProcessMessageUseCase]
+    use_case: FromDishka[ProcessMessageUseCase],
+    jobs: FromDishka[GenerationJobRegistry]
 ) -> StreamingResponse:
-    return StreamingResponse(
-        use_case.execute(data.message, data.session_id, data.use_search),
-        media_type="text/event-stream"
-    )
+    # A retry or double-click reads the reply already being generated: no second user message, no second LLM call
+    key = f"{data.session_id}:{data.idempotency_key}" if data.idempotency_key else None
+    fingerprint = _fingerprint("stream", data.session_id, data.use_search, data.message)
+    try:
+        job = jobs.attach(key, fingerprint)
+    except GenerationExpired as e:
+        raise HTTPException(
+            status_code=409,
+            detail="Already answered, reload the history",
+            headers={MESSAGE_ID_HEADER: str(e)}
+        )
+
+    if job is None:
+        # Generation runs as a job: a dropped connection doesn't stop it, the client resumes instead
+        message_id = str(uuid.uuid4())
+        job = jobs.start(
+            message_id,
+            use_case.execute(data.message, data.session_id, data.use_search, reply_id=message_id),
+            key=key,
+            fingerprint=fingerprint
+        )
+    return _job_response(job)
 
 @router.post("/regenerate")
 @inject
 async def regenerate_chat(
     data: ChatRegenerateInput,
-    use_case: FromDishka[RegenerateMessageUseCase]
+    use_case: FromDishka[RegenerateMessageUseCase],
+    jobs: FromDishka[GenerationJobRegistry]
 ) -> StreamingResponse:
-    return StreamingResponse(
-        use_case.execute(data.session_id, data.use_search),
-        media_type="text/event-stream"
+    # A second click while regenerating must not delete the reply being written
+    fingerprint = _fingerprint("regenerate", data.session_id)
+    job = jobs.attach(fingerprint=fingerprint)
+    if job is None:
+        message_id = str(uuid.uuid4())
+        job = jobs.start(
+            message_id,
+            use_case.execute(data.session_id, data.use_search, reply_id=message_id),
+            fingerprint=fingerprint
+        )
+    return _job_response(job)
+
+@router.get("/stream/{message_id}")
+@inject
+async def resume_stream(
+    message_id: str,
+    offset: int = Query(0, ge=0, description="Bytes of the stream already received"),
+    jobs: FromDishka[GenerationJobRegistry] = None
+) -> StreamingResponse:
+    """
+    Attach to a reply started by /chat/stream or /chat/regenerate, from any byte offset.
+    Works while it is generating and for a while after (CHAT_STREAM_BUFFER_TTL_SEC).
+    """
+    job = jobs.get(message_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Generation not found or expired, reload the history")
+    return _job_response(job, offset)
+
+@router.get("/search", response_model=List[MessageSearchResponse])
+@inject
+async def search_chat(
+    q: str = Query(..., min_length=1, description="Semantic query"),
+    session_id: Optional[str] = None,
+    contains: Optional[str] = Query(None, description="Exact substring the message must contain"),
+    role: Optional[MessageRole] = None,
+    limit: int = Query(10, ge=1, le=50),
+    use_case: FromDishka[SearchChatUseCase] = None
+):
+    try:
+        hits = await use_case.execute(q, limit=limit, session_id=session_id, contains=contains, role=role)
+    except ChatSearchDisabled as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return [
+        MessageSearchResponse(
+            session_id=hit.session_id,
+            uid=hit.message.uid,
+            role=hit.message.role,
+            content=hit.message.content,
+            created_at=hit.message.created_at,
+            score=hit.score
+        ) for hit in hits
+    ]
+
+@router.get("/search/text", response_model=MessageTextSearchResponse)
+@inject
+async def search_chat_text(
+    q: str = Query(..., min_length=1, description="Keywords, \"exact phrase\" and -excluded terms are supported"),
+    session_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="'next_cursor' from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    use_case: FromDishka[SearchMessagesTextUseCase] = None
+):
+    try:
+        page = await use_case.execute(q, session_id=session_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return MessageTextSearchResponse(
+        items=[
+            MessageTextSearchHit(
+                session_id=hit.session_id,
+                uid=hit.message.uid,
+                role=hit.message.role,
+                content=hit.message.content,
+                created_at=hit.message.created_at,
+                highlights=hit.highlights
+            ) for hit in page.items
+        ],
+        next_cursor=page.next_cursor
     )
 
 @router.get("/{session_id}/history", response_model=List[MessageResponse])
 @inject
 async def get_history(
     session_id: str,
+    request: Request,
     limit: int = 20,
     older_than: Optional[datetime] = None,
-    use_case: FromDishka[GetChatHistoryUseCase] = None
+    use_case: FromDishka[GetChatHistoryUseCase] = None,
+    versions: FromDishka[ResourceVersions] = None
 ):
+    etag = versions.etag(history_key(session_id), limit, older_than)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
     messages = await use_case.execute(session_id, limit, older_than)
-    # Mapping Domain Entities to DTOs
-    return [
-        MessageResponse(
-            role=msg.role,
-            content=msg.content,
-            created_at=getattr(msg, 'created_at', None) # Depending on Message entity fields
-        ) for msg in messages
-    ]
+    # Entities are serialized directly, response_model only documents the shape
+    return FastJSONResponse(MESSAGE.many(messages), headers=cache_headers(etag))
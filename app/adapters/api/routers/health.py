@@ -0,0 +1,62 @@
+from fastapi import APIRouter, status
+from dishka.integrations.fastapi import FromDishka, inject
+
+from app.adapters.api.serialization import FastJSONResponse
+from app.core.startup import StartupOrchestrator
+from app.core.circuit_breaker import CircuitBreakers
+from app.adapters.llm.model_manager import OllamaModelManager
+from app.application.services.degradation import DegradationPolicy
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def live():
+    """
+    Process is up. Restart the container only if this fails.
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+@inject
+async def ready(
+    startup: FromDishka[StartupOrchestrator] = None
+):
+    """
+    State of each startup step. Critical steps gate the boot, so 503 here is only a
+    safeguard; non-critical steps still initializing or retrying are listed under 'degraded'.
+    """
+    return FastJSONResponse(
+        startup.report(),
+        status_code=status.HTTP_200_OK if startup.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+@router.get("/models")
+@inject
+async def models(
+    manager: FromDishka[OllamaModelManager] = None
+):
+    """
+    Which LLM models Ollama has loaded (seconds since last use) and how often
+    chat and embedding requests swapped each other out.
+    """
+    return manager.report()
+
+@router.get("/load")
+@inject
+async def load(
+    policy: FromDishka[DegradationPolicy] = None
+):
+    """
+    Current degradation level, turns in flight and the per-stage signals behind it.
+    """
+    return policy.report()
+
+@router.get("/dependencies")
+@inject
+async def dependencies(
+    breakers: FromDishka[CircuitBreakers] = None
+):
+    """
+    Circuit breaker of each external dependency: open ones are failing fast until 'retry_in_sec'.
+    """
+    return breakers.report()
@@ -1,37 +1,101 @@
-from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, UploadFile, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel
 from dishka.integrations.fastapi import FromDishka, inject
 
-from app.application.usecases.icons.upload_icon import UploadIconUseCase, UploadIconDTO
+from app.application.usecases.icons.upload_icon import UploadIconUseCase, UploadIconStreamDTO
 from app.application.usecases.icons.list_icons import ListIconsUseCase
 from app.application.usecases.icons.delete_icon import DeleteIconUseCase
+from app.adapters.api.conditional import is_not_modified, not_modified_response, set_cache_headers
 
 router = APIRouter(prefix="/icons", tags=["Waifu Icons"])
 
+CHUNK_SIZE = 256 * 1024
+# Boundaries and part headers around the file in a multipart body
+MULTIPART_OVERHEAD = 16 * 1024
+
+class IconListResponse(BaseModel):
+    items: List[str]
+    next_cursor: Optional[str] = None
+
+async def _iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+def _content_length(request: Request) -> int | None:
+    value = request.headers.get("content-length")
+    return int(value) if value and value.isdigit() else None
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 @inject
 async def upload_icon(
-    file: UploadFile = File(...),
+    request: Request,
     use_case: FromDishka[UploadIconUseCase] = None
 ):
+    """
+    Multipart upload. Starlette spools the whole form before it can be read, so an
+    oversized body is rejected from Content-Length first. PUT /icons/{filename} streams.
+    """
+    content_length = _content_length(request)
+    if content_length is not None and content_length > use_case.max_bytes + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=f"File size exceeds {use_case.max_bytes // (1024 * 1024)}MB limit.")
+
+    form = await request.form(max_files=1)
+    file = form.get("file")
+    if file is None or isinstance(file, str):
+        raise HTTPException(status_code=422, detail="Missing 'file' field.")
     try:
-        content = await file.read()
-        dto = UploadIconDTO(
+        dto = UploadIconStreamDTO(
             filename=file.filename,
-            content=content,
-            content_type=file.content_type
+            chunks=_iter_upload_file(file),
+            content_type=file.content_type,
+            content_length=file.size
         )
-        url = await use_case.execute(dto)
-        return {"url": url}
+        result = await use_case.execute_stream(dto)
+        return {"url": result.url, "filename": result.filename, "thumbnails": result.thumbnails}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await form.close()
 
-@router.get("", response_model=List[str])
+@router.put("/{filename}", status_code=status.HTTP_201_CREATED)
+@inject
+async def upload_icon_raw(
+    filename: str,
+    request: Request,
+    use_case: FromDishka[UploadIconUseCase] = None
+):
+    """
+    Raw body upload: read chunk by chunk with the size limit enforced while reading,
+    nothing is spooled to disk. The stored key is derived from the content hash, the path filename is informational only.
+    """
+    try:
+        dto = UploadIconStreamDTO(
+            filename=filename,
+            chunks=request.stream(),
+            content_type=request.headers.get("content-type", ""),
+            content_length=_content_length(request)
+        )
+        result = await use_case.execute_stream(dto)
+        return {"url": result.url, "filename": result.filename, "thumbnails": result.thumbnails}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("", response_model=IconListResponse)
 @inject
 async def list_icons(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     use_case: FromDishka[ListIconsUseCase] = None
 ):
-    return await use_case.execute()
+    cached = await use_case.execute(limit=limit, cursor=cursor)
+    if is_not_modified(request, cached.etag):
+        return not_modified_response(cached.etag)
+
+    set_cache_headers(response, cached.etag)
+    return IconListResponse(items=cached.page.items, next_cursor=cached.page.next_cursor)
 
 @router.delete("/{filename}")
 @inject
@@ -1,30 +1,46 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, Path, HTTPException
 from dishka.integrations.fastapi import FromDishka, inject
 
 from app.application.usecases.memories.list_memories import ListMemoriesUseCase
 from app.application.usecases.memories.delete_memory import DeleteMemoryUseCase
-from app.adapters.api.schemas.memories import MemoryResponse
+from app.adapters.api.schemas.memories import MemoryListResponse
+from app.adapters.api.serialization import MEMORY, FastJSONResponse
+from app.domain.entities.memory import MemoryQuery, MemorySortField
 
 router = APIRouter(prefix="/memories", tags=["Memories"])
 
-@router.get("", response_model=List[MemoryResponse])
+@router.get("", response_model=MemoryListResponse)
 @inject
 async def list_memories(
     use_case: FromDishka[ListMemoriesUseCase],
-    limit: int = Query(100, ge=1, le=1000)
-) -> List[MemoryResponse]:
-    fragments = await use_case.execute(limit=limit)
-    return [
-        MemoryResponse(
-            vector_id=fragment.vector_id,
-            content=fragment.content,
-            importance=fragment.importance,
-            created_at=fragment.created_at,
-            tags=fragment.tags
-        )
-        for fragment in fragments
-    ]
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="'next_cursor' from the previous page"),
+    tags: List[str] = Query([]),
+    min_importance: Optional[float] = Query(None, ge=0.0, le=1.0),
+    max_importance: Optional[float] = Query(None, ge=0.0, le=1.0),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort_by: Optional[MemorySortField] = None,
+    descending: bool = True
+):
+    query = MemoryQuery(
+        tags=tags,
+        min_importance=min_importance,
+        max_importance=max_importance,
+        created_after=created_after,
+        created_before=created_before,
+        sort_by=sort_by,
+        descending=descending
+    )
+    try:
+        page = await use_case.execute(limit=limit, cursor=cursor, query=query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Entities are serialized directly, response_model only documents the shape
+    return FastJSONResponse({"items": MEMORY.many(page.items), "next_cursor": page.next_cursor})
 
 @router.delete("/{vector_id}", status_code=204)
 @inject
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+from dishka.integrations.fastapi import FromDishka, inject
+
+from app.core.telemetry import Telemetry
+
+router = APIRouter(tags=["Observability"])
+
+@router.get("/metrics", include_in_schema=False)
+@inject
+async def metrics(
+    telemetry: FromDishka[Telemetry] = None
+) -> Response:
+    body, content_type = telemetry.render()
+    return Response(content=body, media_type=content_type)
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from dishka.integrations.fastapi import FromDishka, inject
 
 from app.adapters.api.schemas.sessions import (
@@ -13,18 +13,47 @@ from app.application.usecases.session.list_sessions import ListSessionsUseCase
 from app.application.usecases.session.create_session import CreateSessionUseCase
 from app.application.usecases.session.delete_session import DeleteSessionUseCase
 from app.application.usecases.session.update_session import UpdateSessionTitleUseCase
+from app.application.usecases.session.search_sessions import SearchSessionsUseCase
+from app.adapters.api.conditional import cache_headers, is_not_modified, not_modified_response
+from app.adapters.api.serialization import SESSION_SUMMARY, FastJSONResponse
+from app.core.versions import SESSIONS, ResourceVersions
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
 @router.get("", response_model=SessionListResponse)
 @inject
 async def list_sessions(
+    request: Request,
     limit: int = 20,
     offset: int = 0,
-    use_case: FromDishka[ListSessionsUseCase] = None
+    use_case: FromDishka[ListSessionsUseCase] = None,
+    versions: FromDishka[ResourceVersions] = None
 ):
+    etag = versions.etag(SESSIONS, limit, offset)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
     sessions = await use_case.execute(limit, offset)
-    items = [
+    # Entities are serialized directly, response_model only documents the shape
+    return FastJSONResponse(
+        {
+            "items": SESSION_SUMMARY.many(sessions),
+            "total": len(sessions) + offset, # Rough estimate if total not provided by usecase
+            "limit": limit,
+            "offset": offset
+        },
+        headers=cache_headers(etag)
+    )
+
+@router.get("/search", response_model=List[SessionSummaryResponse])
+@inject
+async def search_sessions(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    use_case: FromDishka[SearchSessionsUseCase] = None
+):
+    sessions = await use_case.execute(q, limit)
+    return [
         SessionSummaryResponse(
             uid=s.uid,
             title=s.title,
@@ -32,12 +61,6 @@ async def list_sessions(
             updated_at=s.updated_at
         ) for s in sessions
     ]
-    return SessionListResponse(
-        items=items,
-        total=len(items) + offset, # Rough estimate if total not provided by usecase
-        limit=limit,
-        offset=offset
-    )
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 @inject
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from dishka.integrations.fastapi import FromDishka, inject
 
 from app.adapters.api.schemas.settings import (
@@ -12,6 +12,8 @@ from app.application.usecases.settings.update_user_profile import UpdateUserProf
 from app.application.usecases.settings.get_persona import GetWaifuPersonaUseCase
 from app.application.usecases.settings.update_persona import UpdateWaifuPersonaUseCase
 from app.application.usecases.settings.set_persona_icon import SetPersonaIconUseCase
+from app.adapters.api.conditional import is_not_modified, not_modified_response, set_cache_headers
+from app.core.versions import PERSONA, USER_PROFILE, ResourceVersions
 
 from app.domain.entities.user import UserProfile
 from app.domain.entities.persona import WaifuPersona
@@ -21,8 +23,16 @@ router = APIRouter(prefix="/settings", tags=["Settings"])
 @router.get("/user", response_model=UserProfileResponse)
 @inject
 async def get_user_profile(
-    use_case: FromDishka[GetUserProfileUseCase] = None
+    request: Request,
+    response: Response,
+    use_case: FromDishka[GetUserProfileUseCase] = None,
+    versions: FromDishka[ResourceVersions] = None
 ):
+    etag = versions.etag(USER_PROFILE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_cache_headers(response, etag)
+
     profile = await use_case.execute()
     # Handle possible None if logic allows, though Repo says "get_default" usually.
     # Assuming profile is not None for simplicity or we handle default in UseCase/Repo.
@@ -65,8 +75,16 @@ async def update_user_profile(
 @router.get("/waifu", response_model=PersonaResponse)
 @inject
 async def get_waifu_persona(
-    use_case: FromDishka[GetWaifuPersonaUseCase] = None
+    request: Request,
+    response: Response,
+    use_case: FromDishka[GetWaifuPersonaUseCase] = None,
+    versions: FromDishka[ResourceVersions] = None
 ):
+    etag = versions.etag(PERSONA)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_cache_headers(response, etag)
+
     persona = await use_case.execute()
     return PersonaResponse(
         uid=persona.uid,
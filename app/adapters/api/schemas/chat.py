@@ -8,6 +8,11 @@ class ChatStreamInput(BaseModel):
     message: str = Field(..., min_length=1, description="User message content")
     session_id: str = Field(..., description="ID of the chat session")
     use_search: bool = Field(False, description="Whether to perform web search before answering")
+    idempotency_key: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Client-generated id of this send; retries with the same key get the same reply instead of a new one"
+    )
 
 class ChatRegenerateInput(BaseModel):
     session_id: str = Field(..., description="ID of the chat session")
@@ -17,3 +22,23 @@ class MessageResponse(BaseModel):
     role: MessageRole
     content: str
     created_at: Optional[datetime] = None
+
+class MessageSearchResponse(BaseModel):
+    session_id: str
+    uid: str
+    role: MessageRole
+    content: str
+    created_at: Optional[datetime] = None
+    score: float
+
+class MessageTextSearchHit(BaseModel):
+    session_id: str
+    uid: str
+    role: MessageRole
+    content: str
+    created_at: Optional[datetime] = None
+    highlights: List[str] = []
+
+class MessageTextSearchResponse(BaseModel):
+    items: List[MessageTextSearchHit]
+    next_cursor: Optional[str] = None
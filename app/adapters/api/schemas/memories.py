@@ -8,3 +8,7 @@ class MemoryResponse(BaseModel):
     importance: float
     created_at: datetime
     tags: List[str] = []
+
+class MemoryListResponse(BaseModel):
+    items: List[MemoryResponse]
+    next_cursor: Optional[str] = None
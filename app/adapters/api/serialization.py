@@ -0,0 +1,67 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError: # Optional dependency: falls back to the stdlib encoder
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat().replace("+00:00", "Z")
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # Dataclasses, datetimes and enums are handled natively in C.
+        # OPT_UTC_Z matches pydantic's '...Z' output, OPT_NON_STR_KEYS allows {64: url} maps.
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it's installed.
+    Used as the app's default response class, and returned directly by hot read endpoints
+    so FastAPI skips response_model validation altogether.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class Projection:
+    """
+    Precompiled 'schema' for a domain dataclass: the public fields, fetched with one attrgetter.
+    Keeps the wire format identical to the pydantic response model without building a model per item.
+
+        MESSAGE = Projection("role", "content", "created_at")
+        MESSAGE.many(messages) -> [{"role": ..., "content": ..., "created_at": ...}, ...]
+    """
+
+    def __init__(self, *fields: str):
+        self.fields: Tuple[str, ...] = fields
+        getter = attrgetter(*fields)
+        # attrgetter with a single field returns a bare value, not a tuple
+        self._get = getter if len(fields) > 1 else (lambda obj: (getter(obj),))
+
+    def one(self, obj: Any) -> Dict[str, Any]:
+        return dict(zip(self.fields, self._get(obj)))
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        fields, get = self.fields, self._get
+        return [dict(zip(fields, get(obj))) for obj in objs]
+
+# Mirrors of the response schemas in app/adapters/api/schemas
+MESSAGE = Projection("role", "content", "created_at")
+SESSION_SUMMARY = Projection("uid", "title", "status", "updated_at")
+MEMORY = Projection("vector_id", "content", "importance", "created_at", "tags")
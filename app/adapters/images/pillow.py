@@ -0,0 +1,62 @@
+import asyncio
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from app.domain.interfaces.services.image import IImageProcessor
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, UnidentifiedImageError
+except ImportError: # Optional dependency: without Pillow no variants are generated
+    Image = None
+
+def _render_thumbnails(content: bytes, sizes: List[int]) -> Dict[int, bytes]:
+    """
+    Runs in a worker process, must stay a module-level function (picklable).
+    """
+    try:
+        with Image.open(io.BytesIO(content)) as img:
+            img.load()
+            source = img.convert("RGBA")
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"Invalid image: {e}")
+
+    variants = {}
+    for size in sizes:
+        thumb = source.copy()
+        thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        thumb.save(out, format="WEBP", quality=85, method=4)
+        variants[size] = out.getvalue()
+    return variants
+
+class PillowImageProcessor(IImageProcessor):
+    """
+    Resizes images in a process pool: decoding a multi-megabyte PNG is pure CPU
+    and would otherwise stall the event loop (or hold the GIL in a thread).
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    async def make_thumbnails(self, content: bytes, sizes: List[int]) -> Dict[int, bytes]:
+        if not self.available:
+            logger.warning("Pillow is not installed, skipping icon variants")
+            return {}
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _render_thumbnails, content, sizes)
+
+    def close(self) -> None:
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
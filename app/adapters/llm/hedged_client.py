@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Deque, Dict, List, Optional
+
+from app.domain.entities.chat import Message
+from app.domain.exceptions import DependencyUnavailable
+from app.domain.interfaces.llm import ILLMClient
+from app.adapters.llm.llm_client import is_outage
+
+logger = logging.getLogger(__name__)
+
+class HedgedLLMClient(ILLMClient):
+    """
+    Sends a duplicate of a slow request to a second backend and keeps whichever
+    stream produces a token first; the other one is cancelled.
+
+    "Slow" is the 'percentile' of recent times to first token, never less than
+    'min_delay_sec', so only the tail is hedged and the second backend sees a few
+    percent of the traffic. A primary that is down before its first token (outage or
+    open circuit breaker; not a bad request) is hedged right away, which makes the second backend a
+    failover as well. Each backend keeps its own breaker.
+    """
+
+    MIN_SAMPLES = 20 # Until then the delay is 'min_delay_sec'
+
+    def __init__(
+        self,
+        primary: ILLMClient,
+        secondary: ILLMClient,
+        secondary_model: Optional[str] = None, # None = same model name as the request
+        percentile: float = 95.0,
+        min_delay_sec: float = 1.0,
+        window: int = 200
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.secondary_model = secondary_model
+        self.percentile = percentile
+        self.min_delay_sec = min_delay_sec
+        self._ttft: Deque[float] = deque(maxlen=window)
+
+    def hedge_delay(self) -> float:
+        if len(self._ttft) < self.MIN_SAMPLES:
+            return self.min_delay_sec
+        ordered = sorted(self._ttft)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay_sec, ordered[index])
+
+    async def stream_chat(
+        self,
+        messages: List[Message],
+        system_instruction: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs: Any
+    ) -> AsyncGenerator[str, None]:
+        request: Dict[str, Any] = dict(
+            messages=messages,
+            system_instruction=system_instruction,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        started = time.perf_counter()
+        # Pending first token -> (backend name, its stream)
+        racing: Dict[asyncio.Future, tuple] = {}
+
+        def launch(name: str, client: ILLMClient, target_model: Optional[str]) -> None:
+            stream = client.stream_chat(model=target_model, **request).__aiter__()
+            racing[asyncio.ensure_future(anext(stream))] = (name, stream)
+
+        launch("primary", self.primary, model)
+        hedged = False
+        hedge_at = started + self.hedge_delay()
+        winner: Optional[AsyncIterator[str]] = None
+        first: Optional[str] = None
+        error: Optional[BaseException] = None
+
+        try:
+            while racing and winner is None:
+                wait = None if hedged else max(0.0, hedge_at - time.perf_counter())
+                done, _ = await asyncio.wait(racing, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    logger.info(f"No token after {time.perf_counter() - started:.2f}s, hedging to the second backend")
+                    launch("secondary", self.secondary, self.secondary_model or model)
+                    continue
+
+                for future in done:
+                    name, stream = racing.pop(future)
+                    if winner is not None:
+                        await stream.aclose() # Both answered at once: the later one is dropped
+                        continue
+                    try:
+                        first = future.result()
+                    except StopAsyncIteration:
+                        first = None # Empty reply still wins: the backend answered
+                    except Exception as e:
+                        if not (isinstance(e, DependencyUnavailable) or is_outage(e)):
+                            raise # A bad request fails the same way on any backend
+                        error = error or e
+                        logger.warning(f"LLM {name} backend failed before its first token: {e}")
+                        if not hedged:
+                            hedged = True
+                            launch("secondary", self.secondary, self.secondary_model or model)
+                        continue
+                    winner = stream
+                    if hedged:
+                        logger.info(f"LLM {name} backend answered first")
+        finally:
+            # Losers (or everything, when the consumer went away) are cancelled and closed
+            for future in racing:
+                future.cancel()
+            await asyncio.gather(*racing, return_exceptions=True)
+            for _, stream in racing.values():
+                await stream.aclose()
+
+        if winner is None:
+            raise error
+
+        self._ttft.append(time.perf_counter() - started)
+        if first is None:
+            return
+        try:
+            yield first
+            async for chunk in winner:
+                yield chunk
+        finally:
+            await winner.aclose()
+
@@ -1,19 +1,45 @@
+import asyncio
 from typing import Any, AsyncGenerator, Dict, List, Optional
 import openai
 from openai import AsyncOpenAI  
 import logging
 from app.domain.entities.chat import Message, MessageRole
+from app.domain.exceptions import DependencyUnavailable
 from app.domain.interfaces.llm import ILLMClient
+from app.core import deadline
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.adapters.llm.model_manager import CHAT, OllamaModelManager
 
 logger = logging.getLogger(__name__)
 
+def is_outage(error: BaseException) -> bool:
+    """
+    Errors that say the backend is down or overloaded (what circuit breakers count),
+    as opposed to a bad request.
+    """
+    if isinstance(error, (openai.APIConnectionError, TimeoutError)): # Includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500 or error.status_code == 429
+    return False
+
+def acquire(breaker: Optional[CircuitBreaker], dependency: str) -> None:
+    if breaker is None:
+        return
+    try:
+        breaker.acquire()
+    except CircuitOpen as e:
+        raise DependencyUnavailable(f"{dependency} unavailable") from e
+
 class OpenAIClient(ILLMClient):
     
     def __init__(
         self,
         base_url: str,
         api_key: str = 'ollama', 
-        model: str = "llama3"
+        model: str = "llama3",
+        models: Optional[OllamaModelManager] = None, # Optional: residency tracking, swap warnings
+        breaker: Optional[CircuitBreaker] = None # Optional: fail fast while the backend is down
     ):
 
         self.client = AsyncOpenAI(
@@ -21,7 +47,12 @@ class OpenAIClient(ILLMClient):
             api_key=api_key,
             max_retries=3
         )
+        # Under a request deadline retries would overrun it: one attempt, bounded by what is left.
+        # Same once the backend has failed: retrying an overloaded Ollama only slows its recovery
+        self._single_attempt = self.client.with_options(max_retries=0)
         self.default_model = model
+        self.models = models
+        self.breaker = breaker
     
     def _to_openai_format( 
         self,
@@ -63,6 +94,8 @@ class OpenAIClient(ILLMClient):
     ) -> AsyncGenerator[str, None]:
         
         target_model = model or self.default_model
+        if self.models:
+            self.models.before_request(target_model, CHAT)
         
         openai_messages = self._to_openai_format(
             sys_prompt=system_instruction, 
@@ -80,18 +113,42 @@ class OpenAIClient(ILLMClient):
         if max_tokens is not None:
             request_params["max_tokens"] = max_tokens
 
+        client = self.client
+        request_timeout = deadline.timeout()
+        if request_timeout is not None:
+            request_params["timeout"] = request_timeout
+        if request_timeout is not None or (self.breaker and not self.breaker.healthy):
+            client = self._single_attempt
+
+        acquire(self.breaker, "LLM")
+        answered = False # The breaker's verdict is given at the first chunk: the backend is up
         try:
-            stream = await self.client.chat.completions.create(**request_params)
+            stream = await client.chat.completions.create(**request_params)
 
             async for chunk in stream:
+                if not answered and self.breaker:
+                    self.breaker.success()
+                answered = True
                 delta = chunk.choices[0].delta
                 if delta.content:
                     yield delta.content
 
-        except openai.APIConnectionError:
-            logger.critical("Connection Error: Is Ollama running at correct URL?")
-            yield "[System Error: LLM Provider Unreachable]"
-            
+            if not answered and self.breaker:
+                self.breaker.success()
+
+        except (asyncio.CancelledError, GeneratorExit):
+            if not answered and self.breaker:
+                self.breaker.release()
+            raise
+
         except Exception as e:
-            logger.exception("LLM Client Error")
-            yield f"[System Error: {str(e)}]"
\ No newline at end of file
+            # One verdict per acquire: a stream that already answered was counted as a success
+            if not answered and self.breaker:
+                self.breaker.failure(e)
+            if not is_outage(e):
+                raise
+            if isinstance(e, openai.APIConnectionError) and not isinstance(e, openai.APITimeoutError):
+                logger.critical("Connection Error: Is Ollama running at correct URL?")
+            # Cause stays in the log, the message may reach users
+            logger.warning(f"LLM unavailable: {e}")
+            raise DependencyUnavailable("LLM unavailable") from e
@@ -1,24 +1,81 @@
-from typing import List
+import asyncio
+import logging
+from typing import List, Optional
 from openai import AsyncOpenAI
 from app.domain.interfaces.services.embedder import IEmbedder
+from app.core import deadline
+from app.core.circuit_breaker import CircuitBreaker
+from app.domain.exceptions import DependencyUnavailable
+from app.adapters.llm.llm_client import acquire, is_outage
+from app.adapters.llm.model_manager import EMBEDDING, OllamaModelManager
+
+logger = logging.getLogger(__name__)
 
 class OpenAIEmbedder(IEmbedder):
     def __init__(
         self, 
         api_key: str, 
         base_url: str,
-        model: str
+        model: str,
+        models: Optional[OllamaModelManager] = None, # Optional: residency tracking, swap warnings
+        breaker: Optional[CircuitBreaker] = None # Optional: fail fast while the backend is down
     ):
         self.client = AsyncOpenAI(
             api_key=api_key, 
             base_url=base_url
         )
+        self._single_attempt = self.client.with_options(max_retries=0)
+        self.model = model
+        self.models = models
+        self.breaker = breaker
+
+    def _request_options(self) -> dict:
+        # Sized from the request deadline, if any; otherwise the client defaults apply
+        request_timeout = deadline.timeout()
+        return {} if request_timeout is None else {"timeout": request_timeout}
+
+    async def _embed(self, texts: List[str]) -> list:
+        if self.models:
+            self.models.before_request(self.model, EMBEDDING)
+        # SDK retries only while the backend looks healthy
+        client = self.client if self.breaker is None or self.breaker.healthy else self._single_attempt
+        acquire(self.breaker, "Embedder")
+        try:
+            response = await client.embeddings.create(
+                input=texts,
+                model=self.model,
+                **self._request_options()
+            )
+        except asyncio.CancelledError:
+            if self.breaker:
+                self.breaker.release()
+            raise
+        except Exception as e:
+            if self.breaker:
+                self.breaker.failure(e)
+            if is_outage(e):
+                # Cause stays in the log, the message may reach users
+                logger.warning(f"Embedder unavailable: {e}")
+                raise DependencyUnavailable("Embedder unavailable") from e
+            raise
+        if self.breaker:
+            self.breaker.success()
+        return response.data
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    def switch_model(self, model: str) -> None:
         self.model = model
 
     async def get_vector(self, text: str) -> List[float]:
-        text = text.replace("\n", " ")
-        response = await self.client.embeddings.create(
-            input=[text], 
-            model=self.model
-        )
-        return response.data[0].embedding
\ No newline at end of file
+        data = await self._embed([text.replace("\n", " ")])
+        return data[0].embedding
+
+    async def get_vectors(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        data = await self._embed([t.replace("\n", " ") for t in texts])
+        # API does not promise ordering, 'index' does
+        return [item.embedding for item in sorted(data, key=lambda d: d.index)]
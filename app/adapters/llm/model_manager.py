@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+CHAT = "chat"
+EMBEDDING = "embedding"
+
+class OllamaModelManager:
+    """
+    Keeps the chat and embedding models resident in Ollama, so the first request after idle
+    doesn't pay the model load time.
+
+    Uses Ollama's native API next to the OpenAI-compatible one the clients talk to:
+    - preload: an empty generate/embed request loads a model without producing anything;
+    - keep-alive: every request through /v1 resets a model's expiry to the server default
+      (5 min), so the hint is re-sent periodically for the resident models;
+    - residency: /api/ps, refreshed on the same schedule and updated by the clients' requests.
+
+    With 'max_resident' set (1 = the GPU fits only one of the two), a request for a model that
+    isn't loaded while the limit is reached means a swap and is logged. When nothing has been
+    requested for a while, the chat model is brought back, since chat latency is what users see.
+    Backends without the native API (plain OpenAI-compatible servers) turn the manager off.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        models: Dict[str, str],
+        keep_alive: str = "30m",
+        refresh_interval_sec: float = 60.0,
+        max_resident: int = 0,
+        timeout_sec: float = 300.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = self._parse_keep_alive(keep_alive)
+        self.refresh_interval_sec = refresh_interval_sec
+        self.max_resident = max_resident
+        self.timeout_sec = timeout_sec
+        self.enabled = True
+        self._roles: Dict[str, str] = {role: self._normalize(m) for role, m in models.items()}
+        # Resident model -> last time we saw it used (monotonic), in load order
+        self._resident: Dict[str, float] = {}
+        self._last_request = 0.0
+        self._swaps = 0
+        self._warned_at = 0.0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @staticmethod
+    def _parse_keep_alive(value: str) -> Union[str, int]:
+        # Ollama takes durations ("30m") or plain seconds; negative keeps the model forever
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    @staticmethod
+    def _normalize(model: str) -> str:
+        return model if ":" in model else f"{model}:latest"
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout_sec))
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def start(self) -> None:
+        """
+        Startup step: detects the native API and loads both models. Raises if Ollama
+        isn't reachable yet, the orchestrator retries.
+        """
+        if not await self.refresh():
+            return
+        for role in (EMBEDDING, CHAT): # Chat last: with one slot it is the one left loaded
+            await self.preload(self._roles[role], role)
+
+    async def run_forever(self) -> None:
+        while self.enabled:
+            await asyncio.sleep(self.refresh_interval_sec)
+            try:
+                await self.refresh()
+                await self._keep_alive()
+            except Exception as e:
+                logger.warning(f"Model keep-alive failed: {e}")
+
+    async def refresh(self) -> bool:
+        async with self._get_session().get(f"{self.base_url}/api/ps") as resp:
+            if resp.status == 404:
+                logger.info("LLM backend has no Ollama API, model preloading disabled")
+                self.enabled = False
+                return False
+            resp.raise_for_status()
+            data = await resp.json()
+
+        now = time.monotonic()
+        loaded = [m.get("name") or m.get("model") for m in data.get("models", [])]
+        self._resident = {name: self._resident.get(name, now) for name in loaded}
+        return True
+
+    async def preload(self, model: str, role: str) -> None:
+        started = time.perf_counter()
+        # Embedding models can't generate, chat models can't embed
+        if role == EMBEDDING:
+            path, payload = "/api/embed", {"model": model, "input": "", "keep_alive": self.keep_alive}
+        else:
+            path, payload = "/api/generate", {"model": model, "keep_alive": self.keep_alive}
+
+        async with self._get_session().post(f"{self.base_url}{path}", json=payload) as resp:
+            resp.raise_for_status()
+            await resp.read()
+
+        if model not in self._resident:
+            logger.info(f"Model '{model}' ({role}) loaded in {time.perf_counter() - started:.2f}s")
+        self._loaded(model)
+
+    def before_request(self, model: str, role: str) -> None:
+        """
+        Called by the clients before each request. Tracks what Ollama will have loaded
+        afterwards and warns when the request is going to swap models.
+        """
+        if not self.enabled:
+            return
+        model = self._normalize(model)
+        self._roles[role] = model # The embedder can switch models at runtime
+        self._last_request = time.monotonic()
+
+        if model not in self._resident and self.max_resident and len(self._resident) >= self.max_resident:
+            self._swaps += 1
+            evicted = next(iter(self._resident))
+            # Once per refresh interval: on a 1-slot GPU this can happen on every turn
+            if self._last_request - self._warned_at >= self.refresh_interval_sec:
+                self._warned_at = self._last_request
+                logger.warning(
+                    f"Loading '{model}' ({role}) evicts '{evicted}': GPU fits {self.max_resident} model(s), "
+                    f"{self._swaps} swap(s) so far. Expect a load-time spike on this request."
+                )
+        self._loaded(model)
+
+    def report(self) -> dict:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "models": {role: model for role, model in self._roles.items()},
+            "resident": {model: round(now - used, 1) for model, used in self._resident.items()},
+            "max_resident": self.max_resident,
+            "swaps": self._swaps
+        }
+
+    def _loaded(self, model: str) -> None:
+        self._resident.pop(model, None)
+        self._resident[model] = time.monotonic()
+        if self.max_resident:
+            while len(self._resident) > self.max_resident:
+                del self._resident[next(iter(self._resident))] # Least recently used goes first
+
+    async def _keep_alive(self) -> None:
+        idle = time.monotonic() - self._last_request >= self.refresh_interval_sec
+        for role, model in self._roles.items():
+            if model in self._resident:
+                # Resets the expiry a /v1 request may have shortened; no load, no swap
+                await self.preload(model, role)
+            elif idle and (role == CHAT or not self.max_resident):
+                # Evicted by the other model (or Ollama restarted): reload while nobody is waiting
+                await self.preload(model, role)
@@ -1,14 +1,20 @@
 from .user import UserProfileDoc
 from .persona import WaifuPersonaDoc
-from .chat import DialogSessionDoc, ChatMessageDoc
+from .chat import DialogSessionDoc, ChatMessageDoc, TurnContextDoc, ReplyBranchDoc
 from .memory import MemoryFragmentDoc
 from .state import AppStateDoc
+from .checkpoint import IndexCheckpointDoc
+from .embedding import EmbeddingModelDoc
 
 ALL_DOCUMENT_MODELS = [
     UserProfileDoc,
     WaifuPersonaDoc,
     DialogSessionDoc,
     ChatMessageDoc,
+    TurnContextDoc,
+    ReplyBranchDoc,
     MemoryFragmentDoc,
-    AppStateDoc
+    AppStateDoc,
+    IndexCheckpointDoc,
+    EmbeddingModelDoc
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 import uuid
 from typing import Annotated, Optional, List, Union
 from pydantic import Field
+from pymongo import IndexModel, TEXT
 from beanie import Document, Indexed
 from app.adapters.mongo.models.base import AuditMixin, CreatedMixin
 from app.domain.entities.chat import (
@@ -8,8 +9,10 @@ from app.domain.entities.chat import (
     DialogSessionSummary, 
     Message, 
     MessageRole, 
-    ChatStatus
+    ChatStatus,
+    TurnContext
 )
+from app.domain.entities.search import SearchResult
 
 class DialogSessionDoc(Document, AuditMixin):
     title: str
@@ -18,7 +21,8 @@ class DialogSessionDoc(Document, AuditMixin):
     class Settings:
         name = "sessions"
         indexes = [
-            [("updated_at", -1)]
+            [("updated_at", -1)],
+            IndexModel([("title", TEXT)], name="title_text")
         ]
 
     def to_summary(self) -> DialogSessionSummary:
@@ -61,7 +65,9 @@ class ChatMessageDoc(Document, CreatedMixin):
     class Settings:
         name = "messages"
         indexes = [
-            [("session_id", 1), ("created_at", 1)]
+            [("session_id", 1), ("created_at", 1)],
+            [("created_at", 1), ("uid", 1)], # Keyset scans of the message indexer
+            IndexModel([("content", TEXT)], name="content_text") # Mongo allows one text index per collection
         ]
 
     def to_entity(self) -> Message:
@@ -84,4 +90,79 @@ class ChatMessageDoc(Document, CreatedMixin):
             referenced_memory_ids=entity.referenced_memory_ids,
             token_count=entity.token_count,
             created_at=entity.created_at
-        )
\ No newline at end of file
+        )
+
+class TurnContextDoc(Document, CreatedMixin):
+    """
+    Retrieval snapshot of an assistant message. Own collection: history reads never load it.
+    """
+    message_uid: Annotated[str, Indexed(str, unique=True)]
+    session_id: Annotated[str, Indexed(str)]
+
+    search_queries: List[str] = Field(default_factory=list)
+    search_results: Optional[List[dict]] = None
+    prompt_hash: Optional[str] = None
+
+    class Settings:
+        name = "turn_contexts"
+
+    def to_entity(self) -> TurnContext:
+        return TurnContext(
+            search_queries=self.search_queries,
+            search_results=(
+                [SearchResult(**r) for r in self.search_results]
+                if self.search_results is not None else None
+            ),
+            prompt_hash=self.prompt_hash
+        )
+
+    @classmethod
+    def from_entity(cls, entity: TurnContext, message_uid: str, session_id: str) -> "TurnContextDoc":
+        return cls(
+            message_uid=message_uid,
+            session_id=session_id,
+            search_queries=entity.search_queries,
+            search_results=(
+                [
+                    {
+                        "title": r.title,
+                        "url": r.url,
+                        "content": r.content,
+                        "score": r.score,
+                        "queries": r.queries,
+                        "passages": r.passages
+                    }
+                    for r in entity.search_results
+                ]
+                if entity.search_results is not None else None
+            ),
+            prompt_hash=entity.prompt_hash
+        )
+
+
+class ReplyBranchDoc(Document, CreatedMixin):
+    """
+    Sibling replies to the same user message that are not in the visible history:
+    pre-generated alternatives (seen=False) and replies swapped out by regenerate (seen=True).
+    """
+    session_id: Annotated[str, Indexed(str)]
+    reply_to: str # uid of the user message
+    content: str
+    referenced_memory_ids: List[str] = Field(default_factory=list)
+    with_search: Optional[bool] = None
+    seen: bool = False
+
+    class Settings:
+        name = "reply_branches"
+        indexes = [
+            [("reply_to", 1), ("seen", 1), ("with_search", 1), ("created_at", 1)]
+        ]
+
+    def to_entity(self) -> Message:
+        return Message(
+            uid=self.uid,
+            role=MessageRole.ASSISTANT,
+            content=self.content,
+            referenced_memory_ids=self.referenced_memory_ids,
+            created_at=self.created_at
+        )
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Annotated, Optional
+from beanie import Document, Indexed
+from app.adapters.mongo.models.base import AuditMixin
+
+class IndexCheckpointDoc(Document, AuditMixin):
+    """
+    Progress marker for background indexers (keyset: created_at + uid of the last processed item).
+    """
+    name: Annotated[str, Indexed(str, unique=True)]
+    last_created_at: Optional[datetime] = None
+    last_uid: Optional[str] = None
+
+    class Settings:
+        name = "index_checkpoints"
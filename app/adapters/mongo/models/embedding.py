@@ -0,0 +1,13 @@
+from typing import Annotated
+from beanie import Document, Indexed
+from app.adapters.mongo.models.base import AuditMixin
+
+class EmbeddingModelDoc(Document, AuditMixin):
+    """
+    Vector size per embedding model, so restarts don't have to call the embedder to find out.
+    """
+    model: Annotated[str, Indexed(str, unique=True)]
+    vector_size: int
+
+    class Settings:
+        name = "embedding_models"
@@ -1,11 +1,25 @@
+import base64
+import json
+import html
 import logging
+import re
 from typing import List, Optional
 from datetime import datetime
+from beanie.operators import And, In, Or, RegEx, Text
 from app.core.config import settings
-from app.domain.entities.chat import DialogSession, DialogSessionSummary, Message
+from app.core.versions import SESSIONS, ResourceVersions, history_key
+from app.domain.entities.chat import (
+    DialogSession,
+    DialogSessionSummary,
+    Message,
+    MessageRole,
+    MessageSearchHit,
+    MessageSearchPage,
+    TurnContext
+)
 from app.domain.interfaces.repositories.chat import IChatRepository
 from app.domain.exceptions import SessionNotFound
-from app.adapters.mongo.models.chat import DialogSessionDoc, ChatMessageDoc
+from app.adapters.mongo.models.chat import DialogSessionDoc, ChatMessageDoc, TurnContextDoc, ReplyBranchDoc
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +28,16 @@ class MongoChatRepository(IChatRepository):
     Implementation of Chat Persistence using MongoDB.
     """
 
+    SNIPPET_RADIUS = 60
+    MAX_SNIPPETS = 3
+
+    def __init__(self, versions: Optional[ResourceVersions] = None):
+        self.versions = versions or ResourceVersions()
+
     async def create_session(self, session: DialogSession) -> None:
         doc = DialogSessionDoc.from_entity(session)
         await doc.insert()
+        self.versions.bump(SESSIONS)
         logger.info(f"Created new session: {session.uid}")
 
     async def get_session(self, uid: str) -> Optional[DialogSession]:
@@ -81,6 +102,7 @@ class MongoChatRepository(IChatRepository):
         doc.updated_at = session.updated_at
         
         await doc.save()
+        self.versions.bump(SESSIONS)
 
     async def delete_session(self, uid: str) -> None:
         session_doc = await DialogSessionDoc.find_one(DialogSessionDoc.uid == uid)
@@ -90,23 +112,113 @@ class MongoChatRepository(IChatRepository):
             delete_result = await ChatMessageDoc.find(
                 ChatMessageDoc.session_id == uid
             ).delete()
+            await TurnContextDoc.find(TurnContextDoc.session_id == uid).delete()
+            await ReplyBranchDoc.find(ReplyBranchDoc.session_id == uid).delete()
             
             # 2. Delete session
             await session_doc.delete()
-            
+            self.versions.bump(SESSIONS, history_key(uid))
+
             count = delete_result.deleted_count if delete_result else 0
             logger.info(f"Deleted session {uid} and {count} messages.")
 
-    async def add_message(self, session_id: str, message: Message) -> None:
-        # 1. Save message
+    async def add_message(self, session_id: str, message: Message, context: Optional[TurnContext] = None) -> None:
+        # 1. Save message (and its retrieval snapshot)
         msg_doc = ChatMessageDoc.from_entity(message, session_id=session_id)
         await msg_doc.insert()
+        if context is not None:
+            await TurnContextDoc.from_entity(context, message_uid=message.uid, session_id=session_id).insert()
+        if message.role == MessageRole.USER:
+            # Only the last reply can be regenerated: unused alternatives of earlier turns are dead weight
+            await self._drop_unused_alternatives(session_id)
         
         # 2. Update parent session timestamp
         session_doc = await DialogSessionDoc.find_one(DialogSessionDoc.uid == session_id)
         if session_doc:
             session_doc.updated_at = message.created_at
             await session_doc.save()
+        # Session order changes too: it is sorted by updated_at
+        self.versions.bump(SESSIONS, history_key(session_id))
+
+    async def add_reply_alternative(
+        self,
+        session_id: str,
+        reply_to: str,
+        message: Message,
+        context: TurnContext
+    ) -> None:
+        await TurnContextDoc.from_entity(context, message_uid=message.uid, session_id=session_id).insert()
+        await ReplyBranchDoc(
+            uid=message.uid,
+            session_id=session_id,
+            reply_to=reply_to,
+            content=message.content,
+            referenced_memory_ids=message.referenced_memory_ids,
+            with_search=context.search_results is not None,
+            created_at=message.created_at
+        ).insert()
+
+    async def count_reply_alternatives(self, reply_to: str, with_search: bool) -> int:
+        return await ReplyBranchDoc.find(
+            ReplyBranchDoc.reply_to == reply_to,
+            ReplyBranchDoc.seen == False,
+            ReplyBranchDoc.with_search == with_search
+        ).count()
+
+    async def promote_reply_alternative(
+        self,
+        session_id: str,
+        reply_to: str,
+        current: Message,
+        with_search: bool,
+        reply_id: Optional[str] = None
+    ) -> Optional[Message]:
+        alternative = await ReplyBranchDoc.find(
+            ReplyBranchDoc.reply_to == reply_to,
+            ReplyBranchDoc.seen == False,
+            ReplyBranchDoc.with_search == with_search
+        ).sort("+created_at").first_or_none()
+        if not alternative:
+            return None
+
+        current_doc = await ChatMessageDoc.find_one(ChatMessageDoc.uid == current.uid)
+        if not current_doc:
+            return None
+
+        # The swapped-out reply stays as a branch of the same user message (its snapshot too)
+        await ReplyBranchDoc(
+            uid=current_doc.uid,
+            session_id=session_id,
+            reply_to=reply_to,
+            content=current_doc.content,
+            referenced_memory_ids=current_doc.referenced_memory_ids,
+            seen=True,
+            created_at=current_doc.created_at
+        ).insert()
+        await current_doc.delete()
+
+        message = alternative.to_entity()
+        message.created_at = datetime.utcnow() # Shown now, keeps it last in the history
+        if reply_id is not None and reply_id != alternative.uid:
+            # The id the client was given for this reply; its snapshot follows it
+            message.uid = reply_id
+            await TurnContextDoc.find(TurnContextDoc.message_uid == alternative.uid)\
+                .update({"$set": {"message_uid": reply_id}})
+        await ChatMessageDoc.from_entity(message, session_id=session_id).insert()
+        await alternative.delete()
+
+        self.versions.bump(history_key(session_id))
+        return message
+
+    async def _drop_unused_alternatives(self, session_id: str) -> None:
+        unused = await ReplyBranchDoc.find(
+            ReplyBranchDoc.session_id == session_id,
+            ReplyBranchDoc.seen == False
+        ).to_list()
+        if unused:
+            uids = [doc.uid for doc in unused]
+            await TurnContextDoc.find(In(TurnContextDoc.message_uid, uids)).delete()
+            await ReplyBranchDoc.find(In(ReplyBranchDoc.uid, uids)).delete()
 
     async def get_last_messages(self, session_id: str, limit: int = 10) -> List[Message]:
         docs = await ChatMessageDoc.find(
@@ -117,6 +229,10 @@ class MongoChatRepository(IChatRepository):
         entities = [doc.to_entity() for doc in docs]
         return list(reversed(entities))
 
+    async def get_turn_context(self, message_uid: str) -> Optional[TurnContext]:
+        doc = await TurnContextDoc.find_one(TurnContextDoc.message_uid == message_uid)
+        return doc.to_entity() if doc else None
+
     async def delete_last_message(self, session_id: str) -> bool:
         # Find the most recent message
         last_msg = await ChatMessageDoc.find(
@@ -125,5 +241,141 @@ class MongoChatRepository(IChatRepository):
         
         if last_msg:
             await last_msg.delete()
+            await TurnContextDoc.find(TurnContextDoc.message_uid == last_msg.uid).delete()
+            self.versions.bump(history_key(session_id))
             return True
-        return False
\ No newline at end of file
+        return False
+
+    async def get_messages_by_ids(
+        self,
+        uids: List[str],
+        contains: Optional[str] = None,
+        role: Optional[MessageRole] = None
+    ) -> List[MessageSearchHit]:
+        if not uids:
+            return []
+
+        conditions = [In(ChatMessageDoc.uid, uids)]
+        if contains:
+            conditions.append(RegEx(ChatMessageDoc.content, re.escape(contains), options="i"))
+        if role:
+            conditions.append(ChatMessageDoc.role == role.value)
+
+        docs = await ChatMessageDoc.find(*conditions).to_list()
+        return [
+            MessageSearchHit(session_id=doc.session_id, message=doc.to_entity())
+            for doc in docs
+        ]
+
+    async def search_messages(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> MessageSearchPage:
+        """
+        $text search as a filter, keyset pagination on (created_at, uid) descending.
+        Text score can't be used in a range filter, so it is not used for paging.
+        """
+        conditions = [Text(query)]
+        if session_id:
+            conditions.append(ChatMessageDoc.session_id == session_id)
+
+        if cursor:
+            last_created_at, last_uid = self._decode_cursor(cursor)
+            conditions.append(Or(
+                ChatMessageDoc.created_at < last_created_at,
+                And(
+                    ChatMessageDoc.created_at == last_created_at,
+                    ChatMessageDoc.uid < last_uid
+                )
+            ))
+
+        # One extra doc tells us whether there is a next page
+        docs = await ChatMessageDoc.find(*conditions)\
+            .sort("-created_at", "-uid")\
+            .limit(limit + 1)\
+            .to_list()
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = self._encode_cursor(docs[-1].created_at, docs[-1].uid)
+
+        items = [
+            MessageSearchHit(
+                session_id=doc.session_id,
+                message=doc.to_entity(),
+                highlights=self._highlight(doc.content, query)
+            )
+            for doc in docs
+        ]
+        return MessageSearchPage(items=items, next_cursor=next_cursor)
+
+    async def search_sessions(self, query: str, limit: int = 20) -> List[DialogSessionSummary]:
+        docs = await DialogSessionDoc.find(Text(query))\
+            .sort([("score", {"$meta": "textScore"})])\
+            .limit(limit)\
+            .to_list()
+        return [doc.to_summary() for doc in docs]
+
+    def _highlight(self, content: str, query: str) -> List[str]:
+        """
+        Builds short snippets around matched terms, wrapping them in <mark>.
+        Approximates Mongo's stemming by matching term prefixes.
+        Snippets are HTML: the message text in them is escaped, only <mark> is markup.
+        """
+        terms = [t for t in re.findall(r"-?\w+", query) if not t.startswith("-")]
+        if not terms:
+            return []
+
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(t) for t in terms) + r")\w*",
+            re.IGNORECASE
+        )
+
+        # Merge overlapping windows around matches, but keep each snippet short
+        max_len = 4 * self.SNIPPET_RADIUS
+        windows = []
+        for match in pattern.finditer(content):
+            start = max(0, match.start() - self.SNIPPET_RADIUS)
+            end = min(len(content), match.end() + self.SNIPPET_RADIUS)
+            if windows and start <= windows[-1][1]:
+                if end - windows[-1][0] <= max_len:
+                    windows[-1][1] = end
+                    continue
+                start = windows[-1][1]
+            windows.append([start, end])
+            if len(windows) > self.MAX_SNIPPETS:
+                windows.pop()
+                break
+
+        snippets = []
+        for start, end in windows:
+            text = self._mark(pattern, content[start:end])
+            prefix = "..." if start > 0 else ""
+            suffix = "..." if end < len(content) else ""
+            snippets.append(f"{prefix}{text}{suffix}")
+        return snippets
+
+    @staticmethod
+    def _mark(pattern: re.Pattern, text: str) -> str:
+        parts, last = [], 0
+        for match in pattern.finditer(text):
+            parts.append(html.escape(text[last:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+            last = match.end()
+        parts.append(html.escape(text[last:]))
+        return "".join(parts)
+
+    def _encode_cursor(self, created_at: datetime, uid: str) -> str:
+        raw = json.dumps([created_at.isoformat(), uid]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple[datetime, str]:
+        try:
+            created_at, uid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(created_at), uid
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
\ No newline at end of file
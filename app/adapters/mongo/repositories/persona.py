@@ -1,5 +1,6 @@
 import logging
 from typing import Optional
+from app.core.versions import PERSONA, ResourceVersions
 from app.adapters.mongo.models.persona import WaifuPersonaDoc
 from app.domain.entities.persona import WaifuPersona
 from app.domain.interfaces.repositories.persona import IPersonaRepository
@@ -11,7 +12,10 @@ class MongoPersonaRepository(IPersonaRepository):
     Implementation of Single Waifu Persistence using MongoDB.
     Acts as a Singleton store.
     """
-    
+
+    def __init__(self, versions: Optional[ResourceVersions] = None):
+        self.versions = versions or ResourceVersions()
+
     async def load(self) -> WaifuPersona:
         """
         Retrieves the Waifu. If none exists, creates a default one.
@@ -32,7 +36,8 @@ class MongoPersonaRepository(IPersonaRepository):
         # Persist it immediately so next time we find it
         new_doc = WaifuPersonaDoc.from_entity(default_persona)
         await new_doc.insert()
-        
+        self.versions.bump(PERSONA)
+
         return default_persona
 
     async def save(self, persona: WaifuPersona) -> None:
@@ -54,4 +59,5 @@ class MongoPersonaRepository(IPersonaRepository):
             # Create new (rare case if load() wasn't called first)
             new_doc = WaifuPersonaDoc.from_entity(persona)
             await new_doc.insert()
-            logger.info(f"Waifu '{persona.name}' saved as new record.")
\ No newline at end of file
+            logger.info(f"Waifu '{persona.name}' saved as new record.")
+        self.versions.bump(PERSONA)
\ No newline at end of file
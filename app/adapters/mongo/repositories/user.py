@@ -1,5 +1,6 @@
 import logging
 from typing import Optional
+from app.core.versions import USER_PROFILE, ResourceVersions
 from app.adapters.mongo.models.user import UserProfileDoc
 from app.domain.entities.user import UserProfile
 from app.domain.interfaces.repositories.user import IUserProfileRepository
@@ -11,6 +12,9 @@ class MongoUserProfileRepository(IUserProfileRepository):
     Implementation of User Profile Persistence.
     """
 
+    def __init__(self, versions: Optional[ResourceVersions] = None):
+        self.versions = versions or ResourceVersions()
+
     async def create_or_update(self, profile: UserProfile) -> None:
         # Try to find by UID
         doc = await UserProfileDoc.find_one(UserProfileDoc.uid == profile.uid)
@@ -27,6 +31,7 @@ class MongoUserProfileRepository(IUserProfileRepository):
             new_doc = UserProfileDoc.from_entity(profile)
             await new_doc.insert()
             logger.info(f"User profile '{profile.username}' created.")
+        self.versions.bump(USER_PROFILE)
 
     async def get_profile(self) -> Optional[UserProfile]:
         """
@@ -0,0 +1,48 @@
+import re
+import time
+from typing import Optional
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+# Key in collection metadata that records which model produced the vectors
+EMBEDDING_MODEL_KEY = "embedding_model"
+
+# Payload fields used by memory listing filters and 'order_by' (order_by requires a range index)
+PAYLOAD_INDEXES = {
+    "tags": models.PayloadSchemaType.KEYWORD,
+    "importance": models.PayloadSchemaType.FLOAT,
+    "created_at": models.PayloadSchemaType.DATETIME,
+}
+
+def versioned_collection_name(alias: str, model: str) -> str:
+    """
+    Physical collection name behind the alias, e.g. 'waifu_memory_v1__nomic-embed-text__1718000000'.
+    """
+    model_slug = re.sub(r"[^a-zA-Z0-9_-]+", "-", model).strip("-").lower()
+    return f"{alias}__{model_slug}__{int(time.time())}"
+
+async def resolve_alias(client: AsyncQdrantClient, alias: str) -> Optional[str]:
+    """
+    Returns the collection the alias currently points to, or None if there is no such alias.
+    """
+    response = await client.get_aliases()
+    for item in response.aliases:
+        if item.alias_name == alias:
+            return item.collection_name
+    return None
+
+
+async def ensure_payload_indexes(client: AsyncQdrantClient, collection_name: str) -> None:
+    """
+    Creates payload indexes used by memory listing. Safe to call on every boot.
+    """
+    info = await client.get_collection(collection_name)
+    existing = info.payload_schema or {}
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        if field_name in existing:
+            continue
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=schema
+        )
@@ -1,40 +1,92 @@
 import logging
+from typing import Optional
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 from app.domain.interfaces.services.embedder import IEmbedder
+from app.adapters.qdrant.vector_size import VectorSizeResolver
+from app.adapters.qdrant.collections import (
+    EMBEDDING_MODEL_KEY,
+    ensure_payload_indexes,
+    resolve_alias,
+    versioned_collection_name
+)
 
 logger = logging.getLogger(__name__)
 
 class QdrantInitializer:
+    """
+    Makes sure 'collection_name' is an alias pointing at a versioned collection
+    built with the configured embedding model.
+    """
+
     def __init__(
         self, 
         client: AsyncQdrantClient, 
         embedder: IEmbedder,
-        collection_name: str
+        collection_name: str,
+        vector_sizes: Optional[VectorSizeResolver] = None
     ):
         self.client = client
         self.embedder = embedder
         self.collection_name = collection_name
+        self.vector_sizes = vector_sizes or VectorSizeResolver()
+
+    async def run(self) -> bool:
+        """
+        Returns True when the data has to be reindexed in background
+        (embedding model changed or legacy non-aliased collection).
+        """
+        active = await resolve_alias(self.client, self.collection_name)
+
+        if active:
+            await ensure_payload_indexes(self.client, active)
+            info = await self.client.get_collection(active)
+            active_model = (info.config.metadata or {}).get(EMBEDDING_MODEL_KEY)
+            if active_model and active_model != self.embedder.model_name:
+                logger.warning(
+                    f"Collection '{active}' was built with '{active_model}', "
+                    f"configured model is '{self.embedder.model_name}'. Scheduling reindex."
+                )
+                # Keep serving the old vectors with the old model until the swap
+                self.embedder.switch_model(active_model)
+                return True
+            return False
 
-    async def run(self):
         if await self.client.collection_exists(self.collection_name):
-            return
+            logger.warning(
+                f"'{self.collection_name}' is a plain collection, not an alias. "
+                f"Scheduling migration to a versioned collection."
+            )
+            return True
 
-        logger.info(f"Initializing Qdrant collection: '{self.collection_name}'")
+        logger.info(f"Initializing Qdrant collection behind alias: '{self.collection_name}'")
 
         try:
-            dummy_vec = await self.embedder.get_vector("warmup")
-            size = len(dummy_vec)
-            logger.info(f"Detected vector size: {size}")
+            size = await self.vector_sizes.resolve(self.embedder)
+            logger.info(f"Vector size: {size}")
         except Exception as e:
             logger.error(f"Embedder error: {e}")
             raise
 
+        physical_name = versioned_collection_name(self.collection_name, self.embedder.model_name)
         await self.client.create_collection(
-            collection_name=self.collection_name,
+            collection_name=physical_name,
             vectors_config=models.VectorParams(
                 size=size,
                 distance=models.Distance.COSINE
-            )
+            ),
+            metadata={EMBEDDING_MODEL_KEY: self.embedder.model_name}
+        )
+        await ensure_payload_indexes(self.client, physical_name)
+        await self.client.update_collection_aliases(
+            change_aliases_operations=[
+                models.CreateAliasOperation(
+                    create_alias=models.CreateAlias(
+                        collection_name=physical_name,
+                        alias_name=self.collection_name
+                    )
+                )
+            ]
         )
-        logger.info("Collection created!")
\ No newline at end of file
+        logger.info(f"Collection '{physical_name}' created!")
+        return False
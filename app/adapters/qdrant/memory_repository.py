@@ -1,12 +1,15 @@
+import base64
+import json
 from dataclasses import asdict
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional
 from uuid import uuid4
 from qdrant_client import AsyncQdrantClient
 from qdrant_client import models
-from app.domain.entities.memory import MemoryFragment
+from app.domain.entities.memory import MemoryFragment, MemoryPage, MemoryQuery, MemorySortField
 from app.domain.interfaces.repositories.memory import IMemoryRepository
 from app.domain.interfaces.services.embedder import IEmbedder
+from app.adapters.qdrant.write_journal import WriteJournal
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,27 +20,31 @@ class QdrantMemoryRepository(IMemoryRepository):
         self,
         client: AsyncQdrantClient,
         embedder: IEmbedder,
-        collection_name: str = 'memory'
+        collection_name: str = 'memory',
+        journal: Optional[WriteJournal] = None # Optional: lets a running reindex replay writes
     ) -> None:
         self.client = client
         self.collection_name = collection_name
         self.embedder = embedder
+        self.journal = journal or WriteJournal()
     
     async def add_fragment(self, fragment: MemoryFragment) -> str:
-        vector = await self.embedder.get_vector(fragment.content)
         point_id = fragment.vector_id or str(uuid4())
         
         raw_payload = asdict(fragment)
         payload = self._clean_payload(raw_payload)
         
-        await self.client.upsert(
-            collection_name=self.collection_name,
-            points=[models.PointStruct(
-                id=point_id,
-                vector=vector,
-                payload=payload
-            )]
-        )
+        # Embedding inside the write: a reindex flip can't pair an old-model vector with the new collection
+        async with self.journal.write(point_id):
+            vector = await self.embedder.get_vector(fragment.content)
+            await self.client.upsert(
+                collection_name=self.collection_name,
+                points=[models.PointStruct(
+                    id=point_id,
+                    vector=vector,
+                    payload=payload
+                )]
+            )
         
         return point_id
 
@@ -58,28 +65,29 @@ class QdrantMemoryRepository(IMemoryRepository):
             with_payload=True
         )
         
-        memories = []
-        for res in search_result.points:
-            if not res.payload: 
-                continue
-
-            try:
-                res.payload['vector_id'] = str(res.id)                
-                memories.append(MemoryFragment(**res.payload))
-            
-            except TypeError as e: 
-                logger.error(f'Failed to deserialize memory {res.id}: {e}')
-                continue
+        return self._to_fragments(search_result.points)
     
-        return memories
-    
-    async def delete_fragment(self, vector_id: str) -> None:
-        await self.client.delete(
+    async def get_fragments(self, vector_ids: List[str]) -> List[MemoryFragment]:
+        if not vector_ids:
+            return []
+        # By id: no embedding call, no vector search
+        points = await self.client.retrieve(
             collection_name=self.collection_name,
-            points_selector=models.PointIdsList(
-                points=[vector_id]
-            )
+            ids=vector_ids,
+            with_payload=True
         )
+        order = {vid: i for i, vid in enumerate(vector_ids)}
+        fragments = self._to_fragments(points)
+        return sorted(fragments, key=lambda f: order.get(f.vector_id, len(order)))
+
+    async def delete_fragment(self, vector_id: str) -> None:
+        async with self.journal.write(vector_id):
+            await self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(
+                    points=[vector_id]
+                )
+            )
         logger.info(f"Deleted memory: {vector_id}")
     
     def _clean_payload(
@@ -99,15 +107,117 @@ class QdrantMemoryRepository(IMemoryRepository):
                 out[k] = v
         return out
     
-    async def list_fragments(self, limit: int = 10) -> List[MemoryFragment]:
+    async def list_fragments(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        query: Optional[MemoryQuery] = None
+    ) -> MemoryPage:
         """
-        Returns a list of memory fragments with limit specified.
+        Cursor pagination over 'scroll'.
+        Without sorting the cursor is Qdrant's 'next_page_offset'.
+        With sorting it is the last seen value + ids already returned with that value
+        (order_by scroll has no offset, so ties are excluded by id).
         """
+        query = query or MemoryQuery()
+        state = self._decode_cursor(cursor)
+        conditions = self._build_conditions(query)
+
+        if query.sort_by is None:
+            points, next_offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=models.Filter(must=conditions) if conditions else None,
+                limit=limit,
+                offset=state.get("offset"),
+                with_payload=True
+            )
+            next_cursor = self._encode_cursor({"offset": next_offset}) if next_offset is not None else None
+            return MemoryPage(items=self._to_fragments(points), next_cursor=next_cursor)
+
+        key = query.sort_by.value
+        start_from = state.get("value")
+        if start_from is not None and query.sort_by == MemorySortField.CREATED_AT:
+            start_from = datetime.fromisoformat(start_from)
+
+        seen_ids = state.get("ids", [])
+        scroll_filter = models.Filter(
+            must=conditions or None,
+            must_not=[models.HasIdCondition(has_id=seen_ids)] if seen_ids else None
+        )
+
+        # One extra point tells us whether there is a next page
         points, _ = await self.client.scroll(
             collection_name=self.collection_name,
-            limit=limit,
+            scroll_filter=scroll_filter,
+            limit=limit + 1,
+            order_by=models.OrderBy(
+                key=key,
+                direction=models.Direction.DESC if query.descending else models.Direction.ASC,
+                start_from=start_from
+            ),
             with_payload=True
         )
+
+        has_more = len(points) > limit
+        points = points[:limit]
+        next_cursor = None
+
+        if has_more and points:
+            last_value = points[-1].payload.get(key)
+            tie_ids = [str(p.id) for p in points if p.payload.get(key) == last_value]
+            if last_value == state.get("value"):
+                tie_ids = seen_ids + tie_ids
+            next_cursor = self._encode_cursor({"value": last_value, "ids": tie_ids})
+
+        return MemoryPage(items=self._to_fragments(points), next_cursor=next_cursor)
+
+    def _build_conditions(self, query: MemoryQuery) -> List[models.Condition]:
+        conditions: List[models.Condition] = []
+
+        if query.tags:
+            conditions.append(models.FieldCondition(
+                key="tags",
+                match=models.MatchAny(any=query.tags)
+            ))
+
+        if query.min_importance is not None or query.max_importance is not None:
+            conditions.append(models.FieldCondition(
+                key="importance",
+                range=models.Range(gte=query.min_importance, lte=query.max_importance)
+            ))
+
+        if query.created_after is not None or query.created_before is not None:
+            conditions.append(models.FieldCondition(
+                key="created_at",
+                range=models.DatetimeRange(gte=query.created_after, lte=query.created_before)
+            ))
+
+        return conditions
+
+    def _encode_cursor(self, state: dict) -> str:
+        raw = json.dumps(state, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def _decode_cursor(self, cursor: Optional[str]) -> dict:
+        if not cursor:
+            return {}
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+        # Valid base64 JSON is not enough: only the shapes _encode_cursor writes
+        if not isinstance(state, dict) or not state or not set(state) <= {"offset", "value", "ids"}:
+            raise ValueError("Invalid cursor")
+        if "offset" in state and (len(state) > 1 or not isinstance(state["offset"], (str, int))):
+            raise ValueError("Invalid cursor")
+        if "value" in state and not isinstance(state["value"], (str, int, float, type(None))):
+            raise ValueError("Invalid cursor")
+        if not isinstance(state.get("ids", []), list):
+            raise ValueError("Invalid cursor")
+        return state
+
+    def _to_fragments(self, points: List[Any]) -> List[MemoryFragment]:
         memories = []
         for res in points:
             if not res.payload: 
@@ -115,10 +225,14 @@ class QdrantMemoryRepository(IMemoryRepository):
 
             try:
                 res.payload['vector_id'] = str(res.id)                
+                # Stored as ISO text (see _clean_payload); the entity and the wire format want a datetime
+                created_at = res.payload.get('created_at')
+                if isinstance(created_at, str):
+                    res.payload['created_at'] = datetime.fromisoformat(created_at)
                 memories.append(MemoryFragment(**res.payload))
             
-            except TypeError as e: 
+            except (TypeError, ValueError) as e: 
                 logger.error(f'Failed to deserialize memory {res.id}: {e}')
                 continue
         
-        return memories
\ No newline at end of file
+        return memories
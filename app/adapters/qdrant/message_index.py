@@ -0,0 +1,125 @@
+import logging
+from typing import List, Optional, Tuple
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+from app.domain.entities.chat import Message
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
+from app.domain.interfaces.services.embedder import IEmbedder
+from app.adapters.qdrant.collections import EMBEDDING_MODEL_KEY
+from app.adapters.qdrant.vector_size import VectorSizeResolver
+
+logger = logging.getLogger(__name__)
+
+class QdrantMessageIndex(IMessageVectorIndex):
+    """
+    Chat messages embedded into their own collection, keyed by message uid.
+    Only ids and filterable fields live in the payload, Mongo stays the source of truth.
+    """
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        embedder: IEmbedder,
+        collection_name: str,
+        vector_sizes: Optional[VectorSizeResolver] = None
+    ):
+        self.client = client
+        self.embedder = embedder
+        self.collection_name = collection_name
+        self.vector_sizes = vector_sizes or VectorSizeResolver()
+
+    async def ensure_collection(self) -> bool:
+        """
+        Creates the collection if needed. It is a derived index, so on embedding model
+        change it is simply dropped and rebuilt.
+        Returns True if the collection is new (indexing must start from scratch).
+        """
+        if await self.client.collection_exists(self.collection_name):
+            info = await self.client.get_collection(self.collection_name)
+            model = (info.config.metadata or {}).get(EMBEDDING_MODEL_KEY)
+            if model == self.embedder.model_name:
+                return False
+
+            logger.warning(
+                f"Message index '{self.collection_name}' was built with '{model}', "
+                f"rebuilding for '{self.embedder.model_name}'"
+            )
+            await self.client.delete_collection(self.collection_name)
+
+        size = await self.vector_sizes.resolve(self.embedder)
+        await self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=models.VectorParams(
+                size=size,
+                distance=models.Distance.COSINE
+            ),
+            metadata={EMBEDDING_MODEL_KEY: self.embedder.model_name}
+        )
+        await self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="session_id",
+            field_schema=models.PayloadSchemaType.KEYWORD
+        )
+        logger.info(f"Message index '{self.collection_name}' created")
+        return True
+
+    async def index_messages(self, items: List[Tuple[str, Message]]) -> None:
+        items = [(sid, msg) for sid, msg in items if msg.content.strip()]
+        if not items:
+            return
+
+        vectors = await self.embedder.get_vectors([msg.content for _, msg in items])
+        await self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                models.PointStruct(
+                    id=msg.uid,
+                    vector=vec,
+                    payload={
+                        "session_id": session_id,
+                        "role": msg.role.value,
+                        "created_at": msg.created_at.isoformat()
+                    }
+                )
+                for (session_id, msg), vec in zip(items, vectors)
+            ]
+        )
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        vec = await self.embedder.get_vector(query)
+
+        query_filter = None
+        if session_id:
+            query_filter = models.Filter(must=[
+                models.FieldCondition(
+                    key="session_id",
+                    match=models.MatchValue(value=session_id)
+                )
+            ])
+
+        result = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=vec,
+            query_filter=query_filter,
+            limit=limit,
+            with_payload=False
+        )
+        return [(str(p.id), p.score) for p in result.points]
+
+    async def delete_session(self, session_id: str) -> None:
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(must=[
+                    models.FieldCondition(
+                        key="session_id",
+                        match=models.MatchValue(value=session_id)
+                    )
+                ])
+            )
+        )
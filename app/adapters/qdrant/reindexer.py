@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Set
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+from app.domain.interfaces.services.embedder import IEmbedder
+from app.adapters.qdrant.vector_size import VectorSizeResolver
+from app.adapters.qdrant.write_journal import WriteJournal
+from app.adapters.qdrant.collections import (
+    EMBEDDING_MODEL_KEY,
+    ensure_payload_indexes,
+    resolve_alias,
+    versioned_collection_name
+)
+
+logger = logging.getLogger(__name__)
+
+class QdrantReindexer:
+    """
+    Shadow reindex for embedding model migrations.
+
+    1. Creates a new versioned collection sized for the target model.
+    2. Streams all points from the live collection via 'scroll', re-embeds them in batches.
+    3. Catches up on points created while copying, and replays the edits and deletes
+       the write journal recorded.
+    4. Holds memory writes, catches up once more and flips the alias atomically, so readers
+       never see a half-built collection and no write lands in the old one unseen.
+    A failed run drops the new collection; the alias still points to the old one.
+    """
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        live_embedder: IEmbedder,
+        target_embedder: IEmbedder,
+        alias: str,
+        batch_size: int = 64,
+        max_points_per_sec: float = 200.0,
+        drop_old: bool = False,
+        vector_sizes: Optional[VectorSizeResolver] = None,
+        journal: Optional[WriteJournal] = None # Shared with the memory repository
+    ):
+        self.client = client
+        self.live_embedder = live_embedder
+        self.target_embedder = target_embedder
+        self.alias = alias
+        self.batch_size = batch_size
+        self.max_points_per_sec = max_points_per_sec
+        self.drop_old = drop_old
+        self.vector_sizes = vector_sizes or VectorSizeResolver()
+        self.journal = journal or WriteJournal()
+        self._lock = asyncio.Lock()
+
+    async def run(self) -> Optional[str]:
+        """
+        Returns the name of the new collection, or None if another reindex is already running.
+        """
+        if self._lock.locked():
+            logger.info("Reindex already in progress, skipping.")
+            return None
+
+        async with self._lock:
+            return await self._reindex()
+
+    async def _reindex(self) -> str:
+        source = await resolve_alias(self.client, self.alias)
+        is_legacy = source is None
+        if is_legacy:
+            # Pre-alias deployments: the alias name is a real collection
+            source = self.alias
+
+        target_model = self.target_embedder.model_name
+        target = versioned_collection_name(self.alias, target_model)
+        size = await self.vector_sizes.resolve(self.target_embedder)
+
+        logger.info(f"Reindexing '{source}' -> '{target}' (model: {target_model}, size: {size})")
+        await self.client.create_collection(
+            collection_name=target,
+            vectors_config=models.VectorParams(
+                size=size,
+                distance=models.Distance.COSINE
+            ),
+            metadata={EMBEDDING_MODEL_KEY: target_model}
+        )
+        await ensure_payload_indexes(self.client, target)
+
+        self.journal.start()
+        flipped = False
+        try:
+            started_at = datetime.now(timezone.utc)
+            copied = await self._copy(source, target)
+
+            # Writes that happened while we were copying: new points by timestamp,
+            # edits and deletes from the journal
+            swap_started_at = datetime.now(timezone.utc)
+            copied += await self._copy(source, target, since=started_at)
+            copied += await self._replay(source, target, self.journal.drain())
+
+            async with self.journal.paused():
+                # Only the writes of the last few calls are left: copy them, then flip
+                copied += await self._copy(source, target, since=swap_started_at)
+                copied += await self._replay(source, target, self.journal.drain())
+                await self._swap_alias(source, target, is_legacy)
+                flipped = True
+                self.live_embedder.switch_model(target_model)
+        except BaseException:
+            if not flipped:
+                logger.error(f"Reindex into '{target}' failed, dropping it; '{source}' stays live")
+                await self.client.delete_collection(target)
+            raise
+        finally:
+            self.journal.stop()
+
+        if not is_legacy and self.drop_old:
+            await self.client.delete_collection(source)
+            logger.info(f"Dropped old collection '{source}'")
+
+        logger.info(f"Reindex finished: {copied} points copied into '{target}'")
+        return target
+
+    async def _copy(self, source: str, target: str, since: Optional[datetime] = None) -> int:
+        scroll_filter = None
+        if since:
+            scroll_filter = models.Filter(must=[
+                models.FieldCondition(
+                    key="created_at",
+                    range=models.DatetimeRange(gte=since)
+                )
+            ])
+
+        copied = 0
+        offset = None
+        while True:
+            batch_started = time.monotonic()
+            points, offset = await self.client.scroll(
+                collection_name=source,
+                scroll_filter=scroll_filter,
+                limit=self.batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            records = [p for p in points if p.payload and p.payload.get("content")]
+
+            if records:
+                vectors = await self.target_embedder.get_vectors(
+                    [r.payload["content"] for r in records]
+                )
+                await self.client.upsert(
+                    collection_name=target,
+                    points=self._to_points(records, vectors)
+                )
+                copied += len(records)
+                await self._throttle(len(records), time.monotonic() - batch_started)
+
+            if offset is None:
+                return copied
+
+    async def _replay(self, source: str, target: str, point_ids: Set[str]) -> int:
+        """
+        Makes 'point_ids' in the target match the source: re-embedded if still there, deleted if not.
+        """
+        if not point_ids:
+            return 0
+        ids = list(point_ids)
+        points = await self.client.retrieve(collection_name=source, ids=ids, with_payload=True)
+        records = [p for p in points if p.payload and p.payload.get("content")]
+        gone = [pid for pid in ids if pid not in {str(r.id) for r in records}]
+
+        if records:
+            vectors = await self.target_embedder.get_vectors([r.payload["content"] for r in records])
+            await self.client.upsert(collection_name=target, points=self._to_points(records, vectors))
+        if gone:
+            await self.client.delete(
+                collection_name=target,
+                points_selector=models.PointIdsList(points=gone)
+            )
+        return len(records)
+
+    def _to_points(self, records: List[models.Record], vectors: List[List[float]]) -> List[models.PointStruct]:
+        return [
+            models.PointStruct(id=r.id, vector=vec, payload=r.payload)
+            for r, vec in zip(records, vectors)
+        ]
+
+    async def _throttle(self, batch_len: int, elapsed: float) -> None:
+        if self.max_points_per_sec <= 0:
+            return
+        budget = batch_len / self.max_points_per_sec
+        if budget > elapsed:
+            await asyncio.sleep(budget - elapsed)
+
+    async def _swap_alias(self, source: str, target: str, is_legacy: bool) -> None:
+        create_op = models.CreateAliasOperation(
+            create_alias=models.CreateAlias(collection_name=target, alias_name=self.alias)
+        )
+
+        if is_legacy:
+            try:
+                # Alias first: the name never stops resolving to a collection
+                await self.client.update_collection_aliases(change_aliases_operations=[create_op])
+                await self.client.delete_collection(source)
+            except UnexpectedResponse:
+                # Qdrant server rejects an alias named like an existing collection: short gap
+                # (one time only, writes are held, reads fail soft)
+                await self.client.delete_collection(source)
+                await self.client.update_collection_aliases(change_aliases_operations=[create_op])
+        else:
+            # Both operations are applied atomically by Qdrant
+            await self.client.update_collection_aliases(change_aliases_operations=[
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=self.alias)
+                ),
+                create_op
+            ])
+        logger.info(f"Alias '{self.alias}' now points to '{target}'")
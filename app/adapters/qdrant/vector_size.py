@@ -0,0 +1,53 @@
+import logging
+from typing import Dict, Optional
+from app.domain.interfaces.services.embedder import IEmbedder
+from app.adapters.mongo.models.embedding import EmbeddingModelDoc
+
+logger = logging.getLogger(__name__)
+
+class VectorSizeResolver:
+    """
+    Vector size for an embedding model, needed to create a collection.
+
+    Lookup order: memory -> EMBEDDING_VECTOR_SIZE (configured model only) -> Mongo -> one
+    "warmup" embedding call, whose result is stored in Mongo. Asking the embedder means
+    waiting for Ollama to load the model, which is what made cold starts slow.
+    """
+
+    def __init__(self, configured: Optional[Dict[str, int]] = None):
+        self._sizes: Dict[str, int] = dict(configured or {})
+
+    async def resolve(self, embedder: IEmbedder) -> int:
+        model = embedder.model_name
+        size = self._sizes.get(model)
+        if size is not None:
+            return size
+
+        size = await self._load(model)
+        if size is None:
+            size = len(await embedder.get_vector("warmup"))
+            logger.info(f"Detected vector size for '{model}': {size}")
+            await self._save(model, size)
+
+        self._sizes[model] = size
+        return size
+
+    async def _load(self, model: str) -> Optional[int]:
+        try:
+            doc = await EmbeddingModelDoc.find_one(EmbeddingModelDoc.model == model)
+        except Exception as e:
+            # The cache is an optimization, never a reason to fail collection setup
+            logger.warning(f"Vector size cache unavailable: {e}")
+            return None
+        return doc.vector_size if doc else None
+
+    async def _save(self, model: str, size: int) -> None:
+        try:
+            doc = await EmbeddingModelDoc.find_one(EmbeddingModelDoc.model == model)
+            if doc:
+                doc.vector_size = size
+                await doc.save()
+            else:
+                await EmbeddingModelDoc(model=model, vector_size=size).insert()
+        except Exception as e:
+            logger.warning(f"Could not cache vector size for '{model}': {e}")
@@ -0,0 +1,65 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Set
+
+class WriteJournal:
+    """
+    Memory point ids written (upserted or deleted) while a reindex copies the collection,
+    so the reindex can replay edits and deletes its created_at catch-up can't see.
+    It can also hold writes for the moment the alias flips.
+
+    Shared by the memory repository (writer) and the reindexer (reader), in-process only.
+    """
+
+    def __init__(self):
+        self._touched: Optional[Set[str]] = None # None = not recording
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._in_flight = 0
+        self._idle = asyncio.Condition()
+
+    def start(self) -> None:
+        self._touched = set()
+
+    def stop(self) -> None:
+        self._touched = None
+
+    def drain(self) -> Set[str]:
+        touched = self._touched or set()
+        if self._touched is not None:
+            self._touched = set()
+        return touched
+
+    @asynccontextmanager
+    async def write(self, point_id: str) -> AsyncIterator[None]:
+        """
+        Wraps one write. The id is recorded before and after it, so a drain racing
+        with the write doesn't lose it.
+        """
+        await self._writable.wait()
+        self._in_flight += 1
+        self._record(point_id)
+        try:
+            yield
+        finally:
+            self._record(point_id)
+            async with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    @asynccontextmanager
+    async def paused(self) -> AsyncIterator[None]:
+        """
+        Holds new writes and waits for the ones in flight to finish.
+        """
+        self._writable.clear()
+        try:
+            async with self._idle:
+                await self._idle.wait_for(lambda: self._in_flight == 0)
+            yield
+        finally:
+            self._writable.set()
+
+    def _record(self, point_id: str) -> None:
+        if self._touched is not None:
+            self._touched.add(str(point_id))
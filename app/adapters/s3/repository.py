@@ -1,9 +1,29 @@
-import boto3
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, List, Optional
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
+from app.domain.entities.icon import IconPage
 
 class S3WaifuIconRepository(IWaifuIconRepository):
-    def __init__(self, s3_client, bucket_name: str, endpoint_url: str):
+    """
+    boto3 is synchronous, so every call runs on a small dedicated thread pool.
+    The pool size matches the client's connection pool, so threads never wait for a connection
+    and the event loop (and token streaming) is never blocked by S3 round-trips.
+    """
+
+    # S3 minimum size for every multipart part except the last one. With ICON_MAX_BYTES at its
+    # 5 MiB default every icon fits in one put_object; multipart kicks in only for a higher limit
+    PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        endpoint_url: str,
+        max_workers: int = 8,
+        cache_control: Optional[str] = None
+    ):
         self.s3 = s3_client
         self.bucket = bucket_name
         # For MinIO running in Docker, the endpoint internal URL is http://minio:9000
@@ -15,25 +35,118 @@ class S3WaifuIconRepository(IWaifuIconRepository):
         # or we might need a separate PUBLIC_URL config. 
         # For now, let's assume endpoint_url is accessible by browser (e.g. localhost:9000)
         self.endpoint_url = endpoint_url
+        # Keys are content-addressed, so objects are immutable and browsers/CDNs may keep them forever
+        self.cache_control = cache_control
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3")
+
+    async def _run(self, fn: Callable[..., Any], **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _url(self, key: str) -> str:
+        return f"{self.endpoint_url}/{self.bucket}/{key}"
+
+    def _object_headers(self, content_type: str) -> dict:
+        headers = {"ContentType": content_type}
+        if self.cache_control:
+            headers["CacheControl"] = self.cache_control
+        return headers
 
     async def upload_icon(self, filename: str, content: bytes, content_type: str) -> str:
-        self.s3.put_object(
+        await self._run(
+            self.s3.put_object,
             Bucket=self.bucket,
             Key=filename,
             Body=content,
-            ContentType=content_type
+            **self._object_headers(content_type)
+        )
+        return self._url(filename)
+
+    async def upload_icon_stream(self, filename: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        parts: List[dict] = []
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.PART_SIZE:
+                    if upload_id is None:
+                        response = await self._run(
+                            self.s3.create_multipart_upload,
+                            Bucket=self.bucket,
+                            Key=filename,
+                            **self._object_headers(content_type)
+                        )
+                        upload_id = response["UploadId"]
+                    await self._upload_part(filename, upload_id, parts, bytes(buffer[:self.PART_SIZE]))
+                    del buffer[:self.PART_SIZE]
+
+            if upload_id is None:
+                # Small file: single request is cheaper than a multipart session
+                return await self.upload_icon(filename, bytes(buffer), content_type)
+
+            if buffer:
+                await self._upload_part(filename, upload_id, parts, bytes(buffer))
+            await self._run(
+                self.s3.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=filename,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+            return self._url(filename)
+
+        except BaseException:
+            if upload_id is not None:
+                await asyncio.shield(self._run(
+                    self.s3.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=filename,
+                    UploadId=upload_id
+                ))
+            raise
+
+    async def _upload_part(self, filename: str, upload_id: str, parts: List[dict], body: bytes) -> None:
+        part_number = len(parts) + 1
+        response = await self._run(
+            self.s3.upload_part,
+            Bucket=self.bucket,
+            Key=filename,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body
         )
-        return f"{self.endpoint_url}/{self.bucket}/{filename}"
+        parts.append({"ETag": response["ETag"], "PartNumber": part_number})
 
     async def list_icons(self) -> List[str]:
-        response = self.s3.list_objects_v2(Bucket=self.bucket)
-        if 'Contents' not in response:
-            return []
-        
-        return [
-            f"{self.endpoint_url}/{self.bucket}/{obj['Key']}"
-            for obj in response['Contents']
-        ]
+        urls: List[str] = []
+        cursor = None
+        while True:
+            page = await self.list_icons_page(limit=1000, cursor=cursor)
+            urls.extend(page.items)
+            if page.next_cursor is None:
+                return urls
+            cursor = page.next_cursor
+
+    async def list_icons_page(self, limit: int = 100, cursor: Optional[str] = None) -> IconPage:
+        params = {
+            "Bucket": self.bucket,
+            "MaxKeys": limit,
+            # Top level only: thumbnails are grouped into CommonPrefixes
+            "Delimiter": "/"
+        }
+        if cursor:
+            params["ContinuationToken"] = cursor
+
+        response = await self._run(self.s3.list_objects_v2, **params)
+        return IconPage(
+            items=[self._url(obj["Key"]) for obj in response.get("Contents", [])],
+            next_cursor=response.get("NextContinuationToken") if response.get("IsTruncated") else None
+        )
 
     async def delete_icon(self, filename: str) -> None:
-        self.s3.delete_object(Bucket=self.bucket, Key=filename)
+        await self._run(self.s3.delete_object, Bucket=self.bucket, Key=filename)
@@ -0,0 +1,170 @@
+import asyncio
+import codecs
+import ipaddress
+import logging
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+from urllib.parse import urlsplit
+import aiohttp
+from aiohttp.abc import AbstractResolver, ResolveResult
+from app.core import deadline
+from app.core.cache import TTLCache
+from app.domain.interfaces.tools.page_fetcher import IPageFetcher
+
+logger = logging.getLogger(__name__)
+
+class _ReadableTextParser(HTMLParser):
+    """
+    Minimal readability: drops non-content elements and keeps block text.
+    """
+
+    SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "template"}
+    BLOCK_TAGS = {"p", "div", "li", "section", "article", "main", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def text(self) -> str:
+        raw = "".join(self._parts)
+        lines = (re.sub(r"\s+", " ", line).strip() for line in raw.split("\n"))
+        # Very short lines are usually menus, buttons and breadcrumbs
+        return "\n".join(line for line in lines if len(line) > 30)
+
+def _is_public(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address.split("%", 1)[0]).is_global
+    except ValueError:
+        return False
+
+class _PublicResolver(AbstractResolver):
+    """
+    Resolves only to public addresses: search results (and their redirects) must not
+    make the backend reach loopback, private networks or cloud metadata endpoints.
+    """
+
+    def __init__(self):
+        self._resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = 0) -> List[ResolveResult]:
+        results = [r for r in await self._resolver.resolve(host, port, family) if _is_public(r["host"])]
+        if not results:
+            raise OSError(f"{host} resolves to no public address")
+        return results
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+class AiohttpPageFetcher(IPageFetcher):
+    """
+    Fetches pages over a pooled aiohttp session and caches extracted text by URL.
+    """
+
+    def __init__(
+        self,
+        timeout_sec: float = 4.0,
+        max_bytes: int = 1_000_000,
+        max_connections: int = 20,
+        cache: Optional[TTLCache[str]] = None
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout_sec)
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.cache = cache or TTLCache(maxsize=256, ttl_sec=3600)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    ttl_dns_cache=300,
+                    resolver=_PublicResolver()
+                ),
+                timeout=self.timeout,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; wfAI/1.0)"}
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def fetch_text(self, url: str) -> Optional[str]:
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached or None
+
+        # IP literals skip the resolver, check them here
+        host = urlsplit(url).hostname or ""
+        if self._is_ip(host) and not _is_public(host):
+            logger.info(f"Skipping {url}: not a public address")
+            return None
+
+        try:
+            # Never past the request deadline, even if the page budget allows more
+            timeout = aiohttp.ClientTimeout(total=deadline.timeout(self.timeout.total))
+            async with self._get_session().get(url, timeout=timeout) as resp:
+                content_type = resp.headers.get("Content-Type", "")
+                if resp.status != 200 or "html" not in content_type:
+                    logger.info(f"Skipping {url}: status={resp.status}, type={content_type}")
+                    return None
+
+                body = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    body += chunk
+                    if len(body) >= self.max_bytes:
+                        del body[self.max_bytes:]
+                        break
+                html = bytes(body).decode(self._codec(resp.charset), errors="ignore")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            logger.info(f"Failed to fetch {url}: {e!r}")
+            return None
+
+        # HTML parsing is CPU bound, keep the event loop free for token streaming
+        text = await asyncio.to_thread(self._extract, html)
+        # Empty string is cached too: no point re-fetching a page without content
+        self.cache.set(url, text)
+        return text or None
+
+    @staticmethod
+    def _is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _codec(charset: Optional[str]) -> str:
+        # Servers send made-up charsets; decoding with one would raise LookupError
+        try:
+            return codecs.lookup(charset).name if charset else "utf-8"
+        except LookupError:
+            return "utf-8"
+
+    @staticmethod
+    def _extract(html: str) -> str:
+        parser = _ReadableTextParser()
+        parser.feed(html)
+        parser.close()
+        return parser.text()
@@ -1,46 +1,90 @@
 import aiohttp
 import logging
-from typing import List, Dict
+from contextlib import nullcontext
+from typing import List, Optional
+from app.domain.entities.search import SearchResult
+from app.domain.exceptions import DependencyUnavailable
 from app.domain.interfaces.tools.search import ISearchTool
+from app.core import deadline
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpen
 
 logger = logging.getLogger(__name__)
 
+def is_outage(error: BaseException) -> bool:
+    # Refused connections, timeouts and 5xx/429 (mapped to DependencyUnavailable below), not 4xx
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, TimeoutError, DependencyUnavailable))
+
 class SearXNGSearchTool(ISearchTool):
-    def __init__(self, base_url: str = "http://searxng:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://searxng:8080",
+        timeout_sec: float = 10.0,
+        breaker: Optional[CircuitBreaker] = None # Optional: fail fast while SearXNG is down
+    ):
         self.base_url = base_url.rstrip("/")
+        self.timeout_sec = timeout_sec # aiohttp's default is 5 minutes
+        self.breaker = breaker
+        # One pooled session for all queries (fan-out reuses connections)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def search_results(self, query: str, limit: int = 10) -> List[SearchResult]:
+        params = {
+            "q": query,
+            "format": "json",
+            "language": "auto"
+        }
+        timeout = aiohttp.ClientTimeout(total=deadline.timeout(self.timeout_sec))
+        try:
+            with self.breaker.call() if self.breaker else nullcontext():
+                async with self._get_session().get(f"{self.base_url}/search", params=params, timeout=timeout) as resp:
+                    if resp.status >= 500 or resp.status == 429:
+                        raise DependencyUnavailable(f"Search: SearXNG returned status {resp.status}")
+                    if resp.status != 200:
+                        raise RuntimeError(f"SearXNG returned status {resp.status}")
+                    data = await resp.json()
+        except CircuitOpen as e:
+            raise DependencyUnavailable(f"Search: {e}") from e
+
+        return [
+            SearchResult(
+                title=res.get("title", "No Title"),
+                url=res.get("url", "#"),
+                content=res.get("content", "No Content"),
+                score=float(res.get("score") or 0.0),
+                queries=[query]
+            )
+            for res in data.get("results", [])[:limit]
+        ]
         
     async def search(self, query: str) -> str:
         """
         Queries the local SearXNG instance and returns a formatted summary.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "q": query,
-                    "format": "json",
-                    "language": "auto"
-                }
-                async with session.get(f"{self.base_url}/search", params=params) as resp:
-                    if resp.status != 200:
-                        logger.error(f"SearXNG returned status {resp.status}")
-                        return "Error: Unable to perform search."
-                    
-                    data = await resp.json()
-                    results = data.get("results", [])
-                    
-                    if not results:
-                        return "No results found."
-                    
-                    # Format top 3 results
-                    formatted = []
-                    for idx, res in enumerate(results[:3], 1):
-                        title = res.get("title", "No Title")
-                        content = res.get("content", "No Content")
-                        url = res.get("url", "#")
-                        formatted.append(f"{idx}. {title}: {content} ({url})")
-                        
-                    return "\n".join(formatted)
-                    
+            results = await self.search_results(query, limit=3)
+        except DependencyUnavailable as e:
+            logger.warning(f"Search tool unavailable: {e}")
+            return f"Error performing search: {str(e)}"
         except Exception as e:
             logger.exception("Search tool error")
             return f"Error performing search: {str(e)}"
+
+        if not results:
+            return "No results found."
+
+        # Format top 3 results
+        return "\n".join(
+            f"{idx}. {res.title}: {res.content} ({res.url})"
+            for idx, res in enumerate(results, 1)
+        )
@@ -0,0 +1,26 @@
+import importlib
+import inspect
+import pkgutil
+from typing import List, Type
+from app.application.commands.contract import ICommand
+
+COMMANDS_PACKAGE = "app.application.commands.implementations"
+
+def discover_commands(package: str = COMMANDS_PACKAGE) -> List[Type[ICommand]]:
+    """
+    Concrete ICommand classes defined in 'package' (one level deep).
+    Adding a command means dropping a module there: its dependencies come from the
+    constructor type hints, no provider code to touch.
+    """
+    root = importlib.import_module(package)
+    found: List[Type[ICommand]] = []
+    for info in pkgutil.iter_modules(root.__path__):
+        module = importlib.import_module(f"{package}.{info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(cls, ICommand)
+                and not inspect.isabstract(cls)
+                and cls.__module__ == module.__name__ # Skip re-imported classes
+            ):
+                found.append(cls)
+    return found
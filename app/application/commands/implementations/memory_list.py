@@ -1,12 +1,15 @@
 """
 List memory fragments command
 """
+from pydantic import BaseModel, Field
+
 from app.application.commands.base import BaseCommand
 from app.domain.interfaces.repositories.memory import IMemoryRepository
-from app.domain.entities.memory import MemoryFragment
-from typing import List
 
-class MemoryListCommand(BaseCommand):
+class MemoryListArgs(BaseModel):
+    limit: int = Field(10, ge=1, le=50, description="How many fragments to show.")
+
+class MemoryListCommand(BaseCommand[MemoryListArgs]):
 
     @property
     def name(self) -> str:
@@ -14,14 +17,24 @@ class MemoryListCommand(BaseCommand):
 
     @property
     def description(self) -> str:
-        return "Lists memory fragments"
+        return (
+            "Lists memory fragments.\n"
+            "Params:\n"
+            "limit - how many to show (1 to 50)"
+        )
 
     @property
-    def args_schema(self) -> type[BaseModel]:
-        return None
+    def args_schema(self) -> type[MemoryListArgs]:
+        return MemoryListArgs
 
     def __init__(self, repository: IMemoryRepository) -> None:
         self.repository = repository
-    
-    async def execute(self, limit: int = 10) -> List[MemoryFragment]:
-        return await self.repository.list_fragments(limit)
\ No newline at end of file
+
+    async def execute(self, args: MemoryListArgs, session_id: str) -> str:
+        page = await self.repository.list_fragments(limit=args.limit)
+        if not page.items:
+            return "No memories yet."
+        return "\n".join(
+            f"- {fragment.content} (Imp: {fragment.importance})"
+            for fragment in page.items
+        )
@@ -0,0 +1,163 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stages the policy watches
+LLM = "llm" # Time to first token: grows with the LLM queue
+MEMORY = "memory"
+SEARCH = "search"
+
+@dataclass(frozen=True, slots=True)
+class DegradationPlan:
+    """
+    How much work a turn may do. Level 0 is the normal pipeline.
+    """
+    level: int
+    history_limit: int
+    memory_limit: int # 0 = no memory retrieval
+    use_search: bool
+    max_tokens: Optional[int] # None = model default
+    timeout_scale: float # Applied to memory/search time budgets
+
+    @property
+    def degraded(self) -> bool:
+        return self.level > 0
+
+# One step per level: every level is strictly cheaper than the previous one
+LEVELS: Tuple[DegradationPlan, ...] = (
+    DegradationPlan(level=0, history_limit=10, memory_limit=3, use_search=True, max_tokens=None, timeout_scale=1.0),
+    DegradationPlan(level=1, history_limit=6, memory_limit=2, use_search=True, max_tokens=768, timeout_scale=0.6),
+    DegradationPlan(level=2, history_limit=4, memory_limit=1, use_search=False, max_tokens=384, timeout_scale=0.4),
+    DegradationPlan(level=3, history_limit=2, memory_limit=0, use_search=False, max_tokens=192, timeout_scale=0.25),
+)
+
+class StageWindow:
+    """
+    Recent (timestamp, seconds, ok) samples of one stage, pruned to 'window_sec'.
+    """
+
+    def __init__(self, window_sec: float, maxlen: int = 200):
+        self.window_sec = window_sec
+        self._samples: Deque[Tuple[float, float, bool]] = deque(maxlen=maxlen)
+
+    def add(self, seconds: float, ok: bool) -> None:
+        self._samples.append((time.monotonic(), seconds, ok))
+
+    def stats(self) -> Tuple[int, float, float]:
+        """
+        (samples, median seconds of successful calls, error rate)
+        """
+        cutoff = time.monotonic() - self.window_sec
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        if not self._samples:
+            return 0, 0.0, 0.0
+
+        durations = sorted(s for _, s, ok in self._samples if ok)
+        errors = sum(1 for _, _, ok in self._samples if not ok)
+        median = durations[len(durations) // 2] if durations else 0.0
+        return len(self._samples), median, errors / len(self._samples)
+
+class DegradationPolicy:
+    """
+    Load-aware plan for each chat turn: serve everyone slightly worse instead of timing everyone out.
+
+    Signals, all from the last 'window_sec':
+    - turns in flight (the LLM queue as seen from here): one level per 'queue_step' turns;
+    - median time to first token: one level per 'ttft_sec';
+    - memory / search: slow (median above their threshold) or failing (error rate above
+      'max_error_rate') turns that stage off on its own, whatever the level.
+    Samples age out, so once a skipped stage has been quiet for a window it is tried again.
+    """
+
+    MIN_SAMPLES = 3 # Below this a window says nothing
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        queue_step: int = 4,
+        ttft_sec: float = 5.0,
+        memory_slow_sec: float = 1.0,
+        search_slow_sec: float = 8.0,
+        max_error_rate: float = 0.5,
+        window_sec: float = 60.0
+    ):
+        self.enabled = enabled
+        self.queue_step = queue_step
+        self.ttft_sec = ttft_sec
+        self.slow_sec = {MEMORY: memory_slow_sec, SEARCH: search_slow_sec}
+        self.max_error_rate = max_error_rate
+        self.in_flight = 0
+        self._windows: Dict[str, StageWindow] = {
+            stage: StageWindow(window_sec) for stage in (LLM, MEMORY, SEARCH)
+        }
+        self._last_level = 0
+
+    @contextmanager
+    def turn(self) -> Iterator[None]:
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def observe(self, stage: str, seconds: float, ok: bool = True) -> None:
+        self._windows[stage].add(seconds, ok)
+
+    def plan(self) -> DegradationPlan:
+        """
+        Plan for a turn that is starting now (call inside turn(), it counts itself).
+        """
+        if not self.enabled:
+            return LEVELS[0]
+
+        level = self._level()
+        plan = LEVELS[level]
+        if level != self._last_level:
+            log = logger.warning if level > self._last_level else logger.info
+            log(f"Degradation level {self._last_level} -> {level} ({self.in_flight} turns in flight)")
+            self._last_level = level
+
+        memory_limit = plan.memory_limit if self._healthy(MEMORY) else 0
+        use_search = plan.use_search and self._healthy(SEARCH)
+        if memory_limit == plan.memory_limit and use_search == plan.use_search:
+            return plan
+        return DegradationPlan(
+            level=max(plan.level, 1), # Skipping a stage is degraded service even under light load
+            history_limit=plan.history_limit,
+            memory_limit=memory_limit,
+            use_search=use_search,
+            max_tokens=plan.max_tokens,
+            timeout_scale=plan.timeout_scale
+        )
+
+    def report(self) -> dict:
+        stages = {}
+        for stage, window in self._windows.items():
+            samples, median, error_rate = window.stats()
+            stages[stage] = {"samples": samples, "median_sec": round(median, 3), "error_rate": round(error_rate, 2)}
+        return {"level": self._level() if self.enabled else 0, "in_flight": self.in_flight, "stages": stages}
+
+    def _level(self) -> int:
+        return min(max(self._queue_level(), self._ttft_level()), len(LEVELS) - 1)
+
+    def _queue_level(self) -> int:
+        # The turn asking for a plan is already counted: 'queue_step' turns alone stay at level 0
+        return max(0, self.in_flight - 1) // self.queue_step if self.queue_step > 0 else 0
+
+    def _ttft_level(self) -> int:
+        samples, median, _ = self._windows[LLM].stats()
+        if samples < self.MIN_SAMPLES or self.ttft_sec <= 0:
+            return 0
+        return int(median // self.ttft_sec)
+
+    def _healthy(self, stage: str) -> bool:
+        samples, median, error_rate = self._windows[stage].stats()
+        if samples < self.MIN_SAMPLES:
+            return True
+        return error_rate <= self.max_error_rate and median <= self.slow_sec[stage]
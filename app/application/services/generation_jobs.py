@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.domain.exceptions import GenerationExpired
+
+logger = logging.getLogger(__name__)
+
+FAILED_NOTE = "\n\n*(Reply failed, please try again)*"
+
+class GenerationJob:
+    """
+    One reply being generated, decoupled from the HTTP response that asked for it.
+
+    Output is buffered as UTF-8 bytes so any number of clients can read it from any byte
+    offset: a reconnecting client passes how many bytes it already has and gets the rest,
+    a second tab attaches from 0. A client going away doesn't stop the generation.
+    """
+
+    def __init__(self, message_id: str, fingerprint: Optional[str] = None):
+        self.message_id = message_id
+        self.fingerprint = fingerprint
+        self.buffer = bytearray()
+        self.done = False
+        self.error: Optional[str] = None # Set when generation failed or was cancelled
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.done and self.error is not None
+
+    async def subscribe(self, offset: int = 0) -> AsyncIterator[bytes]:
+        position = offset
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.done or len(self.buffer) > position)
+                chunk = bytes(self.buffer[position:])
+                finished = self.done
+            if chunk:
+                position += len(chunk)
+                yield chunk
+            if finished and position >= len(self.buffer):
+                return
+
+    async def _run(self, stream: AsyncIterator[str]) -> None:
+        try:
+            async for text in stream:
+                async with self._changed:
+                    self.buffer += text.encode()
+                    self._changed.notify_all()
+        except asyncio.CancelledError:
+            self.error = "cancelled"
+            raise
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                # A request deadline ran out: expected under load, not a bug
+                logger.warning(f"Generation '{self.message_id}' timed out: {e}")
+            else:
+                logger.exception(f"Generation '{self.message_id}' failed")
+            # The detail stays in 'error' and the log: the buffer is the reply clients resume from
+            self.error = str(e)
+            async with self._changed:
+                self.buffer += FAILED_NOTE.encode()
+        finally:
+            self.done = True
+            self.finished_at = time.monotonic()
+            async with self._changed:
+                self._changed.notify_all()
+
+class GenerationJobRegistry:
+    """
+    In-memory generation jobs by message id. Finished jobs stay readable for 'ttl_sec',
+    after that the reply is only in the chat history. Single process: a job is only
+    resumable on the worker that runs it.
+
+    Duplicate requests attach to an existing job instead of generating again:
+    - idempotency keys (client retries) map to their job for 'key_ttl_sec';
+    - fingerprints (same request content) match only while the job is still running,
+      which covers double-clicks without clients having to send a key.
+    """
+
+    def __init__(self, ttl_sec: float = 300.0, max_jobs: int = 256, key_ttl_sec: float = 600.0):
+        self.ttl_sec = ttl_sec
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._keys: TTLCache[str] = TTLCache(maxsize=max_jobs * 4, ttl_sec=key_ttl_sec)
+        self._running: Dict[str, GenerationJob] = {}
+
+    def start(
+        self,
+        message_id: str,
+        stream: AsyncIterator[str],
+        key: Optional[str] = None,
+        fingerprint: Optional[str] = None
+    ) -> GenerationJob:
+        self._evict()
+        job = GenerationJob(message_id, fingerprint=fingerprint)
+        job._task = asyncio.create_task(job._run(stream), name=f"generation:{message_id}")
+        self._jobs[message_id] = job
+        if key is not None:
+            self._keys.set(key, message_id)
+        if fingerprint is not None:
+            self._running[fingerprint] = job
+            job._task.add_done_callback(lambda _: self._finished(job))
+        return job
+
+    def get(self, message_id: str) -> Optional[GenerationJob]:
+        self._evict()
+        return self._jobs.get(message_id)
+
+    def attach(self, key: Optional[str] = None, fingerprint: Optional[str] = None) -> Optional[GenerationJob]:
+        """
+        The job a duplicate request should read instead of starting a new one, if any.
+        Raises GenerationExpired when the key's reply is done and no longer buffered.
+        """
+        if key is not None:
+            message_id = self._keys.get(key)
+            if message_id is not None:
+                job = self.get(message_id)
+                if job is None:
+                    raise GenerationExpired(message_id)
+                return job
+        if fingerprint is not None:
+            return self._running.get(fingerprint)
+        return None
+
+    async def close(self) -> None:
+        tasks = [job._task for job in self._jobs.values() if job._task and not job._task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+        self._keys.clear()
+        self._running.clear()
+
+    def _finished(self, job: GenerationJob) -> None:
+        if self._running.get(job.fingerprint) is job:
+            del self._running[job.fingerprint]
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for message_id in [
+            mid for mid, job in self._jobs.items()
+            if job.done and now - job.finished_at >= self.ttl_sec
+        ]:
+            del self._jobs[message_id]
+
+        # Over capacity: drop the oldest finished jobs, running ones are never dropped
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            finished = [mid for mid, job in self._jobs.items() if job.done]
+            for message_id in finished[:excess]:
+                del self._jobs[message_id]
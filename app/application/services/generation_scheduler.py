@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class GenerationScheduler:
+    """
+    Shares one local LLM between user turns and speculative work (pre-generated replies).
+
+    User turns always win: speculative jobs only start once no turn has been running for
+    'idle_sec', run one at a time, and are cancelled the moment a turn starts. A preempted
+    job is queued again and re-run from scratch on the next idle window.
+    Jobs are keyed: submitting a key that is already queued replaces the older job.
+    """
+
+    def __init__(self, idle_sec: float = 2.0, max_pending: int = 32):
+        self.idle_sec = idle_sec
+        self.max_pending = max_pending
+        self._active = 0
+        self._last_busy = 0.0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._has_work = asyncio.Event()
+        self._pending: Dict[str, Callable[[], Awaitable[None]]] = {}
+        self._current: Optional[asyncio.Task] = None
+        self._preempted = False
+        self._worker: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def foreground(self) -> AsyncIterator[None]:
+        """
+        Wrap a user-facing generation. Preempts whatever speculative job is running.
+        """
+        self._active += 1
+        self._idle.clear()
+        if self._current is not None and not self._current.done():
+            self._preempted = True
+            self._current.cancel()
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._last_busy = time.monotonic()
+            if self._active == 0:
+                self._idle.set()
+
+    def submit(self, key: str, job: Callable[[], Awaitable[None]]) -> None:
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            # Oldest first: it is the least likely to still be wanted
+            dropped = next(iter(self._pending))
+            del self._pending[dropped]
+            logger.debug(f"Speculative queue full, dropped '{dropped}'")
+
+        self._pending.pop(key, None) # Re-insert at the end
+        self._pending[key] = job
+        self._has_work.set()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name="generation-scheduler")
+
+    async def close(self) -> None:
+        for task in (self._current, self._worker):
+            if task is not None and not task.done():
+                task.cancel()
+        await asyncio.gather(*(t for t in (self._current, self._worker) if t), return_exceptions=True)
+        self._pending.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_work.wait()
+            await self._idle.wait()
+
+            remaining = self.idle_sec - (time.monotonic() - self._last_busy)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue # A turn may have started meanwhile, re-check
+            if not self._pending:
+                self._has_work.clear()
+                continue
+
+            key = next(iter(self._pending))
+            job = self._pending.pop(key)
+            self._preempted = False
+            self._current = asyncio.create_task(job(), name=f"speculative:{key}")
+            # wait() instead of await: a cancelled job must not cancel the worker
+            await asyncio.wait({self._current})
+
+            if self._current.cancelled():
+                if self._preempted and key not in self._pending:
+                    self._pending[key] = job
+                    self._has_work.set()
+            elif self._current.exception() is not None:
+                logger.warning(f"Speculative job '{key}' failed: {self._current.exception()}")
+            self._current = None
@@ -0,0 +1,41 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+from app.core.cache import TTLCache
+from app.domain.entities.icon import IconPage
+
+@dataclass(kw_only=True)
+class CachedIconPage:
+    page: IconPage
+    etag: str
+
+class IconListingCache:
+    """
+    App-wide cache of icon listing pages, so repeated modal opens don't hit S3.
+    Upload and delete use cases call invalidate(), the TTL only covers changes made
+    outside the app (e.g. someone editing the bucket by hand).
+    """
+
+    def __init__(self, ttl_sec: float = 60.0, maxsize: int = 64):
+        self._cache: TTLCache[CachedIconPage] = TTLCache(maxsize=maxsize, ttl_sec=ttl_sec)
+
+    def get(self, limit: int, cursor: Optional[str]) -> Optional[CachedIconPage]:
+        return self._cache.get((limit, cursor))
+
+    def set(self, limit: int, cursor: Optional[str], page: IconPage) -> CachedIconPage:
+        entry = CachedIconPage(page=page, etag=self._etag(page))
+        self._cache.set((limit, cursor), entry)
+        return entry
+
+    def invalidate(self) -> None:
+        # Any change can shift every page boundary, so all pages go
+        self._cache.clear()
+
+    @staticmethod
+    def _etag(page: IconPage) -> str:
+        digest = hashlib.sha1()
+        for url in page.items:
+            digest.update(url.encode())
+            digest.update(b"\n")
+        digest.update((page.next_cursor or "").encode())
+        return f'"{digest.hexdigest()}"'
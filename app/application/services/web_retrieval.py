@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.core import deadline
+from app.core.telemetry import NOOP, Telemetry
+from app.domain.entities.chat import Message, MessageRole
+from app.domain.entities.search import SearchResult
+from app.domain.interfaces.llm import ILLMClient
+from app.domain.interfaces.tools.search import ISearchTool
+from app.domain.interfaces.tools.page_fetcher import IPageFetcher
+from app.domain.interfaces.services.embedder import IEmbedder
+
+logger = logging.getLogger(__name__)
+
+@dataclass(kw_only=True)
+class RetrievalResult:
+    queries: List[str] = field(default_factory=list)
+    results: List[SearchResult] = field(default_factory=list)
+    answered: bool = True # At least one query came back (maybe with no hits), False = every one failed or timed out
+
+class WebRetrievalService:
+    """
+    Search-mode retrieval stage.
+
+    1. One LLM call produces several query variants.
+    2. Variants hit the search tool concurrently.
+    3. Results are merged by URL and reranked with Reciprocal Rank Fusion.
+    4. Optionally, top pages are fetched, chunked and only the passages closest
+       to the query (by embedding similarity) go into the prompt.
+    Everything runs under one deadline: whatever finished in time is used, the rest is cancelled.
+    """
+
+    RRF_K = 60
+    REWRITE_SHARE = 0.5 # Of the deadline; searches always get the rest
+    MAX_CHUNKS_PER_PAGE = 24 # Bounds the embedding batch for huge pages
+
+    def __init__(
+        self,
+        search_tool: ISearchTool,
+        llm_client: ILLMClient,
+        model: str,
+        variants: int = 3,
+        top_k: int = 5,
+        deadline_sec: float = 6.0,
+        page_fetcher: Optional[IPageFetcher] = None,
+        embedder: Optional[IEmbedder] = None,
+        fetch_top_n: int = 3,
+        passages_top_k: int = 4,
+        passage_chars: int = 600,
+        telemetry: Telemetry = NOOP
+    ):
+        self.search_tool = search_tool
+        self.llm_client = llm_client
+        self.model = model
+        self.variants = variants
+        self.top_k = top_k
+        self.deadline_sec = deadline_sec
+        self.page_fetcher = page_fetcher
+        self.embedder = embedder
+        self.fetch_top_n = fetch_top_n
+        self.passages_top_k = passages_top_k
+        self.passage_chars = passage_chars
+        self.telemetry = telemetry
+
+    async def retrieve(
+        self,
+        message_text: str,
+        context: Optional[str] = None,
+        preferences: Optional[List[str]] = None,
+        deadline_sec: Optional[float] = None
+    ) -> RetrievalResult:
+        """
+        'deadline_sec' overrides the configured deadline for this call (e.g. under load).
+        """
+        tm = self.telemetry
+        # Capped by the request deadline, if the caller runs under one
+        deadline_sec = deadline.timeout(self.deadline_sec if deadline_sec is None else deadline_sec)
+        started = time.monotonic()
+        # The rewrite LLM call gets part of the budget: on timeout the raw message is searched with the rest
+        rewrite_sec = deadline_sec * self.REWRITE_SHARE
+        with tm.span("search.query_rewrite") as span, deadline.scope(rewrite_sec):
+            try:
+                async with asyncio.timeout(rewrite_sec):
+                    queries = await self._generate_queries(message_text, context, preferences)
+            except TimeoutError:
+                logger.warning(f"Query rewrite took over {rewrite_sec:.1f}s, searching the raw message")
+                queries = [message_text]
+            span.set("search.queries", len(queries))
+
+        remaining = max(0.0, deadline_sec - (time.monotonic() - started))
+        with tm.span("search.fan_out"):
+            per_query = await self._fan_out(queries, remaining)
+
+        results = self._merge(per_query)
+
+        remaining = deadline_sec - (time.monotonic() - started)
+        if self.page_fetcher and self.embedder and results and remaining > 0:
+            try:
+                with tm.span("search.passages"):
+                    await self._attach_passages(queries[0], results, remaining)
+            except Exception:
+                # Snippets are still there, page content is a bonus
+                logger.exception("Passage extraction failed")
+
+        return RetrievalResult(queries=queries, results=results, answered=bool(per_query))
+
+    async def _generate_queries(
+        self,
+        message_text: str,
+        context: Optional[str],
+        preferences: Optional[List[str]]
+    ) -> List[str]:
+        prompt = (
+            f"Act as a Search Engine Query Optimizer.\n"
+            f"User's raw message: '{message_text}'.\n"
+            f"Chat Context: {context or 'None'}.\n"
+            f"User Preferences: {', '.join(preferences) if preferences else 'None'}.\n\n"
+            f"Task: Write {self.variants} different concise, keyword-focused web search queries for the raw message.\n"
+            f"Rules:\n"
+            f"1. Remove conversational filler ('I wonder', 'maybe', 'hello').\n"
+            f"2. Focus on the core intent. The first query is the most direct one, others cover synonyms or sub-questions.\n"
+            f"3. Use the SAME language as the user's message.\n"
+            f"4. If the request is vague, use User Preferences to make it specific (e.g. 'popular music' -> 'popular phonk music' if user likes phonk).\n"
+            f"Output: ONLY the queries, one per line, no numbering."
+        )
+        query_msgs = [Message(role=MessageRole.USER, content=prompt)]
+
+        raw = ""
+        try:
+            async for chunk in self.llm_client.stream_chat(
+                messages=query_msgs,
+                system_instruction="You are a helpful query generator.",
+                model=self.model
+            ):
+                raw += chunk
+        except Exception as e:
+            logger.warning(f"Query rewrite failed, searching the raw message: {e}")
+
+        queries = []
+        for line in raw.splitlines():
+            query = line.strip().lstrip("-*0123456789. ").strip().strip('"').strip("'")
+            if query and query.lower() not in (q.lower() for q in queries):
+                queries.append(query)
+
+        # LLM failed or returned garbage: the raw message is still a valid query
+        return queries[:self.variants] or [message_text]
+
+    async def _fan_out(self, queries: List[str], timeout: float) -> List[List[SearchResult]]:
+        tasks = [asyncio.create_task(self.search_tool.search_results(q)) for q in queries]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Search deadline hit: {len(pending)}/{len(tasks)} queries dropped")
+
+        # Keep query order, so the most direct query wins ties
+        results = []
+        for task in tasks:
+            if task not in done:
+                continue
+            if task.exception():
+                logger.error(f"Search query failed: {task.exception()}")
+                continue
+            results.append(task.result())
+        return results
+
+    def _merge(self, per_query: List[List[SearchResult]]) -> List[SearchResult]:
+        merged: Dict[str, SearchResult] = {}
+
+        for results in per_query:
+            for rank, res in enumerate(results):
+                key = self._normalize_url(res.url)
+                rrf = 1.0 / (self.RRF_K + rank + 1)
+                if key in merged:
+                    item = merged[key]
+                    item.score += rrf
+                    item.queries.extend(q for q in res.queries if q not in item.queries)
+                    # Different engines give different snippets, keep the richest one
+                    if len(res.content) > len(item.content):
+                        item.content = res.content
+                else:
+                    merged[key] = SearchResult(
+                        title=res.title,
+                        url=res.url,
+                        content=res.content,
+                        score=rrf,
+                        queries=list(res.queries)
+                    )
+
+        ranked = sorted(merged.values(), key=lambda r: r.score, reverse=True)
+        return ranked[:self.top_k]
+
+    async def _attach_passages(self, query: str, results: List[SearchResult], timeout: float) -> None:
+        targets = results[:self.fetch_top_n]
+        tasks = [asyncio.create_task(self.page_fetcher.fetch_text(r.url)) for r in targets]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        chunks: List[str] = []
+        owners: List[SearchResult] = []
+        for result, task in zip(targets, tasks):
+            if task not in done or task.exception() or not task.result():
+                continue
+            for chunk in self._chunk(task.result())[:self.MAX_CHUNKS_PER_PAGE]:
+                chunks.append(chunk)
+                owners.append(result)
+
+        if not chunks:
+            return
+
+        # Query and all chunks in a single embedding request
+        vectors = await self.embedder.get_vectors([query] + chunks)
+        query_vec, chunk_vecs = vectors[0], vectors[1:]
+
+        scored = sorted(
+            zip((self._cosine(query_vec, v) for v in chunk_vecs), range(len(chunks))),
+            reverse=True
+        )
+        for _, idx in scored[:self.passages_top_k]:
+            owners[idx].passages.append(chunks[idx])
+
+    def _chunk(self, text: str) -> List[str]:
+        """
+        Packs paragraphs into chunks of ~passage_chars, splitting long paragraphs by sentences.
+        """
+        pieces: List[str] = []
+        for paragraph in text.split("\n"):
+            if len(paragraph) <= self.passage_chars:
+                pieces.append(paragraph)
+            else:
+                pieces.extend(re.split(r"(?<=[.!?])\s+", paragraph))
+
+        chunks: List[str] = []
+        current = ""
+        for piece in pieces:
+            piece = piece[:self.passage_chars]
+            if current and len(current) + len(piece) + 1 > self.passage_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}".strip()
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    def _normalize_url(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        host = parts.netloc.lower().removeprefix("www.")
+        path = parts.path.rstrip("/")
+        return urlunsplit(("", host, path, parts.query, ""))
+
+    @staticmethod
+    def format_results(results: List[SearchResult]) -> str:
+        if not results:
+            return "No results found."
+        lines = []
+        for idx, res in enumerate(results, 1):
+            if res.passages:
+                body = "\n   ".join(f'"{p}"' for p in res.passages)
+                lines.append(f"{idx}. {res.title} ({res.url}):\n   {body}")
+            else:
+                lines.append(f"{idx}. {res.title}: {res.content} ({res.url})")
+        return "\n".join(lines)
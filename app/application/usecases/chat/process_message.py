@@ -1,23 +1,44 @@
+import asyncio
+import hashlib
 import logging
-from typing import AsyncGenerator
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncGenerator, List, Optional
 from datetime import datetime
 
-from app.domain.entities.chat import Message, MessageRole
+from app.domain.entities.chat import Message, MessageRole, TurnContext
 from app.domain.entities.user import UserProfile
 from app.domain.entities.persona import WaifuPersona
+from app.domain.exceptions import DependencyUnavailable
 
 from app.domain.interfaces.llm import ILLMClient
 from app.domain.interfaces.repositories.memory import IMemoryRepository
 from app.domain.interfaces.repositories.chat import IChatRepository
 from app.domain.interfaces.repositories.user import IUserProfileRepository
 from app.domain.interfaces.repositories.persona import IPersonaRepository
-from app.domain.interfaces.tools.search import ISearchTool
-
 from app.application.commands.registry import CommandRegistry
+from app.application.services.web_retrieval import WebRetrievalService
+from app.application.services.generation_scheduler import GenerationScheduler
+from app.application.services.degradation import LEVELS, LLM, MEMORY, SEARCH, DegradationPlan, DegradationPolicy
+from app.core import deadline
 from app.core.config import settings
+from app.core.telemetry import NOOP, Telemetry
 
 logger = logging.getLogger(__name__)
 
+@dataclass(kw_only=True, slots=True)
+class TurnBudgets:
+    """
+    Time budgets of one turn, in seconds. 'turn' covers everything up to the first reply token;
+    stage budgets are slices of it (scaled down under load) and never extend it.
+    Web search uses the retrieval service's own deadline, capped the same way.
+    """
+    turn: float = 45.0
+    context: float = 5.0 # Required: profile, persona, history, saving the user message
+    memory: float = 3.0 # Optional: the reply goes on without memories
+    llm_stall: float = 30.0 # Longest gap between two streamed tokens
+
 class ProcessMessageUseCase:
     
     def __init__(
@@ -28,7 +49,12 @@ class ProcessMessageUseCase:
         user_repo: IUserProfileRepository,
         persona_repo: IPersonaRepository,
         llm_client: ILLMClient,
-        search_tool: ISearchTool = None # Optional for now to avoid breaking tests/DI immediately
+        retrieval: WebRetrievalService = None, # Optional: without it search mode is a no-op
+        telemetry: Telemetry = NOOP,
+        scheduler: Optional[GenerationScheduler] = None, # Optional: user turns preempt speculative work
+        alternatives: int = 0, # Replies pre-generated per turn while idle, for instant regenerate
+        policy: Optional[DegradationPolicy] = None, # Optional: load-aware trimming of each turn
+        budgets: Optional[TurnBudgets] = None
     ):
         self.registry = registry
         self.memory_repo = memory_repo
@@ -36,115 +62,321 @@ class ProcessMessageUseCase:
         self.user_repo = user_repo
         self.persona_repo = persona_repo
         self.llm_client = llm_client
-        self.search_tool = search_tool
+        self.retrieval = retrieval
+        self.telemetry = telemetry
+        self.scheduler = scheduler
+        self.alternatives = alternatives if scheduler else 0
+        self.policy = policy
+        self.budgets = budgets or TurnBudgets()
 
     async def execute(
         self, 
         message_text: str, 
         session_id: str,
         use_search: bool = False,
-        save_user_input: bool = True
+        save_user_input: bool = True,
+        snapshot: Optional[TurnContext] = None,
+        memory_ids: Optional[List[str]] = None,
+        reply_id: Optional[str] = None
     ) -> AsyncGenerator[str, None]:
-        
-        cmd_res = await self.registry.process_input(message_text, session_id)
-        if cmd_res:
-            yield cmd_res
-            return
+        """
+        'snapshot' and 'memory_ids' replay a previous turn (regenerate): memories are
+        loaded by id and search results reused, so only the LLM call is repeated.
+        'reply_id' is the uid the reply is saved under, known to the client before it exists.
+        """
+        tm = self.telemetry
+        replay = snapshot is not None
+        turn_started = time.perf_counter()
+        # Every adapter call below runs under this deadline (and its stage budget), see app/core/deadline.py
+        turn_deadline = time.monotonic() + self.budgets.turn
 
-        if save_user_input:
-            await self._save_user_message(session_id, message_text)
+        def required(awaitable, stage: str):
+            return deadline.within(awaitable, seconds=self.budgets.context, until=turn_deadline, stage=stage)
 
-        import asyncio
-        
-        user_task = self.user_repo.get_profile()
-        persona_task = self.persona_repo.load()
-        memory_task = self.memory_repo.search_relevant(message_text, limit=3)
-        history_task = self.history_repo.get_last_messages(session_id, limit=10)
-        
-        user_profile, waifu_persona, relevant_memories, chat_history = await asyncio.gather(
-            user_task, 
-            persona_task, 
-            memory_task, 
-            history_task
-        )
-        
-        user_profile = user_profile or self._default_user()
+        async with self._foreground():
+            with self._turn(), tm.span("chat.turn", session_id=session_id, use_search=use_search) as turn_span:
+                with tm.span("command_parse"):
+                    cmd_res = await deadline.within(
+                        self.registry.process_input(message_text, session_id), until=turn_deadline, stage="command_parse"
+                    )
+                if cmd_res:
+                    yield cmd_res
+                    return
 
-        system_prompt = await self._build_prompt(
-            user=user_profile,
-            waifu=waifu_persona,
-            memories=relevant_memories
-        )
+                plan = self.policy.plan() if self.policy else LEVELS[0]
+                if plan.degraded:
+                    turn_span.set("degradation.level", plan.level)
+                    yield self._degradation_note(plan, use_search)
 
-        if not chat_history:
-            chat_history = [Message(role=MessageRole.USER, content=message_text)]
+                if save_user_input:
+                    with tm.span("persist.user_message"):
+                        await required(self._save_user_message(session_id, message_text), "persist.user_message")
 
-        # --- MANUAL SEARCH LOGIC ---
-        if use_search and self.search_tool:
-            # 1. Inform user we are searching
-            yield "\n*(Searching the web...)*\n\n"
+                # Each call is timed on its own, the parent span shows the gather as a whole
+                with tm.span("context"):
+                    user_profile, waifu_persona, relevant_memories, chat_history = await asyncio.gather(
+                        tm.timed("context.user_profile", required(self.user_repo.get_profile(), "context.user_profile")),
+                        tm.timed("context.persona", required(self.persona_repo.load(), "context.persona")),
+                        tm.timed(
+                            "context.memories",
+                            self._recall(message_text, memory_ids if replay else None, plan, until=turn_deadline)
+                        ),
+                        tm.timed("context.history", required(
+                            self.history_repo.get_last_messages(session_id, limit=plan.history_limit), "context.history"
+                        ))
+                    )
             
-            # 2. Generate optimized query
-            # We use a simple non-streaming call to LLM to get the query
-            search_prompt = (
-                f"Act as a Search Engine Query Optimizer.\n"
-                f"User's raw message: '{message_text}'.\n"
-                f"Chat Context: {chat_history[-2].content if len(chat_history) > 1 else 'None'}.\n"
-                f"User Preferences: {', '.join(user_profile.preferences) if user_profile.preferences else 'None'}.\n\n"
-                f"Task: Transform the raw message into a concise, keyword-focused web search query.\n"
-                f"Rules:\n"
-                f"1. Remove conversational filler ('I wonder', 'maybe', 'hello').\n"
-                f"2. Focus on the core intent.\n"
-                f"3. Use the SAME language as the user's message.\n"
-                f"4. If the request is vague, use User Preferences to make it specific (e.g. 'popular music' -> 'popular phonk music' if user likes phonk).\n"
-                f"Output: ONLY the final query string."
+                user_profile = user_profile or self._default_user()
+
+                with tm.span("prompt_build") as span:
+                    prefix = self._prompt_prefix(user=user_profile, waifu=waifu_persona)
+                    prompt_hash = hashlib.sha1(prefix.encode()).hexdigest()[:16]
+                    system_prompt = prefix + self._prompt_context(memories=relevant_memories)
+                    if replay and snapshot.prompt_hash and snapshot.prompt_hash != prompt_hash:
+                        # Persona or profile edited since the original reply: the new one uses the current version
+                        span.set("prompt.changed_since_snapshot", True)
+
+                context = TurnContext(prompt_hash=prompt_hash)
+                # The user message this turn answers (None only if history could not be read back)
+                reply_to = chat_history[-1].uid if chat_history and chat_history[-1].role == MessageRole.USER else None
+
+                if not chat_history:
+                    chat_history = [Message(role=MessageRole.USER, content=message_text)]
+
+                # --- SEARCH LOGIC ---
+                if use_search and replay and snapshot.search_results is not None:
+                    # Same results as the original reply, no query rewrite and no web round-trip
+                    context.search_queries = snapshot.search_queries
+                    context.search_results = snapshot.search_results
+                    yield f"*(Query: {' | '.join(context.search_queries)})*\n\n"
+
+                elif use_search and plan.use_search and self.retrieval:
+                    # 1. Inform user we are searching
+                    yield "\n*(Searching the web...)*\n\n"
+                
+                    # 2. Query variants -> parallel search -> merge & rerank (bounded by a deadline)
+                    with tm.span("search"):
+                        retrieval = await self._search(message_text, chat_history, user_profile, plan, until=turn_deadline)
+                    if retrieval is not None:
+                        yield f"*(Query: {' | '.join(retrieval.queries)})*\n\n"
+                        context.search_queries = retrieval.queries
+                        context.search_results = retrieval.results
+
+                if context.search_results is not None:
+                    # 3. Inject results as System Message
+                    chat_history.append(self._results_message(context))
+
+                # --- FINAL RESPONSE GENERATION ---
+                full_response = ""
+                chunks = 0
+                first_token_at = None
+                with tm.span("llm.stream", model=settings.DEFAULT_MODEL) as span:
+                    llm_started = time.perf_counter()
+                    try:
+                        # First token by the turn deadline, then no silence longer than the stall budget
+                        async for chunk in deadline.guard_stream(
+                            self.llm_client.stream_chat(
+                                messages=chat_history,
+                                system_instruction=system_prompt,
+                                model=settings.DEFAULT_MODEL,
+                                max_tokens=plan.max_tokens
+                            ),
+                            first_item_until=turn_deadline,
+                            stall_sec=self.budgets.llm_stall,
+                            stage="llm"
+                        ):
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                                tm.observe_ttft(first_token_at - turn_started)
+                                if self.policy:
+                                    self.policy.observe(LLM, first_token_at - llm_started)
+                                span.set("llm.first_token_sec", first_token_at - llm_started)
+                            chunks += 1
+                            full_response += chunk
+                            yield chunk
+                    except deadline.DeadlineExceeded as e:
+                        # What was streamed so far is kept and saved; the user sees why it stopped
+                        logger.warning(f"Reply cut short: {e}")
+                        if first_token_at is None and self.policy:
+                            self.policy.observe(LLM, time.perf_counter() - llm_started) # At least this slow
+                        yield "\n\n*(Reply timed out)*"
+                    except DependencyUnavailable as e:
+                        # Down or circuit open: said once, not streamed into the reply as text
+                        logger.warning(f"Reply failed: {e}")
+                        yield "\n\n*(Model unavailable, try again shortly)*"
+
+                    # Streamed deltas are ~1 token each, close enough for a speed gauge
+                    if first_token_at is not None and chunks > 1:
+                        rate = (chunks - 1) / max(time.perf_counter() - first_token_at, 1e-6)
+                        tm.observe_tokens_per_second(rate)
+                        span.set("llm.tokens", chunks)
+                        span.set("llm.tokens_per_sec", rate)
+
+                if full_response:
+                    with tm.span("persist.reply"):
+                        await self._save_ai_message(
+                            session_id,
+                            full_response,
+                            memory_ids=[m.vector_id for m in relevant_memories if m.vector_id],
+                            context=context,
+                            reply_id=reply_id
+                        )
+                    if reply_to:
+                        self.schedule_alternatives(session_id, reply_to, with_search=context.search_results is not None)
+
+    def schedule_alternatives(self, session_id: str, reply_to: str, with_search: bool) -> None:
+        """
+        Queue background generation of alternative replies to user message 'reply_to',
+        stored as sibling branches for regenerate to swap in. No-op unless enabled.
+        """
+        if self.alternatives > 0:
+            self.scheduler.submit(
+                f"alternatives:{session_id}",
+                lambda: self._fill_alternatives(session_id, reply_to, with_search)
             )
-            # Temporary messages for query generation
-            query_msgs = [Message(role=MessageRole.USER, content=search_prompt)]
-            
-            # We need a non-streaming method on llm_client or just consume the stream
-            search_query = ""
-            async for chunk in self.llm_client.stream_chat(messages=query_msgs, system_instruction="You are a helpful query generator.", model=settings.DEFAULT_MODEL):
-                search_query += chunk
-            
-            search_query = search_query.strip().strip('"').strip("'")
-            yield f"*(Query: {search_query})*\n\n"
 
-            # 3. Execute Search
-            search_results = await self.search_tool.search(search_query)
+    async def _fill_alternatives(self, session_id: str, reply_to: str, with_search: bool) -> None:
+        while await self.history_repo.count_reply_alternatives(reply_to, with_search) < self.alternatives:
+            # Same window the visible reply was generated with, plus the reply itself
+            plan = self.policy.plan() if self.policy else LEVELS[0]
+            history = await self.history_repo.get_last_messages(session_id, limit=plan.history_limit + 1)
+            # The user moved on (new message, reply swapped away): nothing to pre-generate for
+            if len(history) < 2 or history[-2].uid != reply_to or history[-1].role != MessageRole.ASSISTANT:
+                return
+            reply = history[-1]
+            snapshot = await self.history_repo.get_turn_context(reply.uid)
+            if snapshot is None or (snapshot.search_results is not None) != with_search:
+                return
+
+            with self.telemetry.span("chat.pregenerate", session_id=session_id):
+                # Same inputs as the visible reply, the sampling temperature makes it differ
+                user_profile, waifu_persona, memories = await asyncio.gather(
+                    self.user_repo.get_profile(),
+                    self.persona_repo.load(),
+                    self.memory_repo.get_fragments(reply.referenced_memory_ids)
+                )
+                prefix = self._prompt_prefix(user=user_profile or self._default_user(), waifu=waifu_persona)
+                chat_history = history[:-1]
+                if snapshot.search_results is not None:
+                    chat_history.append(self._results_message(snapshot))
+
+                text = ""
+                async for chunk in self.llm_client.stream_chat(
+                    messages=chat_history,
+                    system_instruction=prefix + self._prompt_context(memories=memories),
+                    model=settings.DEFAULT_MODEL
+                ):
+                    text += chunk
+                if not text:
+                    return
+
+                await self.history_repo.add_reply_alternative(
+                    session_id,
+                    reply_to,
+                    Message(
+                        role=MessageRole.ASSISTANT,
+                        content=text,
+                        referenced_memory_ids=reply.referenced_memory_ids,
+                        created_at=datetime.utcnow()
+                    ),
+                    TurnContext(
+                        search_queries=snapshot.search_queries,
+                        search_results=snapshot.search_results,
+                        prompt_hash=hashlib.sha1(prefix.encode()).hexdigest()[:16]
+                    )
+                )
+
+    def _foreground(self):
+        return self.scheduler.foreground() if self.scheduler else nullcontext()
+
+    def _turn(self):
+        return self.policy.turn() if self.policy else nullcontext()
 
-            # 4. Inject results as System Message
-            results_msg = Message(
-                role=MessageRole.SYSTEM, 
-                content=f"WEB SEARCH RESULTS for '{search_query}':\n{search_results}\n\n"
-                        f"INSTRUCTION: Use the above results to answer the user's last message."
+    def _observe(self, stage: str, started: float, ok: bool) -> None:
+        if self.policy:
+            self.policy.observe(stage, time.perf_counter() - started, ok)
+
+    def _degradation_note(self, plan: DegradationPlan, use_search: bool) -> str:
+        cuts = []
+        if plan.memory_limit == 0:
+            cuts.append("no memories")
+        if use_search and not plan.use_search:
+            cuts.append("no web search")
+        if plan.max_tokens:
+            cuts.append("shorter answer")
+        return f"*(Busy backend, reduced mode {plan.level}: {', '.join(cuts) or 'less context'})*\n\n"
+
+    async def _search(
+        self,
+        message_text: str,
+        chat_history: List[Message],
+        user_profile: UserProfile,
+        plan: DegradationPlan,
+        until: Optional[float] = None
+    ):
+        started = time.perf_counter()
+        try:
+            retrieval = await deadline.within(
+                self.retrieval.retrieve(
+                    message_text,
+                    context=chat_history[-2].content if len(chat_history) > 1 else None,
+                    preferences=user_profile.preferences,
+                    deadline_sec=self.retrieval.deadline_sec * plan.timeout_scale
+                ),
+                until=until,
+                stage="search"
             )
-            chat_history.append(results_msg)
-
-        # --- FINAL RESPONSE GENERATION ---
-        full_response = ""
-        async for chunk in self.llm_client.stream_chat(
-            messages=chat_history,
-            system_instruction=system_prompt,
-            model=settings.DEFAULT_MODEL
-        ):
-            full_response += chunk
-            yield chunk
-
-        if full_response:
-            await self._save_ai_message(session_id, full_response)
-
-    async def _build_prompt(
-        self, 
-        user: UserProfile, 
-        waifu: WaifuPersona, 
-        memories: list
-    ) -> str:
-        
-        rag_content = "\n".join([f"- {m.content}" for m in memories]) if memories else "No relevant memories."
+        except Exception as e:
+            # Search is optional: answer without it rather than fail the turn
+            logger.warning(f"Web retrieval skipped: {type(e).__name__}: {e}")
+            self._observe(SEARCH, started, ok=False)
+            return None
+        # No hits is a valid answer, only errors and timeouts count against search health
+        self._observe(SEARCH, started, ok=retrieval.answered)
+        return retrieval
+
+    def _results_message(self, context: TurnContext) -> Message:
+        search_results = WebRetrievalService.format_results(context.search_results)
+        return Message(
+            role=MessageRole.SYSTEM, 
+            content=f"WEB SEARCH RESULTS for '{context.search_queries[0]}':\n{search_results}\n\n"
+                    f"INSTRUCTION: Use the above results to answer the user's last message."
+        )
+
+    async def _recall(
+        self,
+        message_text: str,
+        memory_ids: Optional[List[str]],
+        plan: DegradationPlan = LEVELS[0],
+        until: Optional[float] = None
+    ) -> list:
+        if memory_ids is None and plan.memory_limit == 0:
+            return []
+        if memory_ids is not None:
+            # Replay: the exact memories of the original turn, by id (no embedding, no vector search)
+            call = self.memory_repo.get_fragments(memory_ids)
+        else:
+            call = self.memory_repo.search_relevant(message_text, limit=plan.memory_limit)
+
+        started = time.perf_counter()
+        try:
+            memories = await deadline.within(
+                call, seconds=self.budgets.memory * plan.timeout_scale, until=until, stage="memories"
+            )
+        except Exception as e:
+            # Memories are optional: a slow or failing Qdrant/embedder must not hold the reply
+            logger.warning(f"Memory recall skipped: {type(e).__name__}: {e}")
+            self._observe(MEMORY, started, ok=False)
+            return []
+        self._observe(MEMORY, started, ok=True)
+        return memories
+
+    def _prompt_prefix(self, user: UserProfile, waifu: WaifuPersona) -> str:
+        """
+        Persona and user profile: the part of the system prompt that only changes on settings edits.
+        """
         traits_list = [f"{k}: {v:.2f}" for k, v in waifu.traits.items()]
         traits_str = ", ".join(traits_list)
-        current_dt = datetime.now().strftime('%Y-%m-%d %H:%M (%A)')
         
         lang = waifu.language if waifu.language else 'English'
 
@@ -159,6 +391,12 @@ class ProcessMessageUseCase:
             f"Name: {user.username}\n"
             f"Bio: {user.bio}\n"
             f"Preferences: {', '.join(user.preferences)}\n\n"
+        )
+
+    def _prompt_context(self, memories: list) -> str:
+        rag_content = "\n".join([f"- {m.content}" for m in memories]) if memories else "No relevant memories."
+        current_dt = datetime.now().strftime('%Y-%m-%d %H:%M (%A)')
+        return (
             f"Context / Memories:\n{rag_content}\n\n"
             f"Current Date/Time: {current_dt}\n"
             f"Reply to the user naturally based on the history."
@@ -168,9 +406,23 @@ class ProcessMessageUseCase:
         msg = Message(role=MessageRole.USER, content=text, created_at=datetime.utcnow())
         await self.history_repo.add_message(session_id, msg)
 
-    async def _save_ai_message(self, session_id: str, text: str):
-        msg = Message(role=MessageRole.ASSISTANT, content=text, created_at=datetime.utcnow())
-        await self.history_repo.add_message(session_id, msg)
+    async def _save_ai_message(
+        self,
+        session_id: str,
+        text: str,
+        memory_ids: List[str],
+        context: TurnContext,
+        reply_id: Optional[str] = None
+    ):
+        msg = Message(
+            role=MessageRole.ASSISTANT,
+            content=text,
+            referenced_memory_ids=memory_ids,
+            created_at=datetime.utcnow()
+        )
+        if reply_id:
+            msg.uid = reply_id
+        await self.history_repo.add_message(session_id, msg, context=context)
 
     def _default_user(self) -> UserProfile:
         return UserProfile(username="User", bio="")
@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from app.domain.entities.chat import MessageRole
 from app.domain.interfaces.repositories.chat import IChatRepository
 from app.application.usecases.chat.process_message import ProcessMessageUseCase
@@ -6,11 +6,14 @@ from app.application.usecases.chat.process_message import ProcessMessageUseCase
 class RegenerateMessageUseCase:
     """
     Orchestrates the regeneration of the last AI response.
-    1. Removes the last AI message.
+    0. With pre-generation on, swaps in a ready alternative reply instead (no LLM call at all).
+    1. Removes the last AI message (its context snapshot is read first).
     2. Retrieves the previous User message.
-    3. Re-runs ProcessMessageUseCase logic (without saving the user message again).
+    3. Re-runs ProcessMessageUseCase logic (without saving the user message again),
+       replaying the snapshot: same memories and search results, only the LLM call is repeated.
+       Replies saved before snapshots existed go through the full pipeline.
     """
-    
+
     def __init__(
         self,
         chat_repo: IChatRepository,
@@ -18,34 +21,53 @@ class RegenerateMessageUseCase:
     ):
         self.chat_repo = chat_repo
         self.process_message_uc = process_message_use_case
-        
-    async def execute(self, session_id: str, use_search: bool = False) -> AsyncGenerator[str, None]:
-        # 1. Get last message to see if we can regenerate
-        last_msgs = await self.chat_repo.get_last_messages(session_id, limit=1)
-        
+
+    async def execute(
+        self,
+        session_id: str,
+        use_search: bool = False,
+        reply_id: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        # 1. Last exchange in one read: [user, assistant] or [.., user]
+        last_msgs = await self.chat_repo.get_last_messages(session_id, limit=2)
+
         if not last_msgs:
             yield "Wait... I don't remember anything to regenerate."
             return
 
         last_msg = last_msgs[-1]
-        
+
         # 2. Logic:
         # If last is AI => Delete AI msg -> Get User Msg -> Run Process(save=False)
         # If last is User => Run Process(save=False) (User clicked regenerate on their own pending msg? or failed previous attempt?)
         # Let's support "Delete AI" scenario primarily.
-        
+
         user_prompt = ""
-        
+        snapshot = None
+        memory_ids = None
+
         if last_msg.role == MessageRole.ASSISTANT:
-            # Delete it
-            await self.chat_repo.delete_last_message(session_id)
-            # Fetch previous user message
-            last_msgs = await self.chat_repo.get_last_messages(session_id, limit=1)
-            if not last_msgs or last_msgs[-1].role != MessageRole.USER:
+            if len(last_msgs) < 2 or last_msgs[-2].role != MessageRole.USER:
                 yield "I can't find your original message to retry."
                 return
-            user_prompt = last_msgs[-1].content
-            
+            user_msg = last_msgs[-2]
+            # Instant path: a pre-generated sibling reply takes the place of the current one
+            if self.process_message_uc.alternatives > 0:
+                promoted = await self.chat_repo.promote_reply_alternative(
+                    session_id, reply_to=user_msg.uid, current=last_msg, with_search=use_search, reply_id=reply_id
+                )
+                if promoted is not None:
+                    yield promoted.content
+                    self.process_message_uc.schedule_alternatives(session_id, user_msg.uid, with_search=use_search)
+                    return
+
+            snapshot = await self.chat_repo.get_turn_context(last_msg.uid)
+            if snapshot is not None:
+                memory_ids = last_msg.referenced_memory_ids
+            # Delete it
+            await self.chat_repo.delete_last_message(session_id)
+            user_prompt = user_msg.content
+
         elif last_msg.role == MessageRole.USER:
             # Just re-run for this user message
             # But we don't delete it.
@@ -58,9 +80,12 @@ class RegenerateMessageUseCase:
         # 3. Call ProcessMessage logic
         # We set save_user_input=False because the user message is already in DB.
         async for chunk in self.process_message_uc.execute(
-            message_text=user_prompt, 
-            session_id=session_id, 
-            use_search=use_search, 
-            save_user_input=False
+            message_text=user_prompt,
+            session_id=session_id,
+            use_search=use_search,
+            save_user_input=False,
+            snapshot=snapshot,
+            memory_ids=memory_ids,
+            reply_id=reply_id
         ):
             yield chunk
@@ -0,0 +1,54 @@
+from typing import List, Optional
+from app.core.config import Settings
+from app.domain.entities.chat import MessageRole, MessageSearchHit
+from app.domain.exceptions import ChatSearchDisabled
+from app.domain.interfaces.repositories.chat import IChatRepository
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
+
+class SearchChatUseCase:
+    """
+    Semantic search over chat history.
+    Vector index finds candidates, Mongo hydrates them and applies exact filters.
+    """
+
+    # Filters run after the vector search, so fetch more candidates to still fill the page
+    OVERFETCH_FACTOR = 4
+
+    def __init__(
+        self,
+        index: IMessageVectorIndex,
+        chat_repo: IChatRepository,
+        settings: Settings
+    ):
+        self.index = index
+        self.chat_repo = chat_repo
+        self.settings = settings
+
+    async def execute(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+        contains: Optional[str] = None,
+        role: Optional[MessageRole] = None
+    ) -> List[MessageSearchHit]:
+        if not self.settings.CHAT_SEARCH_ENABLED:
+            raise ChatSearchDisabled("Chat search is disabled (CHAT_SEARCH_ENABLED=false)")
+
+        has_filters = bool(contains or role)
+        candidates = await self.index.search(
+            query,
+            limit=limit * self.OVERFETCH_FACTOR if has_filters else limit,
+            session_id=session_id
+        )
+        if not candidates:
+            return []
+
+        scores = dict(candidates)
+        # Messages deleted after indexing (regenerate, deleted sessions) simply don't come back
+        hits = await self.chat_repo.get_messages_by_ids(list(scores), contains=contains, role=role)
+
+        for hit in hits:
+            hit.score = scores[hit.message.uid]
+        hits.sort(key=lambda h: h.score, reverse=True)
+        return hits[:limit]
@@ -0,0 +1,19 @@
+from typing import Optional
+from app.domain.entities.chat import MessageSearchPage
+from app.domain.interfaces.repositories.chat import IChatRepository
+
+class SearchMessagesTextUseCase:
+    """
+    Exact keyword search over message content (Mongo text index).
+    """
+    def __init__(self, chat_repo: IChatRepository):
+        self.chat_repo = chat_repo
+
+    async def execute(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> MessageSearchPage:
+        return await self.chat_repo.search_messages(query, session_id=session_id, cursor=cursor, limit=limit)
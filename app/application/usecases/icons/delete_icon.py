@@ -1,8 +1,26 @@
+import asyncio
+from typing import List, Optional
+from app.application.services.icon_cache import IconListingCache
+from app.domain.entities.icon import thumbnail_key
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
 
 class DeleteIconUseCase:
-    def __init__(self, repository: IWaifuIconRepository):
+    def __init__(
+        self,
+        repository: IWaifuIconRepository,
+        cache: IconListingCache,
+        thumbnail_sizes: Optional[List[int]] = None
+    ):
         self.repository = repository
+        self.cache = cache
+        self.thumbnail_sizes = thumbnail_sizes or [64, 128]
 
     async def execute(self, filename: str) -> None:
-        await self.repository.delete_icon(filename)
+        try:
+            # S3 delete is idempotent, missing variants are fine
+            await asyncio.gather(
+                self.repository.delete_icon(filename),
+                *(self.repository.delete_icon(thumbnail_key(filename, size)) for size in self.thumbnail_sizes)
+            )
+        finally:
+            self.cache.invalidate()
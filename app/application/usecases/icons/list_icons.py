@@ -1,9 +1,16 @@
-from typing import List
+from typing import Optional
+from app.application.services.icon_cache import CachedIconPage, IconListingCache
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
 
 class ListIconsUseCase:
-    def __init__(self, repository: IWaifuIconRepository):
+    def __init__(self, repository: IWaifuIconRepository, cache: IconListingCache):
         self.repository = repository
+        self.cache = cache
 
-    async def execute(self) -> List[str]:
-        return await self.repository.list_icons()
+    async def execute(self, limit: int = 100, cursor: Optional[str] = None) -> CachedIconPage:
+        cached = self.cache.get(limit, cursor)
+        if cached is not None:
+            return cached
+
+        page = await self.repository.list_icons_page(limit=limit, cursor=cursor)
+        return self.cache.set(limit, cursor, page)
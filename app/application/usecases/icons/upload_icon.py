@@ -1,5 +1,16 @@
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+from app.application.services.icon_cache import IconListingCache
+from app.domain.entities.icon import content_addressed_name, thumbnail_key
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
+from app.domain.interfaces.services.image import IImageProcessor
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_TYPES = ["image/png", "image/jpeg", "image/jpg", "image/webp"]
 
 @dataclass
 class UploadIconDTO:
@@ -7,18 +18,85 @@ class UploadIconDTO:
     content: bytes
     content_type: str
 
+@dataclass
+class UploadIconStreamDTO:
+    filename: str
+    chunks: AsyncIterator[bytes]
+    content_type: str
+    content_length: Optional[int] = None # From headers, lets us reject early
+
+@dataclass
+class UploadIconResult:
+    url: str
+    filename: str = ""
+    thumbnails: Dict[int, str] = field(default_factory=dict)
+
 class UploadIconUseCase:
-    def __init__(self, repository: IWaifuIconRepository):
+    def __init__(
+        self,
+        repository: IWaifuIconRepository,
+        image_processor: IImageProcessor,
+        cache: IconListingCache,
+        max_bytes: int = 5 * 1024 * 1024,
+        thumbnail_sizes: Optional[List[int]] = None
+    ):
         self.repository = repository
+        self.image_processor = image_processor
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.thumbnail_sizes = thumbnail_sizes or [64, 128]
 
     async def execute(self, dto: UploadIconDTO) -> str:
+        async def single_chunk():
+            yield dto.content
+
+        result = await self.execute_stream(
+            UploadIconStreamDTO(
+                filename=dto.filename,
+                chunks=single_chunk(),
+                content_type=dto.content_type,
+                content_length=len(dto.content)
+            )
+        )
+        return result.url
+
+    async def execute_stream(self, dto: UploadIconStreamDTO) -> UploadIconResult:
         # Business Logic Validation
-        ALLOWED_TYPES = ["image/png", "image/jpeg", "image/jpg"]
         if dto.content_type not in ALLOWED_TYPES:
-            raise ValueError("Invalid file type. Only PNG and JPEG are allowed.")
-        
-        MAX_SIZE = 5 * 1024 * 1024 # 5MB
-        if len(dto.content) > MAX_SIZE:
-            raise ValueError("File size exceeds 5MB limit.")
-            
-        return await self.repository.upload_icon(dto.filename, dto.content, dto.content_type)
+            raise ValueError("Invalid file type. Only PNG, JPEG and WebP are allowed.")
+
+        limit_mb = self.max_bytes // (1024 * 1024)
+        if dto.content_length is not None and dto.content_length > self.max_bytes:
+            raise ValueError(f"File size exceeds {limit_mb}MB limit.")
+
+        # Read the whole file first (bounded by max_bytes): the key is its content hash and
+        # the image is rendered before anything is written, so nothing is staged in the bucket
+        received = bytearray()
+        async for chunk in dto.chunks:
+            received.extend(chunk)
+            if len(received) > self.max_bytes:
+                raise ValueError(f"File size exceeds {limit_mb}MB limit.")
+        content = bytes(received)
+
+        # Raises ValueError on an undecodable image
+        variants = await self.image_processor.make_thumbnails(content, self.thumbnail_sizes)
+
+        filename = content_addressed_name(hashlib.sha256(content).hexdigest(), dto.content_type)
+        try:
+            url = await self.repository.upload_icon_stream(filename, self._chunks(content), dto.content_type)
+            thumbnails = await self._upload_thumbnails(filename, variants)
+        finally:
+            self.cache.invalidate()
+        return UploadIconResult(url=url, filename=filename, thumbnails=thumbnails)
+
+    @staticmethod
+    async def _chunks(content: bytes, size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        for offset in range(0, len(content), size):
+            yield content[offset:offset + size]
+
+    async def _upload_thumbnails(self, filename: str, variants: Dict[int, bytes]) -> Dict[int, str]:
+        urls = await asyncio.gather(*(
+            self.repository.upload_icon(thumbnail_key(filename, size), data, "image/webp")
+            for size, data in variants.items()
+        ))
+        return dict(zip(variants.keys(), urls))
@@ -1,10 +1,15 @@
-from typing import List
-from app.domain.entities.memory import MemoryFragment
+from typing import Optional
+from app.domain.entities.memory import MemoryPage, MemoryQuery
 from app.domain.interfaces.repositories.memory import IMemoryRepository
 
 class ListMemoriesUseCase:
     def __init__(self, repository: IMemoryRepository):
         self.repository = repository
 
-    async def execute(self, limit: int = 100) -> List[MemoryFragment]:
-        return await self.repository.list_fragments(limit=limit)
+    async def execute(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        query: Optional[MemoryQuery] = None
+    ) -> MemoryPage:
+        return await self.repository.list_fragments(limit=limit, cursor=cursor, query=query)
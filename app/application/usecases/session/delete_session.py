@@ -1,8 +1,17 @@
+from typing import Optional
 from app.domain.interfaces.repositories.chat import IChatRepository
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
 
 class DeleteSessionUseCase:
-    def __init__(self, chat_repo: IChatRepository):
+    def __init__(
+        self,
+        chat_repo: IChatRepository,
+        message_index: Optional[IMessageVectorIndex] = None
+    ):
         self.chat_repo = chat_repo
+        self.message_index = message_index
 
     async def execute(self, uid: str) -> None:
         await self.chat_repo.delete_session(uid)
+        if self.message_index:
+            await self.message_index.delete_session(uid)
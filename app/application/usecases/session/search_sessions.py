@@ -0,0 +1,10 @@
+from typing import List
+from app.domain.entities.chat import DialogSessionSummary
+from app.domain.interfaces.repositories.chat import IChatRepository
+
+class SearchSessionsUseCase:
+    def __init__(self, chat_repo: IChatRepository):
+        self.chat_repo = chat_repo
+
+    async def execute(self, query: str, limit: int = 20) -> List[DialogSessionSummary]:
+        return await self.chat_repo.search_sessions(query, limit)
@@ -0,0 +1,45 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+class TTLCache(Generic[V]):
+    """
+    Small in-process LRU cache with per-entry expiry.
+    Not thread-safe, meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_sec: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl_sec: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_sec if ttl_sec is None else ttl_sec)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,155 @@
+"""
+Per-dependency circuit breakers: after repeated failures a dependency is not called at all
+for a while, so a struggling backend gets room to recover instead of a queue of retries.
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpen(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    closed -> open after 'failure_threshold' consecutive failures; open fails every call
+    immediately for 'reset_sec'; then half-open lets 'probes' calls through: a success
+    closes the breaker, a failure opens it again.
+
+    Only outages count ('is_failure', default: any exception). Cancellation (client gone,
+    deadline, a hedged request that lost) is neither a success nor a failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_sec: float = 30.0,
+        probes: int = 1,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+        self.probes = probes
+        self.is_failure = is_failure or (lambda e: isinstance(e, Exception))
+        self.state = CLOSED
+        self.failures = 0 # Consecutive
+        self._opened_at = 0.0
+        self._probing = 0
+        self._rejected = 0
+        self._trips = 0
+
+    @property
+    def healthy(self) -> bool:
+        """
+        Closed with no failure since the last success: the only state worth retrying in.
+        """
+        return self.state == CLOSED and self.failures == 0
+
+    def acquire(self) -> None:
+        """
+        Raises CircuitOpen if the call must not be made. Every acquire is followed by
+        exactly one of success(), failure(e) or release().
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_sec:
+                self._rejected += 1
+                raise CircuitOpen(f"circuit open after {self.failures} failures")
+            self.state = HALF_OPEN
+            self._probing = 0
+            logger.info(f"Circuit '{self.name}' half-open, probing")
+
+        if self.state == HALF_OPEN:
+            if self._probing >= self.probes:
+                self._rejected += 1
+                raise CircuitOpen("circuit half-open, probe in flight")
+            self._probing += 1
+
+    def success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit '{self.name}' closed")
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = 0
+
+    def failure(self, error: BaseException) -> None:
+        if not self.is_failure(error):
+            self.release()
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self._trips += 1
+                logger.warning(f"Circuit '{self.name}' open for {self.reset_sec:.0f}s after {self.failures} failure(s): {error}")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self._probing = 0
+
+    def release(self) -> None:
+        # Call ended without a verdict: free the probe slot
+        if self.state == HALF_OPEN and self._probing > 0:
+            self._probing -= 1
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """
+        Guards one call: acquire on entry, success/failure by how the block exits.
+        """
+        self.acquire()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            self.release()
+            raise
+        except BaseException as e:
+            self.failure(e)
+            raise
+        else:
+            self.success()
+
+    def report(self) -> dict:
+        retry_in = self.reset_sec - (time.monotonic() - self._opened_at) if self.state == OPEN else 0.0
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_sec": round(max(0.0, retry_in), 1),
+            "rejected": self._rejected,
+            "trips": self._trips
+        }
+
+class CircuitBreakers:
+    """
+    One breaker per dependency name, created on first use with shared settings.
+    Disabled: every breaker is None and adapters call straight through.
+    """
+
+    def __init__(self, enabled: bool = True, failure_threshold: int = 5, reset_sec: float = 30.0):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, is_failure: Optional[Callable[[BaseException], bool]] = None) -> Optional[CircuitBreaker]:
+        if not self.enabled:
+            return None
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=self.failure_threshold,
+                reset_sec=self.reset_sec,
+                is_failure=is_failure
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+    def report(self) -> dict:
+        return {"enabled": self.enabled, "breakers": {name: b.report() for name, b in self._breakers.items()}}
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -14,11 +15,77 @@ class Settings(BaseSettings):
     
     # --- Embeddings (Vectors) ---
     EMBEDDING_MODEL: str = "nomic-embed-text" 
+    EMBEDDING_VECTOR_SIZE: Optional[int] = None # e.g. 768 for nomic-embed-text; unset = detect once, cached in Mongo
+
+    # --- Model residency (Ollama native API; turns itself off on other backends) ---
+    LLM_PRELOAD_MODELS: bool = True # Load chat + embedding models at startup and keep them loaded
+    OLLAMA_URL: Optional[str] = None # Native API root; unset = LLM_BASE_URL without /v1
+    LLM_KEEP_ALIVE: str = "30m" # Ollama duration, or seconds; "-1" = until Ollama restarts
+    LLM_KEEP_ALIVE_INTERVAL_SEC: float = 60.0 # Re-send keep_alive (/v1 requests reset it to Ollama's default)
+    LLM_MAX_RESIDENT_MODELS: int = 0 # Models the GPU fits at once; 1 = chat/embedding swap each turn (logged). 0 = unknown
+
+    # --- Dependency failures (LLM, embedder, search) ---
+    BREAKER_ENABLED: bool = True
+    BREAKER_FAILURE_THRESHOLD: int = 5 # Consecutive outages (connection errors, timeouts, 5xx/429) that open a breaker
+    BREAKER_RESET_SEC: float = 30.0 # Calls fail fast this long, then one probe is let through
+    LLM_HEDGE_BASE_URL: Optional[str] = None # Second OpenAI-compatible backend; unset = no hedging
+    LLM_HEDGE_API_KEY: str = "ollama"
+    LLM_HEDGE_MODEL: Optional[str] = None # Model name on the second backend; unset = same as requested
+    LLM_HEDGE_PERCENTILE: float = 95.0 # Hedge when no token arrived by this percentile of recent TTFTs
+    LLM_HEDGE_MIN_DELAY_SEC: float = 1.0 # Never hedge sooner than this
 
     # --- Qdrant (Memory) ---
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
-    QDRANT_COLLECTION: str = "waifu_memory_v1"
+    QDRANT_COLLECTION: str = "waifu_memory_v1" # Alias, real collections are versioned behind it
+    QDRANT_REINDEX_BATCH_SIZE: int = 64
+    QDRANT_REINDEX_MAX_POINTS_PER_SEC: float = 200.0 # 0 disables throttling
+    QDRANT_REINDEX_DROP_OLD: bool = False # Keep previous collection for rollback
+
+    # --- Web Search (SearXNG) ---
+    SEARXNG_URL: str = "http://searxng:8080"
+    SEARCH_QUERY_VARIANTS: int = 3
+    SEARCH_TOP_K: int = 5
+    SEARCH_DEADLINE_SEC: float = 6.0 # Query generation + all searches + page fetching
+    SEARCH_FETCH_PAGES: bool = False # Fetch top result pages and inject best passages instead of snippets
+    SEARCH_FETCH_TOP_N: int = 3
+    SEARCH_FETCH_TIMEOUT_SEC: float = 4.0
+    SEARCH_FETCH_MAX_BYTES: int = 1_000_000
+    SEARCH_PASSAGES_TOP_K: int = 4
+    SEARCH_PASSAGE_CHARS: int = 600
+    SEARCH_PAGE_CACHE_SIZE: int = 256
+    SEARCH_PAGE_CACHE_TTL_SEC: float = 3600.0
+
+    # --- Load shedding (each turn does less under load instead of everyone timing out) ---
+    DEGRADE_ENABLED: bool = True
+    DEGRADE_QUEUE_STEP: int = 4 # Turns in flight per degradation level (levels 0-3)
+    DEGRADE_TTFT_SEC: float = 5.0 # Median time to first token per degradation level
+    DEGRADE_MEMORY_SLOW_SEC: float = 1.0 # Memory recall median above this: memories skipped
+    DEGRADE_SEARCH_SLOW_SEC: float = 8.0 # Web retrieval median above this: search skipped
+    DEGRADE_MAX_ERROR_RATE: float = 0.5 # Failing memory/search above this rate: skipped
+    DEGRADE_WINDOW_SEC: float = 60.0 # Signals look this far back; skipped stages are retried after it
+
+    # --- Turn deadlines (every adapter call of a chat turn runs under these) ---
+    CHAT_TURN_DEADLINE_SEC: float = 45.0 # Whole turn up to the first reply token
+    CHAT_CONTEXT_BUDGET_SEC: float = 5.0 # Profile/persona/history reads and the user message save; failure ends the turn
+    CHAT_MEMORY_BUDGET_SEC: float = 3.0 # Memory recall; when exceeded the reply goes on without memories
+    CHAT_LLM_STALL_SEC: float = 30.0 # Longest silence between two streamed tokens
+    # Web search: SEARCH_DEADLINE_SEC, capped by what is left of the turn
+
+    # --- Reply streams ---
+    CHAT_STREAM_BUFFER_TTL_SEC: float = 300.0 # Finished replies stay resumable via /chat/stream/{id} this long
+    CHAT_STREAM_MAX_JOBS: int = 256 # Buffered finished replies kept at most (running ones are never dropped)
+    CHAT_IDEMPOTENCY_TTL_SEC: float = 600.0 # A retried idempotency_key maps to its reply this long
+
+    # --- Reply pre-generation (opt-in) ---
+    CHAT_PREGENERATE_ALTERNATIVES: int = 0 # Alternatives generated per reply while the LLM is idle; 0 disables
+    CHAT_PREGENERATE_IDLE_SEC: float = 2.0 # No user turn for this long = idle; a new turn cancels speculative work
+
+    # --- Chat Search (message vector index, opt-in) ---
+    CHAT_SEARCH_ENABLED: bool = False
+    CHAT_SEARCH_COLLECTION: str = "waifu_messages_v1"
+    CHAT_INDEX_BATCH_SIZE: int = 64
+    CHAT_INDEX_INTERVAL_SEC: float = 10.0
 
     MONGO_URL: str = "mongodb://localhost:27017"
     DB_NAME: str = "waifu_db"
@@ -31,6 +98,24 @@ class Settings(BaseSettings):
     S3_SECRET_KEY: str = "minioadmin"
     S3_BUCKET_NAME: str = "waifu-icons"
     S3_REGION_NAME: str = "us-east-1" # MinIO default
+    S3_MAX_CONNECTIONS: int = 8 # Connection pool size = executor threads
+
+    # --- Icons ---
+    ICON_MAX_BYTES: int = 5 * 1024 * 1024
+    ICON_THUMBNAIL_SIZES: List[int] = [64, 128]
+    ICON_PROCESS_WORKERS: int = 2
+    ICON_CACHE_CONTROL: str = "public, max-age=31536000, immutable" # Keys are content hashes, objects never change
+    ICON_LIST_CACHE_TTL_SEC: float = 60.0
+
+    # --- Startup ---
+    STARTUP_CRITICAL_ATTEMPTS: int = 5 # Mongo/bootstrap retries before the boot fails
+    STARTUP_RETRY_BACKOFF_SEC: float = 1.0 # Doubles per attempt
+    STARTUP_MAX_BACKOFF_SEC: float = 30.0 # Non-critical steps (Qdrant, chat index) retry forever at this pace
+
+    # --- Observability ---
+    METRICS_ENABLED: bool = True # Prometheus histograms on /metrics, OpenTelemetry spans
+    OTEL_SERVICE_NAME: str = "wfai"
+    DEPENDENCY_SLOW_CALL_SEC: float = 1.0 # Adapter calls slower than this are logged (streams: first item)
 
     model_config = SettingsConfigDict(
         env_file=".env", 
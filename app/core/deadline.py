@@ -0,0 +1,97 @@
+"""
+Per-request time budget, carried in a context variable so adapters several calls deep
+can size their own timeouts from it without every signature passing it along.
+
+Set only around awaits (scope/within), never across a generator's yields: a context
+variable reset from another context (e.g. a generator finalized later) fails.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() the current request must be done by, None = unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+@contextmanager
+def scope(seconds: Optional[float] = None, until: Optional[float] = None) -> Iterator[None]:
+    """
+    Narrows the current deadline to 'seconds' from now and/or the absolute 'until'.
+    Never extends an outer deadline.
+    """
+    candidates = [d for d in (_deadline.get(), until) if d is not None]
+    if seconds is not None:
+        candidates.append(time.monotonic() + seconds)
+    if not candidates:
+        yield
+        return
+
+    token = _deadline.set(min(candidates))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+def timeout(default: Optional[float] = None) -> Optional[float]:
+    """
+    Timeout for one I/O call: what is left of the deadline, capped by the adapter's own 'default'.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    return left if default is None else min(left, default)
+
+async def within(
+    awaitable: Awaitable[T],
+    seconds: Optional[float] = None,
+    until: Optional[float] = None,
+    stage: str = "call"
+) -> T:
+    """
+    Awaits under the current deadline narrowed by 'seconds'/'until'. Nested adapter calls
+    see the narrowed deadline. Raises DeadlineExceeded when it runs out.
+    """
+    with scope(seconds, until):
+        left = remaining()
+        if left is None:
+            return await awaitable
+        try:
+            async with asyncio.timeout(left):
+                return await awaitable
+        except TimeoutError as e:
+            raise DeadlineExceeded(f"{stage}: deadline exceeded after {left:.1f}s") from e
+
+async def guard_stream(
+    stream: AsyncIterator[T],
+    first_item_until: Optional[float] = None,
+    stall_sec: Optional[float] = None,
+    stage: str = "stream"
+) -> AsyncIterator[T]:
+    """
+    Bounds a stream: the first item must arrive before 'first_item_until' (absolute), each
+    next one within 'stall_sec' of the previous. Items are yielded outside the deadline scope.
+    """
+    iterator = stream.__aiter__()
+    until, seconds = first_item_until, None
+    try:
+        while True:
+            try:
+                item = await within(iterator.__anext__(), seconds=seconds, until=until, stage=stage)
+            except StopAsyncIteration:
+                return
+            until, seconds = None, stall_sec
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
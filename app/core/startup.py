@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+@dataclass(kw_only=True)
+class StartupStep:
+    """
+    One init step. 'requires' lists steps that must be ready first; everything else runs concurrently.
+
+    Critical steps gate the app: lifespan waits for them before serving traffic.
+    Non-critical steps finish in background and only show up on /health/ready.
+    """
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+    critical: bool = True
+
+@dataclass(kw_only=True)
+class StepState:
+    status: str = PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+    duration_sec: Optional[float] = None
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+
+class StartupError(RuntimeError):
+    pass
+
+class StartupOrchestrator:
+    """
+    Runs startup steps as a dependency graph instead of one after another.
+
+    Failed steps are retried with exponential backoff, since Mongo/Qdrant/Ollama often come up
+    after the backend container. A critical step gives up after 'critical_attempts' and fails
+    the boot; non-critical ones keep retrying in background (capped backoff), the app serves
+    without them in the meantime.
+    """
+
+    def __init__(
+        self,
+        critical_attempts: int = 5,
+        retry_backoff_sec: float = 1.0,
+        max_backoff_sec: float = 30.0
+    ):
+        self.critical_attempts = critical_attempts
+        self.retry_backoff_sec = retry_backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self._steps: Dict[str, StartupStep] = {}
+        self._states: Dict[str, StepState] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._started_at: Optional[float] = None
+
+    def add(self, step: StartupStep) -> None:
+        if step.name in self._steps:
+            raise ValueError(f"Duplicate startup step: {step.name}")
+        self._steps[step.name] = step
+        self._states[step.name] = StepState()
+
+    def spawn(self, coro: Awaitable[Any], name: str) -> asyncio.Task:
+        """
+        Long-running background work started by a step (reindex, indexer loop). Cancelled on shutdown.
+        """
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    async def start(self) -> None:
+        """
+        Launches every step and returns once all critical steps are ready.
+        Raises StartupError if a critical step (or one it depends on) gave up.
+        """
+        self._validate()
+        self._started_at = time.perf_counter()
+
+        runners = {name: asyncio.create_task(self._run(step)) for name, step in self._steps.items()}
+        self._tasks.update(runners.values())
+
+        critical = [runners[name] for name, step in self._steps.items() if step.critical]
+        if critical:
+            # First failure wins: steps waiting on the failed one would otherwise wait forever
+            done, _ = await asyncio.wait(critical, return_when=asyncio.FIRST_EXCEPTION)
+            failed = next((t for t in done if t.exception() is not None), None)
+            if failed is not None:
+                await self.shutdown()
+                raise StartupError(f"Critical startup step failed: {failed.exception()}") from failed.exception()
+
+        logger.info(f"Critical startup steps ready in {time.perf_counter() - self._started_at:.2f}s")
+
+    async def shutdown(self) -> None:
+        tasks = [t for t in self._tasks if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Readiness: all critical steps done. Degraded non-critical steps don't take the app out of rotation.
+        """
+        return bool(self._steps) and all(
+            self._states[name].status == READY for name, step in self._steps.items() if step.critical
+        )
+
+    def report(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "degraded": [
+                name for name, step in self._steps.items()
+                if not step.critical and self._states[name].status != READY
+            ],
+            "steps": {
+                name: {
+                    "status": state.status,
+                    "critical": self._steps[name].critical,
+                    "attempts": state.attempts,
+                    "duration_sec": state.duration_sec,
+                    "error": state.error
+                }
+                for name, state in self._states.items()
+            }
+        }
+
+    async def _run(self, step: StartupStep) -> None:
+        state = self._states[step.name]
+        for dep in step.requires:
+            await self._states[dep].ready.wait()
+
+        delay = self.retry_backoff_sec
+        while True:
+            state.status = RUNNING
+            state.attempts += 1
+            started = time.perf_counter()
+            try:
+                await step.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.status = FAILED
+                state.error = f"{type(e).__name__}: {e}"
+                if step.critical and state.attempts >= self.critical_attempts:
+                    logger.error(f"Startup step '{step.name}' failed after {state.attempts} attempts: {e}")
+                    raise
+                logger.warning(f"Startup step '{step.name}' failed (attempt {state.attempts}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff_sec)
+                continue
+
+            state.status = READY
+            state.error = None
+            state.duration_sec = time.perf_counter() - started
+            state.ready.set()
+            logger.info(f"Startup step '{step.name}' ready in {state.duration_sec:.2f}s")
+            return
+
+    def _validate(self) -> None:
+        for step in self._steps.values():
+            unknown = [dep for dep in step.requires if dep not in self._steps]
+            if unknown:
+                raise ValueError(f"Startup step '{step.name}' requires unknown steps: {unknown}")
+            if step.critical:
+                soft = [dep for dep in step.requires if not self._steps[dep].critical]
+                if soft:
+                    raise ValueError(f"Critical step '{step.name}' can't wait on non-critical steps: {soft}")
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background task '{task.get_name()}' crashed", exc_info=task.exception())
@@ -0,0 +1,138 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Awaitable, Iterator, Optional, Tuple, TypeVar
+
+try:
+    from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+except ImportError: # Optional dependency: without it /metrics is empty
+    CollectorRegistry = None
+
+try:
+    from opentelemetry import trace
+except ImportError: # Optional dependency: without it no spans are exported
+    trace = None
+
+T = TypeVar("T")
+
+# Seconds. Dense at the low end: most stages are a few ms, LLM streams take seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RATE_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 40, 60, 80, 100, 150, 200)
+# Items for lists, characters for text, bytes for binary
+SIZE_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 1_000_000, 5_000_000)
+
+class StageSpan:
+    """
+    Handle yielded by Telemetry.span(): lets a stage attach attributes
+    without caring whether OpenTelemetry is installed.
+    """
+
+    __slots__ = ("_span",)
+
+    def __init__(self, span: Any = None):
+        self._span = span
+
+    def set(self, key: str, value: Any) -> None:
+        if self._span is not None:
+            self._span.set_attribute(key, value)
+
+class Telemetry:
+    """
+    Per-stage latency tracing for the chat pipeline.
+
+    Every stage is an OpenTelemetry span (exported only if an SDK is configured,
+    e.g. via opentelemetry-instrument) and an observation in a Prometheus histogram
+    served on /metrics. Both backends are optional: when a library is missing,
+    that half silently does nothing, so callers never need to check.
+    """
+
+    def __init__(self, service_name: str = "wfai", enabled: bool = True):
+        self.enabled = enabled
+        self.tracer = trace.get_tracer(service_name) if (enabled and trace) else None
+
+        self.registry = None
+        if enabled and CollectorRegistry:
+            # Own registry: several instances (tests, benchmarks) never clash on metric names
+            self.registry = CollectorRegistry()
+            self.stage_seconds = Histogram(
+                "wfai_chat_stage_seconds", "Duration of a chat pipeline stage",
+                ["stage"], buckets=LATENCY_BUCKETS, registry=self.registry
+            )
+            self.ttft_seconds = Histogram(
+                "wfai_chat_ttft_seconds", "Time from turn start to the first streamed token",
+                buckets=LATENCY_BUCKETS, registry=self.registry
+            )
+            self.tokens_per_second = Histogram(
+                "wfai_chat_tokens_per_second", "Generation speed after the first token",
+                buckets=RATE_BUCKETS, registry=self.registry
+            )
+            self.dependency_calls = Counter(
+                "wfai_dependency_calls", "Calls to adapters (repositories, LLM, embedder, search) by outcome",
+                ["dependency", "method", "outcome"], registry=self.registry
+            )
+            self.dependency_seconds = Histogram(
+                "wfai_dependency_call_seconds", "Duration of an adapter call (streams: until exhausted)",
+                ["dependency", "method"], buckets=LATENCY_BUCKETS, registry=self.registry
+            )
+            self.dependency_payload = Histogram(
+                "wfai_dependency_payload_size", "Adapter argument (in) and result (out) sizes",
+                ["dependency", "method", "direction"], buckets=SIZE_BUCKETS, registry=self.registry
+            )
+
+    def trace_span(self, name: str, **attributes: Any):
+        """
+        Bare OpenTelemetry span (no stage histogram), a no-op context manager without OTel.
+        """
+        return self.tracer.start_as_current_span(name, attributes=attributes) if self.tracer else nullcontext()
+
+    @contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[StageSpan]:
+        started = time.perf_counter()
+        try:
+            with self.trace_span(stage, **attributes) as span:
+                yield StageSpan(span)
+        finally:
+            if self.registry is not None:
+                self.stage_seconds.labels(stage=stage).observe(time.perf_counter() - started)
+
+    async def timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """
+        Times one awaitable as its own stage, e.g. a single call inside asyncio.gather.
+        """
+        with self.span(stage):
+            return await awaitable
+
+    def observe_ttft(self, seconds: float) -> None:
+        if self.registry is not None:
+            self.ttft_seconds.observe(seconds)
+
+    def observe_tokens_per_second(self, rate: float) -> None:
+        if self.registry is not None:
+            self.tokens_per_second.observe(rate)
+
+    def record_call(
+        self,
+        dependency: str,
+        method: str,
+        seconds: float,
+        outcome: str,
+        size_in: Optional[int] = None,
+        size_out: Optional[int] = None
+    ) -> None:
+        if self.registry is None:
+            return
+        self.dependency_calls.labels(dependency=dependency, method=method, outcome=outcome).inc()
+        self.dependency_seconds.labels(dependency=dependency, method=method).observe(seconds)
+        if size_in is not None:
+            self.dependency_payload.labels(dependency=dependency, method=method, direction="in").observe(size_in)
+        if size_out is not None:
+            self.dependency_payload.labels(dependency=dependency, method=method, direction="out").observe(size_out)
+
+    def render(self) -> Tuple[bytes, str]:
+        """
+        Prometheus text exposition for the /metrics endpoint.
+        """
+        if self.registry is None:
+            return b"# prometheus_client is not installed or metrics are disabled\n", "text/plain; charset=utf-8"
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+NOOP = Telemetry(enabled=False)
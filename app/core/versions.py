@@ -0,0 +1,44 @@
+import hashlib
+import itertools
+import uuid
+from typing import Any, Dict
+
+USER_PROFILE = "user"
+PERSONA = "persona"
+SESSIONS = "sessions"
+
+def history_key(session_id: str) -> str:
+    return f"history:{session_id}"
+
+class ResourceVersions:
+    """
+    In-process revision counters for frequently polled resources.
+    Repositories bump a resource on every write, routers turn the current revision into an ETag.
+    If the client's If-None-Match still matches, nothing has been written since, so Mongo
+    is not queried at all.
+
+    Revisions are prefixed with a per-process boot id: after a restart every old ETag misses
+    once instead of colliding with a reused counter. Writes done by another process are not
+    seen, which is fine for the single-worker deployment.
+    """
+
+    def __init__(self):
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+        self._revisions: Dict[str, int] = {}
+
+    def bump(self, *keys: str) -> None:
+        revision = next(self._counter)
+        for key in keys:
+            self._revisions[key] = revision
+
+    def revision(self, key: str) -> str:
+        return f"{self._boot_id}-{self._revisions.get(key, 0)}"
+
+    def etag(self, key: str, *params: Any) -> str:
+        """
+        Query params are part of the tag: page 2 and page 1 of the same resource differ.
+        Capture it BEFORE reading, so a write racing with the read yields a tag that is already stale.
+        """
+        raw = "|".join([self.revision(key), *(str(p) for p in params)])
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
@@ -3,7 +3,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import uuid
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class EntityBase:
+    # Factories only run when the value is not passed: hydrating from storage with
+    # uid/created_at given never calls uuid4()/now(), no separate constructor needed.
     uid: str = field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Optional
 from .base import EntityBase
+from .search import SearchResult
 
 class MessageRole(str, Enum):
     USER = "user"
@@ -14,14 +15,25 @@ class ChatStatus(str, Enum):
     ACTIVE = "active"
     ARCHIVED = "archived"
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Message(EntityBase):
     role: MessageRole
     content: str
     referenced_memory_ids: List[str] = field(default_factory=list)
     token_count: Optional[int] = None
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
+class TurnContext:
+    """
+    What an assistant reply was generated from, stored next to it so regenerate can
+    rebuild the prompt without re-embedding, re-querying Qdrant or searching again.
+    Recalled memories are the message's own 'referenced_memory_ids'.
+    """
+    search_queries: List[str] = field(default_factory=list)
+    search_results: Optional[List[SearchResult]] = None # None: the turn ran without search
+    prompt_hash: Optional[str] = None # Persona + user profile part of the system prompt
+
+@dataclass(kw_only=True, slots=True)
 class DialogSessionSummary(EntityBase):
     """
     Lightweight entity for lists/sidebars.
@@ -31,7 +43,7 @@ class DialogSessionSummary(EntityBase):
     status: ChatStatus = ChatStatus.ACTIVE
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class DialogSession(DialogSessionSummary):
     """
     Full entity for active chat interaction.
@@ -41,4 +53,19 @@ class DialogSession(DialogSessionSummary):
 
     def add_message(self, msg: Message) -> None:
         self.messages.append(msg)
-        self.updated_at = datetime.now(timezone.utc)
\ No newline at end of file
+        self.updated_at = datetime.now(timezone.utc)
+
+@dataclass(kw_only=True, slots=True)
+class MessageSearchHit:
+    """
+    A message found by chat search, with the session it belongs to.
+    """
+    session_id: str
+    message: Message
+    score: float = 0.0
+    highlights: List[str] = field(default_factory=list) # HTML-escaped snippets, matches wrapped in <mark>
+
+@dataclass(kw_only=True, slots=True)
+class MessageSearchPage:
+    items: List[MessageSearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None # Opaque, None means last page
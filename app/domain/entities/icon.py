@@ -0,0 +1,33 @@
+# app/domain/entities/icon.py
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Generated variants live under their own prefix and are hidden from icon listings
+THUMBNAILS_PREFIX = "thumbs/"
+
+EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/webp": ".webp",
+}
+
+@dataclass(kw_only=True, slots=True)
+class IconPage:
+    items: List[str] = field(default_factory=list) # Public URLs
+    next_cursor: Optional[str] = None # Opaque, None means last page
+
+def content_addressed_name(digest: str, content_type: str) -> str:
+    """
+    sha256 hex + 'image/png' -> '3f9a..c1.png'
+    Same bytes always map to the same key, so objects never change and can be cached forever.
+    """
+    return f"{digest[:32]}{EXTENSIONS.get(content_type, '')}"
+
+def thumbnail_key(filename: str, size: int) -> str:
+    """
+    'rebecca.png', 64 -> 'thumbs/rebecca_64.webp'
+    """
+    stem, _ = os.path.splitext(filename)
+    return f"{THUMBNAILS_PREFIX}{stem}_{size}.webp"
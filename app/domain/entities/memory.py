@@ -1,11 +1,35 @@
 # app/domain/entities/memory.py
 from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 from app.domain.entities.base import EntityBase
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class MemoryFragment(EntityBase):
     content: str
     vector_id: Optional[str] = None
     importance: float = 0.5
-    tags: List[str] = field(default_factory=list)
\ No newline at end of file
+    tags: List[str] = field(default_factory=list)
+
+class MemorySortField(str, Enum):
+    IMPORTANCE = "importance"
+    CREATED_AT = "created_at"
+
+@dataclass(kw_only=True, slots=True)
+class MemoryQuery:
+    """
+    Filters and ordering for listing memories. Empty query = everything, storage order.
+    """
+    tags: List[str] = field(default_factory=list)
+    min_importance: Optional[float] = None
+    max_importance: Optional[float] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    sort_by: Optional[MemorySortField] = None
+    descending: bool = True
+
+@dataclass(kw_only=True, slots=True)
+class MemoryPage:
+    items: List[MemoryFragment] = field(default_factory=list)
+    next_cursor: Optional[str] = None # Opaque, None means last page
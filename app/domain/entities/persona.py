@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional
 import uuid
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class WaifuPersona:
     uid: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -0,0 +1,12 @@
+# app/domain/entities/search.py
+from dataclasses import dataclass, field
+from typing import List
+
+@dataclass(kw_only=True, slots=True)
+class SearchResult:
+    title: str
+    url: str
+    content: str = ""
+    score: float = 0.0
+    queries: List[str] = field(default_factory=list) # Which query variants found it
+    passages: List[str] = field(default_factory=list) # Best page fragments for the query, if fetched
@@ -4,7 +4,7 @@ from typing import List
 import uuid
 from .base import EntityBase
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserProfile:
     """
     Information about the human user.
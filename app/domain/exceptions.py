@@ -9,4 +9,15 @@ class PersoneNotFound(DomainError):
     pass
 
 class SessionNotFound(DomainError):
-    pass
\ No newline at end of file
+    pass
+
+class ChatSearchDisabled(DomainError):
+    pass
+
+class GenerationExpired(DomainError):
+    """The reply an idempotency key refers to finished and left the stream buffer; it is in the history."""
+    pass
+
+class DependencyUnavailable(DomainError):
+    """An external service (LLM, embedder, search) is down, or its circuit breaker is open."""
+    pass
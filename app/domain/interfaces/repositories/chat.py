@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from datetime import datetime
-from app.domain.entities.chat import DialogSession, DialogSessionSummary, Message
+from app.domain.entities.chat import (
+    DialogSession,
+    DialogSessionSummary,
+    Message,
+    MessageRole,
+    MessageSearchHit,
+    MessageSearchPage,
+    TurnContext
+)
 
 class IChatRepository(ABC):
     """
@@ -58,9 +66,54 @@ class IChatRepository(ABC):
         pass
 
     @abstractmethod
-    async def add_message(self, session_id: str, message: Message) -> None:
+    async def add_message(self, session_id: str, message: Message, context: Optional[TurnContext] = None) -> None:
         """
         Append a message to the specific session history.
+        'context' is the retrieval snapshot of an assistant reply, stored apart from the message.
+        """
+        pass
+
+    @abstractmethod
+    async def get_turn_context(self, message_uid: str) -> Optional[TurnContext]:
+        """
+        Snapshot saved with an assistant message, None for messages saved without one.
+        """
+        pass
+
+    @abstractmethod
+    async def add_reply_alternative(
+        self,
+        session_id: str,
+        reply_to: str,
+        message: Message,
+        context: TurnContext
+    ) -> None:
+        """
+        Store a pre-generated reply to user message 'reply_to' as a sibling branch,
+        outside of the visible history.
+        """
+        pass
+
+    @abstractmethod
+    async def count_reply_alternatives(self, reply_to: str, with_search: bool) -> int:
+        """
+        Unused alternatives for 'reply_to' generated in the given search mode.
+        """
+        pass
+
+    @abstractmethod
+    async def promote_reply_alternative(
+        self,
+        session_id: str,
+        reply_to: str,
+        current: Message,
+        with_search: bool,
+        reply_id: Optional[str] = None
+    ) -> Optional[Message]:
+        """
+        Swap the last reply 'current' for an unused alternative: the alternative becomes the
+        last message (stored under 'reply_id' when given), 'current' is kept as a seen branch.
+        None if there is no alternative.
         """
         pass
 
@@ -77,4 +130,38 @@ class IChatRepository(ABC):
         Remove the most recent message from the session. 
         Returns True if a message was deleted, False otherwise.
         """
+        pass
+
+    @abstractmethod
+    async def get_messages_by_ids(
+        self,
+        uids: List[str],
+        contains: Optional[str] = None,
+        role: Optional[MessageRole] = None
+    ) -> List[MessageSearchHit]:
+        """
+        Fetch messages by uid, optionally narrowed by a case-insensitive substring and role.
+        Unknown uids are skipped. Order is not guaranteed, score is left unset.
+        """
+        pass
+
+    @abstractmethod
+    async def search_messages(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> MessageSearchPage:
+        """
+        Keyword (full-text) search over message content, newest matches first.
+        Pass 'next_cursor' of the previous page as 'cursor' to continue.
+        """
+        pass
+
+    @abstractmethod
+    async def search_sessions(self, query: str, limit: int = 20) -> List[DialogSessionSummary]:
+        """
+        Keyword (full-text) search over session titles, best matches first.
+        """
         pass
\ No newline at end of file
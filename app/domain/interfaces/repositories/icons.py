@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Optional
+from app.domain.entities.icon import IconPage
 
 class IWaifuIconRepository(ABC):
     @abstractmethod
@@ -9,10 +10,25 @@ class IWaifuIconRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def upload_icon_stream(self, filename: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        """
+        Uploads an icon from a stream of chunks (multipart for big files) and returns the public URL.
+        If the stream raises, the partial upload is aborted and the error propagates.
+        """
+        pass
+
     @abstractmethod
     async def list_icons(self) -> List[str]:
         """
-        Returns a list of public URLs for all uploaded icons.
+        Returns a list of public URLs for all uploaded icons (walks every page).
+        """
+        pass
+
+    @abstractmethod
+    async def list_icons_page(self, limit: int = 100, cursor: Optional[str] = None) -> IconPage:
+        """
+        Returns one page of icon URLs. Pass the previous page's next_cursor to continue.
         """
         pass
 
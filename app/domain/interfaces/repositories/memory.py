@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.domain.entities.memory import MemoryFragment
+from typing import List, Optional
+from app.domain.entities.memory import MemoryFragment, MemoryPage, MemoryQuery
 
 class IMemoryRepository(ABC):
     """
@@ -14,13 +14,26 @@ class IMemoryRepository(ABC):
     async def search_relevant(self, query: str, limit: int = 3, threshold: float = 0.7) -> List[MemoryFragment]:
         pass
     
+    @abstractmethod
+    async def get_fragments(self, vector_ids: List[str]) -> List[MemoryFragment]:
+        """
+        Fragments by id, in the given order. Missing ones (deleted since) are skipped.
+        """
+        pass
+
     @abstractmethod
     async def delete_fragment(self, vector_id: str) -> None:
         pass
 
     @abstractmethod
-    async def list_fragments(self, limit: int = 10) -> List[MemoryFragment]:
+    async def list_fragments(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        query: Optional[MemoryQuery] = None
+    ) -> MemoryPage:
         """
-        Returns a list of memory fragments with limit specified.
+        Returns one page of memory fragments.
+        Pass 'next_cursor' of the previous page as 'cursor' to get the next one.
         """
         pass
\ No newline at end of file
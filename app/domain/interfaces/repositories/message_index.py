@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from app.domain.entities.chat import Message
+
+class IMessageVectorIndex(ABC):
+    """
+    Semantic index over persisted chat messages (separate from long-term memory).
+    """
+
+    @abstractmethod
+    async def index_messages(self, items: List[Tuple[str, Message]]) -> None:
+        """
+        Embeds and stores messages. Items are (session_id, message) pairs.
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        session_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Returns (message_uid, score) pairs, best first.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_session(self, session_id: str) -> None:
+        """
+        Drops all vectors of the session.
+        """
+        pass
@@ -1,6 +1,28 @@
 from abc import ABC, abstractmethod
 
 class IEmbedder(ABC):
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """
+        Name of the embedding model currently used to produce vectors.
+        """
+        pass
+
+    @abstractmethod
+    def switch_model(self, model: str) -> None:
+        """
+        Re-points the embedder at another model (used when a collection swap happens).
+        """
+        pass
+
     @abstractmethod
     async def get_vector(self, text: str) -> list[float]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def get_vectors(self, texts: list[str]) -> list[list[float]]:
+        """
+        Batch version of get_vector. Order of vectors matches order of texts.
+        """
+        pass
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+class IImageProcessor(ABC):
+    @abstractmethod
+    async def make_thumbnails(self, content: bytes, sizes: List[int]) -> Dict[int, bytes]:
+        """
+        Returns square-bounded WebP thumbnails keyed by size (px).
+        Raises ValueError if content is not a valid image.
+        """
+        pass
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class IPageFetcher(ABC):
+    @abstractmethod
+    async def fetch_text(self, url: str) -> Optional[str]:
+        """
+        Download a web page and return its readable text.
+        Returns None if the page can't be fetched or has no usable text.
+        """
+        pass
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import List
+from app.domain.entities.search import SearchResult
 
 class ISearchTool(ABC):
     @abstractmethod
@@ -7,3 +9,11 @@ class ISearchTool(ABC):
         Perform a search and return a formatted string summary of results.
         """
         pass
+
+    @abstractmethod
+    async def search_results(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """
+        Perform a search and return raw results in engine order.
+        Raises on transport errors, so callers can decide how to degrade.
+        """
+        pass
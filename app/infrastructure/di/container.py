@@ -1,15 +1,22 @@
-from dishka import make_async_container, AsyncContainer
+from dishka import make_async_container, AsyncContainer, Provider
 from app.infrastructure.di.providers.adapters import AdaptersProvider
 from app.infrastructure.di.providers.repositories import RepositoriesProvider
 from app.infrastructure.di.providers.usecases import UseCasesProvider
 from app.infrastructure.di.providers.commands import CommandsProvider
 from app.infrastructure.di.providers.s3 import S3Provider
+from app.infrastructure.di.providers.instrumentation import InstrumentationProvider
 
-def make_container() -> AsyncContainer:
+def make_container(*overrides: Provider) -> AsyncContainer:
+    """
+    'overrides' replace real adapters (benchmarks, local runs with fakes).
+    They are placed before the decorators, so fakes are instrumented like the real thing.
+    """
     return make_async_container(
         AdaptersProvider(),
         RepositoriesProvider(),
         UseCasesProvider(),
         CommandsProvider(),
-        S3Provider()
+        S3Provider(),
+        *overrides,
+        InstrumentationProvider() # Decorators must come after the providers they wrap
     )
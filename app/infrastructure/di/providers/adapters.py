@@ -1,3 +1,4 @@
+from typing import AsyncIterable
 from dishka import Provider, Scope, provide
 from motor.motor_asyncio import AsyncIOMotorClient
 from qdrant_client import AsyncQdrantClient
@@ -5,8 +6,16 @@ from app.core.config import Settings
 from app.domain.interfaces.llm import ILLMClient
 from app.domain.interfaces.tools.search import ISearchTool
 from app.domain.interfaces.services.embedder import IEmbedder
-from app.adapters.llm.llm_client import OpenAIClient
+from app.domain.interfaces.tools.page_fetcher import IPageFetcher
+from app.core.cache import TTLCache
+from app.core.versions import ResourceVersions
+from app.core.telemetry import Telemetry
+from app.core.startup import StartupOrchestrator
+from app.core.circuit_breaker import CircuitBreakers
+from app.adapters.llm.llm_client import OpenAIClient, is_outage
+from app.adapters.llm.hedged_client import HedgedLLMClient
 from app.adapters.llm.memory import OpenAIEmbedder 
+from app.adapters.llm.model_manager import CHAT, EMBEDDING, OllamaModelManager
 
 class AdaptersProvider(Provider):
     scope = Scope.APP
@@ -15,6 +24,30 @@ class AdaptersProvider(Provider):
     def provide_settings(self) -> Settings:
         return Settings()
 
+    @provide
+    def provide_resource_versions(self) -> ResourceVersions:
+        return ResourceVersions()
+
+    @provide
+    def provide_telemetry(self, settings: Settings) -> Telemetry:
+        return Telemetry(service_name=settings.OTEL_SERVICE_NAME, enabled=settings.METRICS_ENABLED)
+
+    @provide
+    def provide_startup(self, settings: Settings) -> StartupOrchestrator:
+        return StartupOrchestrator(
+            critical_attempts=settings.STARTUP_CRITICAL_ATTEMPTS,
+            retry_backoff_sec=settings.STARTUP_RETRY_BACKOFF_SEC,
+            max_backoff_sec=settings.STARTUP_MAX_BACKOFF_SEC
+        )
+
+    @provide
+    def provide_circuit_breakers(self, settings: Settings) -> CircuitBreakers:
+        return CircuitBreakers(
+            enabled=settings.BREAKER_ENABLED,
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            reset_sec=settings.BREAKER_RESET_SEC
+        )
+
     @provide
     def provide_mongo_client(self, settings: Settings) -> AsyncIOMotorClient:
         return AsyncIOMotorClient(settings.MONGO_URL)
@@ -27,22 +60,77 @@ class AdaptersProvider(Provider):
         )
 
     @provide
-    def provide_llm_client(self, settings: Settings) -> ILLMClient:
-        return OpenAIClient(
+    async def provide_model_manager(self, settings: Settings) -> AsyncIterable[OllamaModelManager]:
+        base_url = settings.OLLAMA_URL or settings.LLM_BASE_URL.rstrip("/").removesuffix("/v1")
+        manager = OllamaModelManager(
+            base_url=base_url,
+            models={CHAT: settings.DEFAULT_MODEL, EMBEDDING: settings.EMBEDDING_MODEL},
+            keep_alive=settings.LLM_KEEP_ALIVE,
+            refresh_interval_sec=settings.LLM_KEEP_ALIVE_INTERVAL_SEC,
+            max_resident=settings.LLM_MAX_RESIDENT_MODELS
+        )
+        manager.enabled = settings.LLM_PRELOAD_MODELS
+        yield manager
+        await manager.close()
+
+    @provide
+    def provide_llm_client(self, settings: Settings, models: OllamaModelManager, breakers: CircuitBreakers) -> ILLMClient:
+        client = OpenAIClient(
             base_url=settings.LLM_BASE_URL,
             api_key=settings.LLM_API_KEY,
-            model=settings.DEFAULT_MODEL
+            model=settings.DEFAULT_MODEL,
+            models=models,
+            breaker=breakers.get("llm", is_failure=is_outage)
+        )
+        if not settings.LLM_HEDGE_BASE_URL:
+            return client
+
+        # The model manager only knows the primary Ollama
+        secondary = OpenAIClient(
+            base_url=settings.LLM_HEDGE_BASE_URL,
+            api_key=settings.LLM_HEDGE_API_KEY,
+            model=settings.LLM_HEDGE_MODEL or settings.DEFAULT_MODEL,
+            breaker=breakers.get("llm_hedge", is_failure=is_outage)
+        )
+        return HedgedLLMClient(
+            primary=client,
+            secondary=secondary,
+            secondary_model=settings.LLM_HEDGE_MODEL,
+            percentile=settings.LLM_HEDGE_PERCENTILE,
+            min_delay_sec=settings.LLM_HEDGE_MIN_DELAY_SEC
         )
 
     @provide
-    def provide_embedder(self, settings: Settings) -> IEmbedder:
+    def provide_embedder(self, settings: Settings, models: OllamaModelManager, breakers: CircuitBreakers) -> IEmbedder:
         return OpenAIEmbedder(
             api_key=settings.LLM_API_KEY,
             base_url=settings.LLM_BASE_URL,
-            model=settings.EMBEDDING_MODEL 
+            model=settings.EMBEDDING_MODEL,
+            models=models,
+            breaker=breakers.get("embedder", is_failure=is_outage)
         )
 
     @provide
-    def provide_search_tool(self, settings: Settings) -> ISearchTool:
-        from app.adapters.search.searxng import SearXNGSearchTool
-        return SearXNGSearchTool()
\ No newline at end of file
+    async def provide_search_tool(self, settings: Settings, breakers: CircuitBreakers) -> AsyncIterable[ISearchTool]:
+        from app.adapters.search.searxng import SearXNGSearchTool, is_outage as is_search_outage
+        tool = SearXNGSearchTool(
+            base_url=settings.SEARXNG_URL,
+            timeout_sec=settings.SEARCH_DEADLINE_SEC,
+            breaker=breakers.get("search", is_failure=is_search_outage)
+        )
+        yield tool
+        await tool.close()
+
+    @provide
+    async def provide_page_fetcher(self, settings: Settings) -> AsyncIterable[IPageFetcher]:
+        from app.adapters.search.page_fetcher import AiohttpPageFetcher
+        fetcher = AiohttpPageFetcher(
+            timeout_sec=settings.SEARCH_FETCH_TIMEOUT_SEC,
+            max_bytes=settings.SEARCH_FETCH_MAX_BYTES,
+            cache=TTLCache(
+                maxsize=settings.SEARCH_PAGE_CACHE_SIZE,
+                ttl_sec=settings.SEARCH_PAGE_CACHE_TTL_SEC
+            )
+        )
+        yield fetcher
+        await fetcher.close()
\ No newline at end of file
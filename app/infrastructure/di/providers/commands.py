@@ -1,24 +1,25 @@
-from typing import Iterable, List
-from dishka import Provider, Scope, provide
+from typing import Iterable, Optional, Type
+from dishka import Provider, Scope, provide, collect
 
 from app.application.commands.contract import ICommand
 from app.application.commands.registry import CommandRegistry
-
-# Command Implementations
-from app.application.commands.implementations.remember import RememberCommand
-from app.domain.interfaces.repositories.memory import IMemoryRepository
+from app.application.commands.discovery import discover_commands
 
 class CommandsProvider(Provider):
-    scope = Scope.REQUEST
+    """
+    Every command found in app/application/commands/implementations is provided as ICommand
+    and collected into one list for the registry. Commands are stateless, so APP scope:
+    built once, not per request.
+    """
+    scope = Scope.APP
 
-    @provide
-    def provide_remember_command(self, memory_repo: IMemoryRepository) -> RememberCommand:
-        return RememberCommand(memory_repo)
+    def __init__(self, commands: Optional[Iterable[Type[ICommand]]] = None, scope: Optional[Scope] = None):
+        super().__init__(scope=scope)
+        for command in discover_commands() if commands is None else commands:
+            self.provide(command, provides=ICommand)
+
+    commands = collect(ICommand)
 
     @provide
-    def provide_command_registry(self, cmd: RememberCommand) -> CommandRegistry:
-        # If we have multiple commands, we'd request them all here
-        # Dishka doesn't support list collection automatically unless configured, 
-        # so we explicitly list them or use a multi-provider pattern if needed.
-        # For now, explicit is fine.
-        return CommandRegistry(commands=[cmd])
+    def provide_command_registry(self, commands: list[ICommand]) -> CommandRegistry:
+        return CommandRegistry(commands=commands)
@@ -0,0 +1,61 @@
+from dishka import Provider, Scope, decorate
+from app.core.config import Settings
+from app.core.telemetry import Telemetry
+from app.domain.interfaces.llm import ILLMClient
+from app.domain.interfaces.services.embedder import IEmbedder
+from app.domain.interfaces.tools.search import ISearchTool
+from app.domain.interfaces.tools.page_fetcher import IPageFetcher
+from app.domain.interfaces.repositories.chat import IChatRepository
+from app.domain.interfaces.repositories.memory import IMemoryRepository
+from app.domain.interfaces.repositories.user import IUserProfileRepository
+from app.domain.interfaces.repositories.persona import IPersonaRepository
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
+from app.domain.interfaces.repositories.icons import IWaifuIconRepository
+from app.infrastructure.instrumentation import instrument
+
+class InstrumentationProvider(Provider):
+    """
+    Wraps every adapter interface with call metrics at resolve time.
+    Consumers keep depending on the interfaces and never see the difference.
+    """
+    scope = Scope.APP
+
+    @decorate
+    def instrument_llm(self, llm: ILLMClient, telemetry: Telemetry, settings: Settings) -> ILLMClient:
+        return instrument(llm, "llm", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_embedder(self, embedder: IEmbedder, telemetry: Telemetry, settings: Settings) -> IEmbedder:
+        return instrument(embedder, "embedder", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_search_tool(self, tool: ISearchTool, telemetry: Telemetry, settings: Settings) -> ISearchTool:
+        return instrument(tool, "search_tool", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_page_fetcher(self, fetcher: IPageFetcher, telemetry: Telemetry, settings: Settings) -> IPageFetcher:
+        return instrument(fetcher, "page_fetcher", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_chat_repo(self, repo: IChatRepository, telemetry: Telemetry, settings: Settings) -> IChatRepository:
+        return instrument(repo, "chat_repo", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_memory_repo(self, repo: IMemoryRepository, telemetry: Telemetry, settings: Settings) -> IMemoryRepository:
+        return instrument(repo, "memory_repo", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_user_repo(self, repo: IUserProfileRepository, telemetry: Telemetry, settings: Settings) -> IUserProfileRepository:
+        return instrument(repo, "user_repo", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_persona_repo(self, repo: IPersonaRepository, telemetry: Telemetry, settings: Settings) -> IPersonaRepository:
+        return instrument(repo, "persona_repo", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_message_index(self, index: IMessageVectorIndex, telemetry: Telemetry, settings: Settings) -> IMessageVectorIndex:
+        return instrument(index, "message_index", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
+
+    @decorate
+    def instrument_icon_repo(self, repo: IWaifuIconRepository, telemetry: Telemetry, settings: Settings) -> IWaifuIconRepository:
+        return instrument(repo, "icon_repo", telemetry, settings.DEPENDENCY_SLOW_CALL_SEC)
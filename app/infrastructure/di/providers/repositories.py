@@ -1,54 +1,146 @@
-from dishka import Provider, Scope, provide
+from dishka import Provider, Scope, provide, alias
 from qdrant_client import AsyncQdrantClient
 from app.core.config import Settings
+from app.core.versions import ResourceVersions
+from app.core.circuit_breaker import CircuitBreakers
 from app.domain.interfaces.services.embedder import IEmbedder
 from app.domain.interfaces.repositories.chat import IChatRepository
 from app.domain.interfaces.repositories.memory import IMemoryRepository
 from app.domain.interfaces.repositories.user import IUserProfileRepository
 from app.domain.interfaces.repositories.persona import IPersonaRepository
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
 from app.adapters.mongo.repositories.chat import MongoChatRepository
 from app.adapters.mongo.repositories.user import MongoUserProfileRepository
 from app.adapters.mongo.repositories.persona import MongoPersonaRepository
 from app.adapters.qdrant.memory_repository import QdrantMemoryRepository
 from app.adapters.qdrant.initializer import QdrantInitializer
+from app.adapters.qdrant.reindexer import QdrantReindexer
+from app.adapters.qdrant.message_index import QdrantMessageIndex
+from app.adapters.qdrant.vector_size import VectorSizeResolver
+from app.adapters.qdrant.write_journal import WriteJournal
+from app.infrastructure.message_indexer import MessageIndexWorker
+from app.adapters.llm.llm_client import is_outage
+from app.adapters.llm.memory import OpenAIEmbedder
+from app.adapters.llm.model_manager import OllamaModelManager
 
 class RepositoriesProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def provide_user_repo(self) -> IUserProfileRepository:
-        return MongoUserProfileRepository()
+    def provide_user_repo(self, versions: ResourceVersions) -> IUserProfileRepository:
+        return MongoUserProfileRepository(versions)
 
     @provide
-    def provide_persona_repo(self) -> IPersonaRepository:
-        return MongoPersonaRepository()
+    def provide_persona_repo(self, versions: ResourceVersions) -> IPersonaRepository:
+        return MongoPersonaRepository(versions)
 
     @provide
-    def provide_chat_repo(self) -> IChatRepository:
-        return MongoChatRepository()
+    def provide_chat_repo(self, versions: ResourceVersions) -> IChatRepository:
+        return MongoChatRepository(versions)
+
+    @provide
+    def provide_memory_write_journal(self) -> WriteJournal:
+        return WriteJournal()
 
     @provide
     def provide_memory_repo(
         self,
         client: AsyncQdrantClient,
         embedder: IEmbedder,
+        journal: WriteJournal,
         settings: Settings
     ) -> IMemoryRepository:
         return QdrantMemoryRepository(
             client=client,
             embedder=embedder,
-            collection_name=settings.QDRANT_COLLECTION
+            collection_name=settings.QDRANT_COLLECTION,
+            journal=journal
         )
 
+    @provide
+    def provide_vector_sizes(self, settings: Settings) -> VectorSizeResolver:
+        configured = {}
+        if settings.EMBEDDING_VECTOR_SIZE:
+            configured[settings.EMBEDDING_MODEL] = settings.EMBEDDING_VECTOR_SIZE
+        return VectorSizeResolver(configured)
+
     @provide
     def provide_qdrant_initializer(
         self,
         client: AsyncQdrantClient,
         embedder: IEmbedder,
+        vector_sizes: VectorSizeResolver,
         settings: Settings
     ) -> QdrantInitializer:
         return QdrantInitializer(
             client=client,
             embedder=embedder,
-            collection_name=settings.QDRANT_COLLECTION
-        )
\ No newline at end of file
+            collection_name=settings.QDRANT_COLLECTION,
+            vector_sizes=vector_sizes
+        )
+
+    @provide
+    def provide_qdrant_reindexer(
+        self,
+        client: AsyncQdrantClient,
+        embedder: IEmbedder,
+        vector_sizes: VectorSizeResolver,
+        journal: WriteJournal,
+        settings: Settings
+    ) -> QdrantReindexer:
+        # Separate embedder: the live one stays on the old model until the alias flips
+        target_embedder = OpenAIEmbedder(
+            api_key=settings.LLM_API_KEY,
+            base_url=settings.LLM_BASE_URL,
+            model=settings.EMBEDDING_MODEL
+        )
+        return QdrantReindexer(
+            client=client,
+            live_embedder=embedder,
+            target_embedder=target_embedder,
+            alias=settings.QDRANT_COLLECTION,
+            batch_size=settings.QDRANT_REINDEX_BATCH_SIZE,
+            max_points_per_sec=settings.QDRANT_REINDEX_MAX_POINTS_PER_SEC,
+            drop_old=settings.QDRANT_REINDEX_DROP_OLD,
+            vector_sizes=vector_sizes,
+            journal=journal
+        )
+
+
+    @provide
+    def provide_message_index(
+        self,
+        client: AsyncQdrantClient,
+        vector_sizes: VectorSizeResolver,
+        models: OllamaModelManager,
+        breakers: CircuitBreakers,
+        settings: Settings
+    ) -> QdrantMessageIndex:
+        # Own embedder: must not follow the memory collection during a reindex (same backend, same breaker)
+        embedder = OpenAIEmbedder(
+            api_key=settings.LLM_API_KEY,
+            base_url=settings.LLM_BASE_URL,
+            model=settings.EMBEDDING_MODEL,
+            models=models,
+            breaker=breakers.get("embedder", is_failure=is_outage)
+        )
+        return QdrantMessageIndex(
+            client=client,
+            embedder=embedder,
+            collection_name=settings.CHAT_SEARCH_COLLECTION,
+            vector_sizes=vector_sizes
+        )
+
+    message_index = alias(source=QdrantMessageIndex, provides=IMessageVectorIndex)
+
+    @provide
+    def provide_message_index_worker(
+        self,
+        index: QdrantMessageIndex,
+        settings: Settings
+    ) -> MessageIndexWorker:
+        return MessageIndexWorker(
+            index=index,
+            batch_size=settings.CHAT_INDEX_BATCH_SIZE,
+            interval_sec=settings.CHAT_INDEX_INTERVAL_SEC
+        )
@@ -1,27 +1,53 @@
 import boto3
-from typing import Any
+from botocore.config import Config
+from typing import Any, AsyncIterable
 from dishka import Provider, Scope, provide
 from app.core.config import Settings
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
+from app.domain.interfaces.services.image import IImageProcessor
 from app.adapters.s3.repository import S3WaifuIconRepository
+from app.adapters.images.pillow import PillowImageProcessor
+from app.application.services.icon_cache import IconListingCache
 
 class S3Provider(Provider):
     scope = Scope.APP
 
     @provide
     def provide_s3_client(self, settings: Settings) -> Any:
+        # boto3 clients are thread-safe, one pooled client is shared by all executor threads
         return boto3.client(
             's3',
             endpoint_url=settings.S3_ENDPOINT_URL,
             aws_access_key_id=settings.S3_ACCESS_KEY,
             aws_secret_access_key=settings.S3_SECRET_KEY,
-            region_name=settings.S3_REGION_NAME
+            region_name=settings.S3_REGION_NAME,
+            config=Config(
+                max_pool_connections=settings.S3_MAX_CONNECTIONS,
+                connect_timeout=5,
+                read_timeout=30,
+                retries={"max_attempts": 3, "mode": "standard"}
+            )
         )
 
     @provide
-    def provide_icon_repo(self, client: Any, settings: Settings) -> IWaifuIconRepository:
-        return S3WaifuIconRepository(
+    async def provide_icon_repo(self, client: Any, settings: Settings) -> AsyncIterable[IWaifuIconRepository]:
+        repo = S3WaifuIconRepository(
             s3_client=client,
             bucket_name=settings.S3_BUCKET_NAME,
-            endpoint_url=settings.S3_PUBLIC_URL  # Use public URL for browser access
+            endpoint_url=settings.S3_PUBLIC_URL,  # Use public URL for browser access
+            max_workers=settings.S3_MAX_CONNECTIONS,
+            cache_control=settings.ICON_CACHE_CONTROL
         )
+        yield repo
+        repo.close()
+
+    @provide
+    def provide_icon_listing_cache(self, settings: Settings) -> IconListingCache:
+        # Shared by list/upload/delete use cases, so writes invalidate what readers see
+        return IconListingCache(ttl_sec=settings.ICON_LIST_CACHE_TTL_SEC)
+
+    @provide
+    async def provide_image_processor(self, settings: Settings) -> AsyncIterable[IImageProcessor]:
+        processor = PillowImageProcessor(max_workers=settings.ICON_PROCESS_WORKERS)
+        yield processor
+        processor.close()
@@ -1,32 +1,43 @@
+from typing import AsyncIterable
 from dishka import Provider, Scope, provide
 
 from app.core.config import Settings
 from app.domain.interfaces.llm import ILLMClient
 from app.domain.interfaces.tools.search import ISearchTool
+from app.domain.interfaces.tools.page_fetcher import IPageFetcher
+from app.domain.interfaces.services.embedder import IEmbedder
+from app.domain.interfaces.services.image import IImageProcessor
 from app.domain.interfaces.repositories.chat import IChatRepository
 from app.domain.interfaces.repositories.memory import IMemoryRepository
 from app.domain.interfaces.repositories.user import IUserProfileRepository
-from app.domain.interfaces.repositories.user import IUserProfileRepository
 from app.domain.interfaces.repositories.persona import IPersonaRepository
 from app.domain.interfaces.repositories.icons import IWaifuIconRepository
+from app.domain.interfaces.repositories.message_index import IMessageVectorIndex
 from app.application.commands.registry import CommandRegistry
+from app.application.services.web_retrieval import WebRetrievalService
+from app.application.services.generation_scheduler import GenerationScheduler
+from app.application.services.generation_jobs import GenerationJobRegistry
+from app.application.services.degradation import DegradationPolicy
+from app.core.telemetry import Telemetry
 
 # Chat UseCases
-from app.application.usecases.chat.process_message import ProcessMessageUseCase
+from app.application.usecases.chat.process_message import ProcessMessageUseCase, TurnBudgets
 from app.application.usecases.chat.get_history import GetChatHistoryUseCase
 from app.application.usecases.chat.regenerate import RegenerateMessageUseCase
+from app.application.usecases.chat.search import SearchChatUseCase
+from app.application.usecases.chat.search_text import SearchMessagesTextUseCase
 
 # Session UseCases
 from app.application.usecases.session.list_sessions import ListSessionsUseCase
 from app.application.usecases.session.create_session import CreateSessionUseCase
 from app.application.usecases.session.delete_session import DeleteSessionUseCase
 from app.application.usecases.session.update_session import UpdateSessionTitleUseCase
+from app.application.usecases.session.search_sessions import SearchSessionsUseCase
 
 # Settings UseCases
 from app.application.usecases.settings.get_user_profile import GetUserProfileUseCase
 from app.application.usecases.settings.update_user_profile import UpdateUserProfileUseCase
 from app.application.usecases.settings.get_persona import GetWaifuPersonaUseCase
-from app.application.usecases.settings.get_persona import GetWaifuPersonaUseCase
 from app.application.usecases.settings.update_persona import UpdateWaifuPersonaUseCase
 from app.application.usecases.settings.set_persona_icon import SetPersonaIconUseCase
 
@@ -37,6 +48,7 @@ from app.application.usecases.commands.list_commands import ListCommandsUseCase
 from app.application.usecases.icons.upload_icon import UploadIconUseCase
 from app.application.usecases.icons.list_icons import ListIconsUseCase
 from app.application.usecases.icons.delete_icon import DeleteIconUseCase
+from app.application.services.icon_cache import IconListingCache
 
 # Memory UseCases
 from app.application.usecases.memories.list_memories import ListMemoriesUseCase
@@ -44,7 +56,62 @@ from app.application.usecases.memories.delete_memory import DeleteMemoryUseCase
 
 
 class UseCasesProvider(Provider):
-    scope = Scope.REQUEST
+    # Use cases hold no per-request state, only app-scoped adapters: build them once
+    scope = Scope.APP
+
+    @provide
+    def provide_web_retrieval_service(
+        self,
+        search_tool: ISearchTool,
+        llm_client: ILLMClient,
+        page_fetcher: IPageFetcher,
+        embedder: IEmbedder,
+        telemetry: Telemetry,
+        settings: Settings
+    ) -> WebRetrievalService:
+        fetch_pages = settings.SEARCH_FETCH_PAGES
+        return WebRetrievalService(
+            search_tool=search_tool,
+            llm_client=llm_client,
+            model=settings.DEFAULT_MODEL,
+            variants=settings.SEARCH_QUERY_VARIANTS,
+            top_k=settings.SEARCH_TOP_K,
+            deadline_sec=settings.SEARCH_DEADLINE_SEC,
+            page_fetcher=page_fetcher if fetch_pages else None,
+            embedder=embedder if fetch_pages else None,
+            fetch_top_n=settings.SEARCH_FETCH_TOP_N,
+            passages_top_k=settings.SEARCH_PASSAGES_TOP_K,
+            passage_chars=settings.SEARCH_PASSAGE_CHARS,
+            telemetry=telemetry
+        )
+
+    @provide
+    async def provide_generation_scheduler(self, settings: Settings) -> AsyncIterable[GenerationScheduler]:
+        scheduler = GenerationScheduler(idle_sec=settings.CHAT_PREGENERATE_IDLE_SEC)
+        yield scheduler
+        await scheduler.close()
+
+    @provide
+    async def provide_generation_jobs(self, settings: Settings) -> AsyncIterable[GenerationJobRegistry]:
+        jobs = GenerationJobRegistry(
+            ttl_sec=settings.CHAT_STREAM_BUFFER_TTL_SEC,
+            max_jobs=settings.CHAT_STREAM_MAX_JOBS,
+            key_ttl_sec=settings.CHAT_IDEMPOTENCY_TTL_SEC
+        )
+        yield jobs
+        await jobs.close()
+
+    @provide
+    def provide_degradation_policy(self, settings: Settings) -> DegradationPolicy:
+        return DegradationPolicy(
+            enabled=settings.DEGRADE_ENABLED,
+            queue_step=settings.DEGRADE_QUEUE_STEP,
+            ttft_sec=settings.DEGRADE_TTFT_SEC,
+            memory_slow_sec=settings.DEGRADE_MEMORY_SLOW_SEC,
+            search_slow_sec=settings.DEGRADE_SEARCH_SLOW_SEC,
+            max_error_rate=settings.DEGRADE_MAX_ERROR_RATE,
+            window_sec=settings.DEGRADE_WINDOW_SEC
+        )
 
     @provide
     def provide_process_message_use_case(
@@ -55,7 +122,11 @@ class UseCasesProvider(Provider):
         user_repo: IUserProfileRepository,
         persona_repo: IPersonaRepository,
         llm_client: ILLMClient,
-        search_tool: ISearchTool
+        retrieval: WebRetrievalService,
+        telemetry: Telemetry,
+        scheduler: GenerationScheduler,
+        policy: DegradationPolicy,
+        settings: Settings
     ) -> ProcessMessageUseCase:
         return ProcessMessageUseCase(
             registry=registry,
@@ -64,7 +135,17 @@ class UseCasesProvider(Provider):
             user_repo=user_repo,
             persona_repo=persona_repo,
             llm_client=llm_client,
-            search_tool=search_tool
+            retrieval=retrieval,
+            telemetry=telemetry,
+            scheduler=scheduler,
+            alternatives=settings.CHAT_PREGENERATE_ALTERNATIVES,
+            policy=policy,
+            budgets=TurnBudgets(
+                turn=settings.CHAT_TURN_DEADLINE_SEC,
+                context=settings.CHAT_CONTEXT_BUDGET_SEC,
+                memory=settings.CHAT_MEMORY_BUDGET_SEC,
+                llm_stall=settings.CHAT_LLM_STALL_SEC
+            )
         )
 
     @provide
@@ -79,6 +160,23 @@ class UseCasesProvider(Provider):
     ) -> RegenerateMessageUseCase:
         return RegenerateMessageUseCase(chat_repo, process_message_uc)
 
+    @provide
+    def provide_search_chat_use_case(
+        self,
+        index: IMessageVectorIndex,
+        chat_repo: IChatRepository,
+        settings: Settings
+    ) -> SearchChatUseCase:
+        return SearchChatUseCase(index, chat_repo, settings)
+
+    @provide
+    def provide_search_messages_text_use_case(self, chat_repo: IChatRepository) -> SearchMessagesTextUseCase:
+        return SearchMessagesTextUseCase(chat_repo)
+
+    @provide
+    def provide_search_sessions_use_case(self, chat_repo: IChatRepository) -> SearchSessionsUseCase:
+        return SearchSessionsUseCase(chat_repo)
+
     @provide
     def provide_list_sessions_use_case(self, chat_repo: IChatRepository) -> ListSessionsUseCase:
         return ListSessionsUseCase(chat_repo)
@@ -88,8 +186,13 @@ class UseCasesProvider(Provider):
         return CreateSessionUseCase(chat_repo)
 
     @provide
-    def provide_delete_session_use_case(self, chat_repo: IChatRepository) -> DeleteSessionUseCase:
-        return DeleteSessionUseCase(chat_repo)
+    def provide_delete_session_use_case(
+        self,
+        chat_repo: IChatRepository,
+        index: IMessageVectorIndex,
+        settings: Settings
+    ) -> DeleteSessionUseCase:
+        return DeleteSessionUseCase(chat_repo, index if settings.CHAT_SEARCH_ENABLED else None)
 
     @provide
     def provide_update_session_title_use_case(self, chat_repo: IChatRepository) -> UpdateSessionTitleUseCase:
@@ -120,16 +223,33 @@ class UseCasesProvider(Provider):
         return ListCommandsUseCase(registry)
 
     @provide
-    def provide_upload_icon_use_case(self, repo: IWaifuIconRepository) -> UploadIconUseCase:
-        return UploadIconUseCase(repo)
+    def provide_upload_icon_use_case(
+        self,
+        repo: IWaifuIconRepository,
+        image_processor: IImageProcessor,
+        cache: IconListingCache,
+        settings: Settings
+    ) -> UploadIconUseCase:
+        return UploadIconUseCase(
+            repo,
+            image_processor,
+            cache,
+            max_bytes=settings.ICON_MAX_BYTES,
+            thumbnail_sizes=settings.ICON_THUMBNAIL_SIZES
+        )
 
     @provide
-    def provide_list_icons_use_case(self, repo: IWaifuIconRepository) -> ListIconsUseCase:
-        return ListIconsUseCase(repo)
+    def provide_list_icons_use_case(self, repo: IWaifuIconRepository, cache: IconListingCache) -> ListIconsUseCase:
+        return ListIconsUseCase(repo, cache)
 
     @provide
-    def provide_delete_icon_use_case(self, repo: IWaifuIconRepository) -> DeleteIconUseCase:
-        return DeleteIconUseCase(repo)
+    def provide_delete_icon_use_case(
+        self,
+        repo: IWaifuIconRepository,
+        cache: IconListingCache,
+        settings: Settings
+    ) -> DeleteIconUseCase:
+        return DeleteIconUseCase(repo, cache, thumbnail_sizes=settings.ICON_THUMBNAIL_SIZES)
 
     @provide
     def provide_list_memories_use_case(self, repo: IMemoryRepository) -> ListMemoriesUseCase:
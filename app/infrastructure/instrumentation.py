@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Optional
+from app.core.telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+ERROR = "error"
+CANCELLED = "cancelled" # Deadlines cancel on purpose (e.g. search fan-out), not an error
+
+def payload_size(value: Any) -> Optional[int]:
+    """
+    Items for collections and pages, characters for text, bytes for binary. None if not measurable.
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple, dict, set)):
+        return len(value)
+    items = getattr(value, "items", None) # MemoryPage, MessageSearchPage, IconPage
+    if isinstance(items, list):
+        return len(items)
+    return None
+
+def _args_size(args: tuple, kwargs: dict) -> Optional[int]:
+    sizes = [s for s in map(payload_size, (*args, *kwargs.values())) if s is not None]
+    return sum(sizes) if sizes else None
+
+class InstrumentedProxy:
+    """
+    Wraps an adapter behind its interface and measures every async call:
+    count by outcome, latency, argument/result sizes, an OpenTelemetry span, and a warning
+    for slow calls. Streams (async generators) are timed until exhausted; the slow-call
+    check uses the time to the first item, since a long LLM stream is normal.
+
+    Sync methods, properties and attributes pass through untouched.
+    """
+
+    def __init__(self, target: Any, name: str, telemetry: Telemetry, slow_call_sec: float = 1.0):
+        # Stored via __dict__ directly: __getattr__ only runs for missing attributes
+        self.__dict__.update(_target=target, _name=name, _telemetry=telemetry, _slow_call_sec=slow_call_sec)
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._target, attr)
+        if inspect.isasyncgenfunction(value):
+            wrapped = self._wrap_stream(attr, value)
+        elif inspect.iscoroutinefunction(value):
+            wrapped = self._wrap_call(attr, value)
+        else:
+            return value
+
+        # Bound methods don't change, next lookups skip __getattr__
+        self.__dict__[attr] = wrapped
+        return wrapped
+
+    def __repr__(self) -> str:
+        return f"InstrumentedProxy({self._target!r})"
+
+    def _wrap_call(self, method: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            outcome, result = ERROR, None
+            try:
+                with self._telemetry.trace_span(f"{self._name}.{method}"):
+                    result = await fn(*args, **kwargs)
+                outcome = OK
+                return result
+            except asyncio.CancelledError:
+                outcome = CANCELLED
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                self._telemetry.record_call(
+                    self._name, method, elapsed, outcome,
+                    size_in=_args_size(args, kwargs),
+                    size_out=payload_size(result) if outcome == OK else None
+                )
+                self._check_slow(method, elapsed)
+        return call
+
+    def _wrap_stream(self, method: str, fn: Callable[..., AsyncIterator[Any]]) -> Callable[..., AsyncIterator[Any]]:
+        @functools.wraps(fn)
+        async def stream(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            started = time.perf_counter()
+            first_item_sec = None
+            size_out = 0
+            outcome = ERROR
+            try:
+                with self._telemetry.trace_span(f"{self._name}.{method}"):
+                    async for item in fn(*args, **kwargs):
+                        if first_item_sec is None:
+                            first_item_sec = time.perf_counter() - started
+                        size_out += payload_size(item) or 0
+                        yield item
+                outcome = OK
+            except (asyncio.CancelledError, GeneratorExit):
+                # Consumer went away (client disconnect, deadline)
+                outcome = CANCELLED
+                raise
+            finally:
+                self._telemetry.record_call(
+                    self._name, method, time.perf_counter() - started, outcome,
+                    size_in=_args_size(args, kwargs),
+                    size_out=size_out
+                )
+                self._check_slow(f"{method} (first item)", first_item_sec)
+        return stream
+
+    def _check_slow(self, method: str, elapsed: Optional[float]) -> None:
+        if elapsed is not None and elapsed > self._slow_call_sec:
+            logger.warning(f"Slow call: {self._name}.{method} took {elapsed:.2f}s")
+
+def instrument(target: Any, name: str, telemetry: Telemetry, slow_call_sec: float = 1.0) -> Any:
+    """
+    Returns the instrumented proxy, or the target itself when metrics are off (zero overhead).
+    """
+    if not telemetry.enabled:
+        return target
+    return InstrumentedProxy(target, name, telemetry, slow_call_sec)
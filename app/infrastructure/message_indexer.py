@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from beanie.operators import And, Or
+from app.adapters.mongo.models.chat import ChatMessageDoc
+from app.adapters.mongo.models.checkpoint import IndexCheckpointDoc
+from app.adapters.qdrant.message_index import QdrantMessageIndex
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "chat_message_index"
+
+class MessageIndexWorker:
+    """
+    Background loop that feeds persisted chat messages into the message vector index.
+    Progress is stored in Mongo, so restarts continue where they stopped.
+    """
+
+    def __init__(
+        self,
+        index: QdrantMessageIndex,
+        batch_size: int = 64,
+        interval_sec: float = 10.0
+    ):
+        self.index = index
+        self.batch_size = batch_size
+        self.interval_sec = interval_sec
+
+    async def prepare(self) -> None:
+        """
+        Creates (or rebuilds) the index collection. Separate from the loop so startup can gate on it.
+        """
+        if await self.index.ensure_collection():
+            await self._reset_checkpoint()
+
+    async def run_forever(self, prepared: bool = False) -> None:
+        if not prepared:
+            await self.prepare()
+
+        logger.info("Message index worker started")
+        while True:
+            try:
+                indexed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Message indexing batch failed")
+                indexed = 0
+
+            # Full batch means there is a backlog, keep going without sleeping
+            if indexed < self.batch_size:
+                await asyncio.sleep(self.interval_sec)
+
+    async def run_once(self) -> int:
+        checkpoint = await self._load_checkpoint()
+
+        query = ChatMessageDoc.find_all()
+        if checkpoint.last_created_at is not None:
+            # Keyset: strictly after (created_at, uid) of the last indexed message
+            query = ChatMessageDoc.find(Or(
+                ChatMessageDoc.created_at > checkpoint.last_created_at,
+                And(
+                    ChatMessageDoc.created_at == checkpoint.last_created_at,
+                    ChatMessageDoc.uid > checkpoint.last_uid
+                )
+            ))
+
+        docs = await query.sort("+created_at", "+uid").limit(self.batch_size).to_list()
+        if not docs:
+            return 0
+
+        await self.index.index_messages([(doc.session_id, doc.to_entity()) for doc in docs])
+
+        checkpoint.last_created_at = docs[-1].created_at
+        checkpoint.last_uid = docs[-1].uid
+        await checkpoint.save()
+
+        logger.debug(f"Indexed {len(docs)} messages")
+        return len(docs)
+
+    async def _load_checkpoint(self) -> IndexCheckpointDoc:
+        doc = await IndexCheckpointDoc.find_one(IndexCheckpointDoc.name == CHECKPOINT_NAME)
+        if doc:
+            return doc
+        doc = IndexCheckpointDoc(name=CHECKPOINT_NAME)
+        await doc.insert()
+        return doc
+
+    async def _reset_checkpoint(self) -> None:
+        checkpoint = await self._load_checkpoint()
+        checkpoint.last_created_at = None
+        checkpoint.last_uid = None
+        await checkpoint.save()
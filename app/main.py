@@ -1,77 +1,124 @@
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from dishka import AsyncContainer
 from dishka.integrations.fastapi import setup_dishka
 from app.infrastructure.di.container import make_container
 from app.infrastructure.bootstrap import AppBootstrapper
 from app.core.config import settings
+from app.adapters.api.serialization import FastJSONResponse
 
 # Import all document models for Beanie initialization
 from app.adapters.mongo.models import ALL_DOCUMENT_MODELS
 
 # Import Routers
-from app.adapters.api.routers import chat, sessions, settings as settings_router, commands, icons, memories
+from app.adapters.api.routers import chat, sessions, settings as settings_router, commands, icons, memories, metrics, health
 
 from app.adapters.qdrant.initializer import QdrantInitializer
+from app.adapters.qdrant.reindexer import QdrantReindexer
+from app.infrastructure.message_indexer import MessageIndexWorker
+from app.adapters.llm.model_manager import OllamaModelManager
+from app.core.startup import StartupError, StartupOrchestrator, StartupStep
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize container globally so it can be used in lifespan and setup_dishka
-container = make_container()
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # --- 1. Infrastructure Initialization ---
-    # Container is already created globally
-    
-    async with container() as request_container:
-        # Resolve dependencies needed for initialization
-        mongo_client = await request_container.get(AsyncIOMotorClient)
-        qdrant_initializer = await request_container.get(QdrantInitializer)
-        
-        # We need repos for bootstrapping
-        from app.domain.interfaces.repositories.user import IUserProfileRepository
-        from app.domain.interfaces.repositories.persona import IPersonaRepository
-        
-        user_repo = await request_container.get(IUserProfileRepository)
-        persona_repo = await request_container.get(IPersonaRepository)
-        bootstrapper = AppBootstrapper(user_repo, persona_repo)
+    # Container is attached to the app by setup_dishka
+    container: AsyncContainer = app.state.dishka_container
+    startup = await container.get(StartupOrchestrator)
+
+    # Steps resolve their dependencies lazily: nothing is built for a step that doesn't run.
+    # Independent steps run concurrently, see /health/ready for their state.
 
-        # --- 2. Database (Beanie) ---
-        logger.info("Initializing Beanie (MongoDB)...")
+    # --- Database (Beanie) ---
+    async def init_mongo():
+        mongo_client = await container.get(AsyncIOMotorClient)
         await init_beanie(
             database=mongo_client[settings.DB_NAME],
             document_models=ALL_DOCUMENT_MODELS
         )
-        
-        # --- 3. Vector DB (Qdrant) ---
-        logger.info("Initializing Qdrant...")
-        await qdrant_initializer.run()
-        
-        # --- 4. Application Bootstrap ---
+
+    # --- Application Bootstrap (default profile and persona) ---
+    async def bootstrap():
+        from app.domain.interfaces.repositories.user import IUserProfileRepository
+        from app.domain.interfaces.repositories.persona import IPersonaRepository
+
+        bootstrapper = AppBootstrapper(
+            await container.get(IUserProfileRepository),
+            await container.get(IPersonaRepository)
+        )
         await bootstrapper.run()
-    
-    yield
-    
-    # --- Cleanup ---
-    await container.close()
 
-def create_app() -> FastAPI:
+    # --- Vector DB (Qdrant) ---
+    # Needs Mongo only for the cached vector size. Non-critical: chat works without memories
+    async def init_qdrant():
+        qdrant_initializer = await container.get(QdrantInitializer)
+        if await qdrant_initializer.run():
+            # Old collection keeps serving while the new one is being built
+            logger.info("Starting background Qdrant reindex...")
+            startup.spawn(_run_reindex(container), name="qdrant-reindex")
+
+    # --- Chat Search Indexer (opt-in) ---
+    async def init_chat_index():
+        index_worker = await container.get(MessageIndexWorker)
+        await index_worker.prepare()
+        startup.spawn(index_worker.run_forever(prepared=True), name="chat-index")
+
+    # --- LLM models (Ollama) ---
+    # Loads chat + embedding models so the first turn doesn't wait for them. Non-critical:
+    # without it the first request just pays the load time
+    async def init_models():
+        models = await container.get(OllamaModelManager)
+        if models.enabled:
+            await models.start()
+        if models.enabled:
+            startup.spawn(models.run_forever(), name="llm-keep-alive")
+
+    startup.add(StartupStep(name="mongo", run=init_mongo))
+    startup.add(StartupStep(name="bootstrap", run=bootstrap, requires=("mongo",)))
+    startup.add(StartupStep(name="qdrant", run=init_qdrant, requires=("mongo",), critical=False))
+    startup.add(StartupStep(name="llm_models", run=init_models, critical=False))
+    if settings.CHAT_SEARCH_ENABLED:
+        startup.add(StartupStep(name="chat_index", run=init_chat_index, requires=("mongo",), critical=False))
+
+    # The server accepts connections only after this returns: critical steps gate the boot
+    try:
+        await startup.start()
+    except StartupError:
+        await startup.shutdown()
+        await container.close()
+        raise
+
+    try:
+        yield
+    finally:
+        # --- Cleanup ---
+        await startup.shutdown()
+        await container.close()
+
+async def _run_reindex(container: AsyncContainer) -> None:
+    qdrant_reindexer = await container.get(QdrantReindexer)
+    await qdrant_reindexer.run()
+
+def create_app(container: Optional[AsyncContainer] = None) -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse
     )
     
     # Setup Dishka (Dependency Injection)
     # Must be called here to add middleware before app starts
-    setup_dishka(container, app)
+    setup_dishka(container or make_container(), app)
     
     # CORS
     app.add_middleware(
@@ -80,6 +127,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[chat.MESSAGE_ID_HEADER, chat.STATUS_HEADER],
     )
     
     # Include Routers
@@ -89,6 +137,8 @@ def create_app() -> FastAPI:
     app.include_router(commands.router)
     app.include_router(icons.router)
     app.include_router(memories.router)
+    app.include_router(metrics.router)
+    app.include_router(health.router)
     
     return app
 
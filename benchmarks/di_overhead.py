@@ -0,0 +1,98 @@
+"""
+Per-request DI overhead: entering a request scope and resolving what a route needs.
+
+Compares the previous graph (use cases and commands in Scope.REQUEST, rebuilt on every
+HTTP call) with the current one (Scope.APP, built once). Log records emitted while
+resolving are counted and formatted like the default handler would, since the registry
+used to log its command map on every request.
+
+Usage:
+    python -m benchmarks.di_overhead [--requests 20000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import List, Type
+
+from dishka import AsyncContainer, Scope, make_async_container
+
+from app.infrastructure.di.providers.adapters import AdaptersProvider
+from app.infrastructure.di.providers.repositories import RepositoriesProvider
+from app.infrastructure.di.providers.usecases import UseCasesProvider
+from app.infrastructure.di.providers.commands import CommandsProvider
+from app.infrastructure.di.providers.s3 import S3Provider
+from app.infrastructure.di.providers.instrumentation import InstrumentationProvider
+from app.application.usecases.chat.process_message import ProcessMessageUseCase
+from app.application.usecases.chat.regenerate import RegenerateMessageUseCase
+from app.application.usecases.session.list_sessions import ListSessionsUseCase
+from app.application.usecases.memories.list_memories import ListMemoriesUseCase
+from benchmarks.fakes import FakeInfraProvider
+
+# What the hot routes resolve: /chat/stream, /chat/regenerate, /sessions, /memories
+ROUTES: List[Type] = [ProcessMessageUseCase, RegenerateMessageUseCase, ListSessionsUseCase, ListMemoriesUseCase]
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        self.records = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        self.records += 1
+
+def make_graph(per_request: bool) -> AsyncContainer:
+    scope = Scope.REQUEST if per_request else None
+    return make_async_container(
+        AdaptersProvider(),
+        RepositoriesProvider(),
+        UseCasesProvider(scope=scope),
+        CommandsProvider(scope=scope),
+        S3Provider(),
+        FakeInfraProvider(),
+        InstrumentationProvider()
+    )
+
+async def measure(per_request: bool, requests: int, handler: CountingHandler) -> dict:
+    container = make_graph(per_request)
+    # Warm up: APP-scoped adapters are built on first use in both graphs
+    for dep in ROUTES:
+        async with container() as request_container:
+            await request_container.get(dep)
+
+    results = {}
+    for dep in ROUTES:
+        handler.records = 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            async with container() as request_container:
+                await request_container.get(dep)
+        elapsed = time.perf_counter() - started
+        results[dep.__name__] = (elapsed / requests * 1e6, handler.records / requests)
+
+    await container.close()
+    return results
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
+    legacy = await measure(per_request=True, requests=args.requests, handler=handler)
+    current = await measure(per_request=False, requests=args.requests, handler=handler)
+
+    print(f"{'Route dependency':<28} {'REQUEST scope':>16} {'APP scope':>16} {'Speedup':>8}")
+    for name, (legacy_us, legacy_logs) in legacy.items():
+        current_us, current_logs = current[name]
+        print(
+            f"{name:<28} {legacy_us:9.1f} us {legacy_logs:3.0f}L "
+            f"{current_us:9.1f} us {current_logs:3.0f}L {legacy_us / current_us:7.1f}x"
+        )
+    print("L = log records per request")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+"""
+Per-turn domain object churn: what one chat turn allocates on the read side.
+
+One turn hydrates the context window, a history page and the recalled memories,
+then creates the two new messages. Compares the previous entity layout
+(plain dataclass with a per-instance __dict__) with the slotted entities.
+
+Also times construction with and without stored uid/created_at: the dataclass
+__init__ only calls default factories for missing values, so hydration from the DB
+does not pay for uuid4()/now().
+
+Usage:
+    python -m benchmarks.entity_churn [--turns 2000] [--history 50] [--context 20] [--memories 5]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from app.domain.entities.chat import Message, MessageRole
+from app.domain.entities.memory import MemoryFragment
+
+# --- Previous layout, kept here only as the baseline ---
+
+@dataclass(kw_only=True)
+class LegacyEntityBase:
+    uid: str = field(default_factory=lambda: str(uuid.uuid4()))
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+@dataclass(kw_only=True)
+class LegacyMessage(LegacyEntityBase):
+    role: MessageRole
+    content: str
+    referenced_memory_ids: List[str] = field(default_factory=list)
+    token_count: Optional[int] = None
+
+@dataclass(kw_only=True)
+class LegacyMemoryFragment(LegacyEntityBase):
+    content: str
+    vector_id: Optional[str] = None
+    importance: float = 0.5
+    tags: List[str] = field(default_factory=list)
+
+# --- Stored rows, as they come out of Mongo / Qdrant ---
+
+def make_rows(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "uid": str(uuid.uuid4()),
+            "created_at": now,
+            "role": MessageRole.USER if i % 2 else MessageRole.ASSISTANT,
+            "content": f"message {i} " * 20,
+            "referenced_memory_ids": [],
+            "token_count": 42,
+        }
+        for i in range(count)
+    ]
+
+def make_memory_rows(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "uid": str(uuid.uuid4()),
+            "created_at": now,
+            "content": f"memory {i}",
+            "vector_id": str(uuid.uuid4()),
+            "importance": 0.7,
+            "tags": ["fact"],
+        }
+        for i in range(count)
+    ]
+
+def legacy_turn(history: List[dict], context: List[dict], memories: List[dict]) -> list:
+    objs = [LegacyMessage(**row) for row in history]
+    objs += [LegacyMessage(**row) for row in context]
+    objs += [LegacyMemoryFragment(**row) for row in memories]
+    objs.append(LegacyMessage(role=MessageRole.USER, content="hi"))
+    objs.append(LegacyMessage(role=MessageRole.ASSISTANT, content="hello"))
+    return objs
+
+def slotted_turn(history: List[dict], context: List[dict], memories: List[dict]) -> list:
+    objs = [Message(**row) for row in history]
+    objs += [Message(**row) for row in context]
+    objs += [MemoryFragment(**row) for row in memories]
+    objs.append(Message(role=MessageRole.USER, content="hi"))
+    objs.append(Message(role=MessageRole.ASSISTANT, content="hello"))
+    return objs
+
+def time_turns(turn: Callable[..., list], turns: int, *rows: List[dict]) -> float:
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(turns):
+        turn(*rows)
+    return (time.perf_counter() - started) / turns
+
+def time_construct(factory: Callable[[dict], object], rows: List[dict]) -> float:
+    gc.collect()
+    started = time.perf_counter()
+    for row in rows:
+        factory(row)
+    return (time.perf_counter() - started) / len(rows)
+
+def retained_bytes(factory: Callable[[dict], object], rows: List[dict]) -> float:
+    """
+    Bytes per object kept alive, e.g. in a ring buffer or a cached history page.
+    Field values are shared with the rows, so this is the object overhead itself.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(kept)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=50, help="Messages in a history page")
+    parser.add_argument("--context", type=int, default=20, help="Messages in the LLM context window")
+    parser.add_argument("--memories", type=int, default=5, help="Recalled memory fragments")
+    args = parser.parse_args()
+
+    history = make_rows(args.history)
+    context = make_rows(args.context)
+    memories = make_memory_rows(args.memories)
+
+    legacy = time_turns(legacy_turn, args.turns, history, context, memories)
+    slotted = time_turns(slotted_turn, args.turns, history, context, memories)
+
+    rows = make_rows(10_000)
+    legacy_mem = retained_bytes(lambda row: LegacyMessage(**row), rows)
+    slotted_mem = retained_bytes(lambda row: Message(**row), rows)
+
+    fresh_rows = [{"role": row["role"], "content": row["content"]} for row in rows]
+    hydrated = time_construct(lambda row: Message(**row), rows)
+    fresh = time_construct(lambda row: Message(**row), fresh_rows)
+
+    objects = args.history + args.context + args.memories + 2
+    print(f"Objects per turn:       {objects}")
+    print(f"Legacy dataclass:       {legacy * 1e6:8.1f} us/turn   {legacy_mem:6.0f} B/message")
+    print(f"Slotted dataclass:      {slotted * 1e6:8.1f} us/turn   {slotted_mem:6.0f} B/message")
+    print(f"Speedup: {legacy / slotted:.2f}x, memory: {slotted_mem / legacy_mem:.0%} of legacy")
+    print(f"Message from storage:   {hydrated * 1e6:8.2f} us (uid/created_at given, no factories)")
+    print(f"New Message:            {fresh * 1e6:8.2f} us (uuid4() + now())")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+In-process stand-ins for everything the backend talks to, so load runs need no Docker:
+
+- StubOpenAIServer: OpenAI-compatible /v1/chat/completions (SSE streaming) and /v1/embeddings
+- StubSearXNGServer: /search?format=json
+- FakeInfraProvider: dishka overrides for mongomock (Mongo) and Qdrant local mode (":memory:")
+
+The stubs are real HTTP servers on 127.0.0.1, so the app's own clients (openai, aiohttp)
+run unchanged. Mongo and Qdrant are in-memory: numbers show the app's overhead
+(DI, pipeline, serialization), not database performance.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import struct
+from typing import List, Optional
+
+from aiohttp import web
+from dishka import Provider, Scope, provide
+from motor.motor_asyncio import AsyncIOMotorClient
+from qdrant_client import AsyncQdrantClient
+
+class _StubServer:
+    def __init__(self):
+        self.app = web.Application()
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+class StubOpenAIServer(_StubServer):
+    """
+    Streams 'tokens' words per completion: 'first_token_ms' before the first one,
+    then 'token_ms' between tokens. Embeddings are deterministic per text.
+    """
+
+    def __init__(self, tokens: int = 64, first_token_ms: float = 50.0, token_ms: float = 10.0, dim: int = 64):
+        super().__init__()
+        self.tokens = tokens
+        self.first_token_ms = first_token_ms
+        self.token_ms = token_ms
+        self.dim = dim
+        self.app.router.add_post("/v1/chat/completions", self._completions)
+        self.app.router.add_post("/v1/embeddings", self._embeddings)
+
+    async def _completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        model = body.get("model", "stub")
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for i in range(self.tokens):
+            if i:
+                await asyncio.sleep(self.token_ms / 1000)
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]
+            }
+            await resp.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha1(text.encode()).digest())
+        vec = [rng.uniform(-1, 1) for _ in range(self.dim)]
+        norm = math.sqrt(sum(v * v for v in vec))
+        return [v / norm for v in vec]
+
+    async def _embeddings(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        as_base64 = body.get("encoding_format") == "base64" # The openai SDK asks for base64 by default
+
+        data = []
+        for idx, text in enumerate(inputs):
+            vec = self._vector(text)
+            embedding = base64.b64encode(struct.pack(f"<{len(vec)}f", *vec)).decode() if as_base64 else vec
+            data.append({"object": "embedding", "index": idx, "embedding": embedding})
+
+        return web.json_response({
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+        })
+
+class StubSearXNGServer(_StubServer):
+    def __init__(self, results: int = 8, latency_ms: float = 30.0):
+        super().__init__()
+        self.results = results
+        self.latency_ms = latency_ms
+        self.app.router.add_get("/search", self._search)
+
+    async def _search(self, request: web.Request) -> web.Response:
+        query = request.query.get("q", "")
+        await asyncio.sleep(self.latency_ms / 1000)
+        return web.json_response({
+            "query": query,
+            "results": [
+                {
+                    "title": f"{query} result {i}",
+                    "url": f"https://example{i}.test/{hashlib.sha1(query.encode()).hexdigest()[:8]}",
+                    "content": f"Snippet {i} about {query}. " * 4,
+                    "score": 1.0 / (i + 1)
+                }
+                for i in range(self.results)
+            ]
+        })
+
+def _patch_mongomock() -> None:
+    # beanie passes kwargs that mongomock's list_collection_names doesn't accept
+    import mongomock
+    original = mongomock.database.Database.list_collection_names
+    if getattr(original, "_wfai_patched", False):
+        return
+
+    def list_collection_names(self, filter=None, session=None, **kwargs):
+        return original(self, filter, session)
+
+    list_collection_names._wfai_patched = True
+    mongomock.database.Database.list_collection_names = list_collection_names
+
+class FakeInfraProvider(Provider):
+    """
+    Pass to make_container(): replaces the Mongo and Qdrant clients with in-memory ones.
+    """
+    scope = Scope.APP
+
+    @provide
+    def provide_mongo_client(self) -> AsyncIOMotorClient:
+        from mongomock_motor import AsyncMongoMockClient # Dev-only dependency
+        _patch_mongomock()
+        return AsyncMongoMockClient()
+
+    @provide
+    def provide_qdrant_client(self) -> AsyncQdrantClient:
+        return AsyncQdrantClient(location=":memory:")
@@ -0,0 +1,282 @@
+"""
+End-to-end load harness: the real app (uvicorn, in-process) against in-process fakes.
+
+Scenarios:
+    sessions         GET /sessions
+    memories         GET /memories
+    chat_stream      POST /chat/stream
+    chat_search      POST /chat/stream with use_search
+    regenerate       POST /chat/regenerate
+
+Reports latency p50/p90/p99, TTFT (first LLM token seen by the client), tokens/sec and
+throughput per scenario as JSON.
+
+Usage:
+    python -m benchmarks.load [--requests 200] [--concurrency 16] [--scenarios chat_stream,sessions]
+                              [--tokens 64] [--first-token-ms 50] [--token-ms 10] [--out results.json]
+
+Needs the dev-only mongomock-motor package on top of the app requirements.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from benchmarks.fakes import StubOpenAIServer, StubSearXNGServer, FakeInfraProvider
+
+SCENARIOS = ["sessions", "memories", "chat_stream", "chat_search", "regenerate"]
+# Status lines the pipeline streams before the LLM answer (search mode)
+STATUS_PREFIXES = ("*(", "\n*(")
+
+@dataclass
+class Sample:
+    ok: bool
+    latency: float
+    ttft: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "p50": pct(50) * 1000,
+        "p90": pct(90) * 1000,
+        "p99": pct(99) * 1000,
+        "max": ordered[-1] * 1000,
+        "mean": statistics.fmean(ordered) * 1000
+    }
+
+class LoadRunner:
+    def __init__(self, http: aiohttp.ClientSession, llm: StubOpenAIServer):
+        self.http = http
+        self.llm = llm
+
+    async def run(self, name: str, requests: int, concurrency: int) -> dict:
+        setup, request = getattr(self, f"_setup_{name}", None), getattr(self, f"_req_{name}")
+        states = [await setup() if setup else None for _ in range(concurrency)]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+        samples: List[Sample] = []
+
+        async def worker(state) -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                try:
+                    samples.append(await request(state))
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    samples.append(Sample(ok=False, latency=0.0))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(state) for state in states))
+        duration = time.perf_counter() - started
+
+        ok = [s for s in samples if s.ok]
+        result = {
+            "requests": len(samples),
+            "errors": len(samples) - len(ok),
+            "concurrency": concurrency,
+            "duration_sec": duration,
+            "throughput_rps": len(ok) / duration if duration else 0.0,
+            "latency_ms": percentiles([s.latency for s in ok])
+        }
+        ttfts = [s.ttft for s in ok if s.ttft is not None]
+        if ttfts:
+            result["ttft_ms"] = percentiles(ttfts)
+            rates = [s.tokens_per_sec for s in ok if s.tokens_per_sec]
+            result["tokens_per_sec"] = {"p50": statistics.median(rates), "min": min(rates)} if rates else {}
+        return result
+
+    # --- Helpers ---
+
+    async def _new_session(self) -> str:
+        async with self.http.post("/sessions", json={"title": f"bench {uuid.uuid4().hex[:6]}"}) as resp:
+            return (await resp.json())["uid"]
+
+    async def _timed_get(self, path: str) -> Sample:
+        started = time.perf_counter()
+        async with self.http.get(path) as resp:
+            await resp.read()
+            return Sample(ok=resp.status == 200, latency=time.perf_counter() - started)
+
+    async def _timed_stream(self, path: str, payload: dict) -> Sample:
+        started = time.perf_counter()
+        first_token = None
+        async with self.http.post(path, json=payload) as resp:
+            async for chunk in resp.content.iter_any():
+                if first_token is None and not chunk.decode(errors="ignore").startswith(STATUS_PREFIXES):
+                    first_token = time.perf_counter()
+            ended = time.perf_counter()
+            ok = resp.status == 200 and first_token is not None
+
+        rate = None
+        if ok and ended > first_token:
+            # The stub emits a known number of tokens, chunks may be coalesced on the wire
+            rate = (self.llm.tokens - 1) / (ended - first_token)
+        return Sample(
+            ok=ok,
+            latency=ended - started,
+            ttft=(first_token - started) if first_token else None,
+            tokens_per_sec=rate
+        )
+
+    # --- Scenarios ---
+
+    async def _req_sessions(self, _) -> Sample:
+        return await self._timed_get("/sessions?limit=20")
+
+    async def _req_memories(self, _) -> Sample:
+        return await self._timed_get("/memories?limit=50")
+
+    async def _setup_chat_stream(self) -> str:
+        return await self._new_session()
+
+    async def _req_chat_stream(self, session_id: str) -> Sample:
+        return await self._timed_stream("/chat/stream", {"message": "Tell me something nice", "session_id": session_id})
+
+    _setup_chat_search = _setup_chat_stream
+
+    async def _req_chat_search(self, session_id: str) -> Sample:
+        return await self._timed_stream(
+            "/chat/stream",
+            {"message": "latest news about cats", "session_id": session_id, "use_search": True}
+        )
+
+    async def _setup_regenerate(self) -> str:
+        session_id = await self._new_session()
+        await self._timed_stream("/chat/stream", {"message": "Say hi", "session_id": session_id})
+        return session_id
+
+    async def _req_regenerate(self, session_id: str) -> Sample:
+        return await self._timed_stream("/chat/regenerate", {"session_id": session_id})
+
+async def _seed(app, sessions: int, memories: int) -> None:
+    from app.domain.entities.chat import DialogSession
+    from app.domain.entities.memory import MemoryFragment
+    from app.domain.interfaces.repositories.chat import IChatRepository
+    from app.domain.interfaces.repositories.memory import IMemoryRepository
+
+    container = app.state.dishka_container
+    chat_repo = await container.get(IChatRepository)
+    memory_repo = await container.get(IMemoryRepository)
+    for i in range(sessions):
+        await chat_repo.create_session(DialogSession(title=f"Seed session {i}"))
+    for i in range(memories):
+        await memory_repo.add_fragment(MemoryFragment(content=f"User fact number {i}", tags=["fact"], importance=0.5))
+
+async def _wait_fully_ready(http: aiohttp.ClientSession, timeout_sec: float = 30.0) -> None:
+    # Qdrant setup finishes in background after the server starts accepting requests
+    deadline = time.perf_counter() + timeout_sec
+    while time.perf_counter() < deadline:
+        async with http.get("/health/ready") as resp:
+            report = await resp.json()
+        if resp.status == 200 and not report["degraded"]:
+            return
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"App not ready: {report}")
+
+async def _serve(app) -> tuple:
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result() # Startup failed: surface the error
+        await asyncio.sleep(0.05)
+    return server, task, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+async def main(args: argparse.Namespace) -> dict:
+    llm = StubOpenAIServer(tokens=args.tokens, first_token_ms=args.first_token_ms, token_ms=args.token_ms)
+    searx = StubSearXNGServer(latency_ms=args.search_ms)
+    await llm.start()
+    await searx.start()
+
+    # Settings are read from the environment when the app modules are imported
+    os.environ.update({
+        "LLM_BASE_URL": f"{llm.url}/v1",
+        "SEARXNG_URL": searx.url,
+        "CHAT_SEARCH_ENABLED": "false",
+        "METRICS_ENABLED": "true" if args.metrics else "false",
+    })
+    from app.main import create_app
+    from app.infrastructure.di.container import make_container
+
+    app = create_app(make_container(FakeInfraProvider()))
+    server, task, base_url = await _serve(app)
+
+    try:
+        timeout = aiohttp.ClientTimeout(total=120)
+        connector = aiohttp.TCPConnector(limit=args.concurrency * 2)
+        async with aiohttp.ClientSession(base_url, timeout=timeout, connector=connector) as http:
+            await _wait_fully_ready(http)
+            await _seed(app, sessions=args.seed_sessions, memories=args.seed_memories)
+            runner = LoadRunner(http, llm)
+            results = {}
+            for name in args.scenarios:
+                print(f"Running {name}...", file=sys.stderr)
+                results[name] = await runner.run(name, args.requests, args.concurrency)
+    finally:
+        server.should_exit = True
+        await task
+        await llm.stop()
+        await searx.stop()
+
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "stub_tokens": args.tokens,
+            "stub_first_token_ms": args.first_token_ms,
+            "stub_token_ms": args.token_ms,
+            "stub_search_ms": args.search_ms,
+            "metrics": args.metrics
+        },
+        "scenarios": results
+    }
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=SCENARIOS)
+    parser.add_argument("--tokens", type=int, default=64, help="Tokens per stub completion")
+    parser.add_argument("--first-token-ms", type=float, default=50.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--search-ms", type=float, default=30.0, help="Stub SearXNG latency")
+    parser.add_argument("--seed-sessions", type=int, default=50)
+    parser.add_argument("--seed-memories", type=int, default=200)
+    parser.add_argument("--no-metrics", dest="metrics", action="store_false", help="Run with METRICS_ENABLED=false")
+    parser.add_argument("--out", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = json.dumps(asyncio.run(main(args)), indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report)
+    else:
+        print(report)
@@ -54,18 +54,31 @@ export const fetchCommands = async () => {
     return res.json();
 };
 
+/**
+ * Fetches all icon URLs, following next_cursor page by page.
+ * The listing is served with an ETag, so repeated calls are cheap 304 revalidations.
+ */
 export const fetchIcons = async () => {
-    const res = await fetch('/api/icons');
-    if (!res.ok) throw new Error("Failed to fetch icons");
-    return res.json();
+    const icons = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: '200' });
+        if (cursor) params.set('cursor', cursor);
+        const res = await fetch(`/api/icons?${params}`);
+        if (!res.ok) throw new Error("Failed to fetch icons");
+        const page = await res.json();
+        icons.push(...page.items);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return icons;
 };
 
 export const uploadIcon = async (file) => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const res = await fetch('/api/icons', {
-        method: 'POST',
-        body: formData
+    // Raw body: the backend reads it as it arrives instead of spooling a multipart form
+    const res = await fetch(`/api/icons/${encodeURIComponent(file.name)}`, {
+        method: 'PUT',
+        headers: { 'Content-Type': file.type },
+        body: file
     });
     if (!res.ok) {
         const error = await res.json();
@@ -74,6 +87,20 @@ export const uploadIcon = async (file) => {
     return res.json();
 };
 
+/**
+ * URL of a generated WebP thumbnail for an uploaded icon.
+ * Mirrors the backend key scheme: <bucket>/name.png -> <bucket>/thumbs/name_<size>.webp
+ * Old icons may have no thumbnails, so use it with an onError fallback to the original.
+ */
+export const thumbnailUrl = (url, size = 128) => {
+    if (!url) return url;
+    const slash = url.lastIndexOf('/');
+    const name = url.slice(slash + 1);
+    const dot = name.lastIndexOf('.');
+    const stem = dot > 0 ? name.slice(0, dot) : name;
+    return `${url.slice(0, slash)}/thumbs/${stem}_${size}.webp`;
+};
+
 export const deleteIcon = async (filename) => {
     const res = await fetch(`/api/icons/${filename}`, {
         method: 'DELETE'
@@ -91,6 +118,48 @@ export const setPersonaIcon = async (iconFilename) => {
     return res.json();
 };
 
+/**
+ * Reads a reply stream and yields text chunks as they arrive.
+ * If the connection drops mid-reply, reattaches to the same server-side generation
+ * (X-Message-Id) from the last byte received instead of starting over.
+ */
+async function* readReplyStream(res, maxRetries = 5) {
+    const messageId = res.headers.get('X-Message-Id');
+    // One decoder across reconnects: a multi-byte character split by the drop still decodes
+    const decoder = new TextDecoder('utf-8');
+    let received = 0;
+    let attempt = 0;
+
+    while (true) {
+        try {
+            const reader = res.body.getReader();
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) return;
+                received += value.length;
+                attempt = 0;
+                yield decoder.decode(value, { stream: true });
+            }
+        } catch (e) {
+            if (!messageId || attempt >= maxRetries) throw e;
+        }
+
+        // Reconnect with backoff; the generation kept running meanwhile
+        while (true) {
+            attempt += 1;
+            await new Promise(resolve => setTimeout(resolve, 500 * attempt));
+            try {
+                res = await fetch(`/api/chat/stream/${messageId}?offset=${received}`);
+            } catch (e) {
+                if (attempt >= maxRetries) throw e;
+                continue;
+            }
+            if (!res.ok) throw new Error('Reply stream expired');
+            break;
+        }
+    }
+}
+
 /**
  * Streams chat response from backend.
  * Yields text chunks as they arrive.
@@ -102,20 +171,15 @@ export async function* streamChat(sessionId, message, useSearch = false) {
         body: JSON.stringify({
             session_id: sessionId,
             message,
-            use_search: useSearch
+            use_search: useSearch,
+            // Retries of this send get the same reply; randomUUID needs a secure context
+            idempotency_key: crypto.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`
         }),
     });
 
     if (!res.ok) throw new Error('Chat stream failed');
 
-    const reader = res.body.getReader();
-    const decoder = new TextDecoder('utf-8');
-
-    while (true) {
-        const { value, done } = await reader.read();
-        if (done) break;
-        yield decoder.decode(value, { stream: true });
-    }
+    yield* readReplyStream(res);
 }
 
 export async function* regenerateChat(sessionId, useSearch = false) {
@@ -130,14 +194,7 @@ export async function* regenerateChat(sessionId, useSearch = false) {
 
     if (!res.ok) throw new Error('Regeneration failed');
 
-    const reader = res.body.getReader();
-    const decoder = new TextDecoder();
-
-    while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-        yield decoder.decode(value, { stream: true });
-    }
+    yield* readReplyStream(res);
 }
 
 // --- SETTINGS ---
@@ -174,8 +231,17 @@ export const updateWaifuPersona = async (data) => {
 };
 
 // --- MEMORIES ---
-export const fetchMemories = async (limit = 100) => {
-    const res = await fetch(`/api/memories?limit=${limit}`);
+/**
+ * Returns one page: { items, next_cursor }.
+ * Pass next_cursor back as `cursor` to load the next page.
+ */
+export const fetchMemories = async ({ limit = 50, cursor = null, tags = [], sortBy = null } = {}) => {
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.append('cursor', cursor);
+    if (sortBy) params.append('sort_by', sortBy);
+    tags.forEach(tag => params.append('tags', tag));
+
+    const res = await fetch(`/api/memories?${params}`);
     if (!res.ok) throw new Error('Failed to fetch memories');
     return res.json();
 };
@@ -18,7 +18,12 @@ export function MessageBubble({ message, isLast }) {
             {isAi && (
                 <div className="w-8 h-8 rounded-full bg-gradient-to-br from-indigo-500 to-purple-600 flex items-center justify-center shrink-0 shadow-lg shadow-indigo-500/20 overflow-hidden">
                     {personaIconUrl ? (
-                        <img src={personaIconUrl} alt="Waifu" className="w-full h-full object-cover" />
+                        <img
+                            src={api.thumbnailUrl(personaIconUrl, 64)}
+                            onError={(e) => { if (e.currentTarget.src !== personaIconUrl) e.currentTarget.src = personaIconUrl; }}
+                            alt="Waifu"
+                            className="w-full h-full object-cover"
+                        />
                     ) : (
                         <Bot size={16} className="text-white" />
                     )}
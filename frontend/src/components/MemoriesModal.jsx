@@ -6,15 +6,21 @@ export default function MemoriesModal({ onClose }) {
     const [memories, setMemories] = useState([]);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState(null);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
+    const [sortBy, setSortBy] = useState(null);
 
     useEffect(() => {
         loadMemories();
-    }, []);
+    }, [sortBy]);
 
     const loadMemories = async () => {
+        setIsLoading(true);
+        setError(null);
         try {
-            const data = await api.fetchMemories();
-            setMemories(data);
+            const data = await api.fetchMemories({ sortBy });
+            setMemories(data.items);
+            setNextCursor(data.next_cursor);
         } catch (e) {
             console.error(e);
             setError("Failed to load memories.");
@@ -23,6 +29,21 @@ export default function MemoriesModal({ onClose }) {
         }
     };
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setIsLoadingMore(true);
+        try {
+            const data = await api.fetchMemories({ cursor: nextCursor, sortBy });
+            setMemories(prev => [...prev, ...data.items]);
+            setNextCursor(data.next_cursor);
+        } catch (e) {
+            console.error(e);
+            alert("Failed to load more memories");
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const handleDelete = async (vectorId) => {
         if (!confirm('Are you sure you want to delete this memory?')) return;
         try {
@@ -44,6 +65,15 @@ export default function MemoriesModal({ onClose }) {
                         </div>
                         <h2 className="text-xl font-bold text-slate-100">Long-Term Memories</h2>
                     </div>
+                    <select
+                        value={sortBy || ''}
+                        onChange={(e) => setSortBy(e.target.value || null)}
+                        className="ml-auto mr-4 bg-slate-800 border border-slate-700 text-slate-300 text-sm rounded-lg px-2 py-1"
+                    >
+                        <option value="">Default order</option>
+                        <option value="importance">Most important</option>
+                        <option value="created_at">Newest</option>
+                    </select>
                     <button onClick={onClose} className="text-slate-400 hover:text-white transition-colors">
                         <X size={24} />
                     </button>
@@ -90,6 +120,16 @@ export default function MemoriesModal({ onClose }) {
                                     </div>
                                 ))
                             )}
+                            {nextCursor && (
+                                <button
+                                    onClick={loadMore}
+                                    disabled={isLoadingMore}
+                                    className="w-full py-2 text-sm text-slate-400 hover:text-pink-400 transition-colors flex items-center justify-center gap-2"
+                                >
+                                    {isLoadingMore && <Loader2 size={14} className="animate-spin" />}
+                                    Load more
+                                </button>
+                            )}
                         </div>
                     )}
                 </div>
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { X, Upload, Trash2, Image as ImageIcon, Check } from 'lucide-react';
-import { fetchIcons, uploadIcon, deleteIcon } from '../api/client';
+import { fetchIcons, uploadIcon, deleteIcon, thumbnailUrl } from '../api/client';
 import { useChat } from '../context/ChatContext';
 
 export default function WaifuIconsModal({ onClose }) {
@@ -104,7 +104,13 @@ export default function WaifuIconsModal({ onClose }) {
                                 return (
                                     <div key={index} className={`group relative aspect-square bg-slate-800 rounded-lg overflow-hidden border-2 transition-all ${isSelected ? 'border-indigo-500 ring-2 ring-indigo-500/50' : 'border-slate-700 hover:border-pink-500'
                                         }`}>
-                                        <img src={url} alt="Waifu Icon" className="w-full h-full object-cover" />
+                                        <img
+                                            src={thumbnailUrl(url, 128)}
+                                            onError={(e) => { if (e.currentTarget.src !== url) e.currentTarget.src = url; }}
+                                            alt="Waifu Icon"
+                                            loading="lazy"
+                                            className="w-full h-full object-cover"
+                                        />
 
                                         {/* Selected indicator */}
                                         {isSelected && (
@@ -153,7 +159,7 @@ export default function WaifuIconsModal({ onClose }) {
                         {isUploading ? 'Uploading...' : 'Upload New Icon'}
                         <input
                             type="file"
-                            accept="image/png, image/jpeg"
+                            accept="image/png, image/jpeg, image/webp"
                             className="hidden"
                             onChange={handleUpload}
                             disabled={isUploading}